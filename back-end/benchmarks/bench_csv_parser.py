@@ -0,0 +1,104 @@
+"""
+Benchmark do agrupamento de vulnerabilidades de servidores (CSV do Nessus).
+
+Gera um CSV sintético no formato exportado pelo Tenable VM e compara a implementação
+antiga, linha a linha com df.iterrows(), com a leitura vetorizada de
+analysis/csv_parser.carregar_scans_csv.
+
+Uso (a partir da pasta back-end):
+    python -m benchmarks.bench_csv_parser --linhas 1000000 [--tamanho-chunk 200000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from src.analysis.csv_parser import carregar_scans_csv, contar_vulnerabilidades_csv
+
+from .dados_sinteticos import gerar_csv_sintetico
+
+
+def agrupar_com_iterrows(csv_files: list) -> dict:
+    """
+    Implementação de referência (anterior à vetorização), mantida apenas para comparação.
+    """
+    common_vulnerabilities = defaultdict(lambda: {"hosts": set(), "risks": set()})
+    hosts = set()
+
+    for csv_file in csv_files:
+        df = pd.read_csv(csv_file, usecols=['Name', 'Host', 'Risk'])
+        df = df.dropna(subset=['Name', 'Host', 'Risk'])
+
+        for _, row in df.iterrows():
+            name = str(row['Name']).strip()
+            host = str(row['Host']).strip()
+            risk = str(row['Risk']).strip().lower()
+
+            if risk in {'critical', 'high', 'medium', 'low'}:
+                common_vulnerabilities[name]["hosts"].add(host)
+                common_vulnerabilities[name]["risks"].add(risk)
+
+        # extrair_hosts_csv lia o arquivo uma segunda vez
+        df_hosts = pd.read_csv(csv_file, usecols=['Host'])
+        hosts.update(h for h in df_hosts['Host'].dropna().astype(str).str.strip() if h)
+
+    vulnerabilidades = {
+        name: {"hosts": list(data["hosts"]), "risks": list(data["risks"])}
+        for name, data in common_vulnerabilities.items()
+    }
+    return {
+        "vulnerabilidades_comuns": vulnerabilidades,
+        "riscos": contar_vulnerabilidades_csv(vulnerabilidades),
+        "hosts": list(hosts)
+    }
+
+
+def _normalizar(modelo: dict) -> dict:
+    """Converte as listas em conjuntos para comparar resultados independentemente da ordem."""
+    return {
+        "vulnerabilidades_comuns": {
+            name: (frozenset(dados["hosts"]), frozenset(dados["risks"]))
+            for name, dados in modelo["vulnerabilidades_comuns"].items()
+        },
+        "riscos": modelo["riscos"],
+        "hosts": frozenset(modelo["hosts"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Quantidade de linhas do CSV sintético.")
+    parser.add_argument("--tamanho-chunk", type=int, default=None, help="Lê o CSV em blocos com essa quantidade de linhas.")
+    parser.add_argument("--sem-referencia", action="store_true", help="Não executa a implementação com iterrows.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "servidores_scan.csv")
+        print(f"Gerando CSV sintético com {args.linhas} linhas...")
+        gerar_csv_sintetico(caminho, args.linhas)
+
+        inicio = time.perf_counter()
+        modelo = carregar_scans_csv([caminho], tamanho_chunk=args.tamanho_chunk)
+        tempo_vetorizado = time.perf_counter() - inicio
+        print(f"Vetorizado (carregar_scans_csv): {tempo_vetorizado:.2f}s")
+
+        if args.sem_referencia:
+            return
+
+        inicio = time.perf_counter()
+        referencia = agrupar_com_iterrows([caminho])
+        tempo_referencia = time.perf_counter() - inicio
+        print(f"Referência (iterrows):           {tempo_referencia:.2f}s")
+
+        if _normalizar(modelo) != _normalizar(referencia):
+            raise SystemExit("Os resultados das duas implementações são diferentes.")
+
+        print(f"Resultados idênticos. Speedup: {tempo_referencia / tempo_vetorizado:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
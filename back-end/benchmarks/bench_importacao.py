@@ -0,0 +1,136 @@
+"""
+Benchmark do tempo de inicialização do back-end: quanto leva para importar o app (src.main) em um
+interpretador novo, como em um reinício do contêiner.
+
+Cada repetição roda `python -X importtime -c "import src.main"` em um processo separado e lê o tempo
+acumulado de cada módulo. Também mede o tempo de parede de `python -c "import src.main"` (sem a
+instrumentação do -X importtime) e o do interpretador vazio. O resultado é gravado em JSON, com o
+commit, e o benchmark termina com código 1 se a mediana da importação passar do limite (--limite-ms).
+
+Os módulos da geração de relatórios (pandas, matplotlib, plasTeX) não entram nessa conta: são
+importados só pelo consumidor da fila (ver src/consumidor_relatorios.py).
+
+Uso (a partir da pasta back-end):
+    python -m benchmarks.bench_importacao [--repeticoes 5] [--limite-ms 500] [--saida resultado.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+VERSAO_RESULTADO = 1
+PASTA_RESULTADOS = "benchmarks/resultados"
+MODULO_PADRAO = "src.main"
+LIMITE_PADRAO_MS = 500
+
+
+def medir_importtime(modulo: str) -> dict:
+    """
+    Importa `modulo` em um novo interpretador com -X importtime.
+
+    :return: {módulo: {"proprio_ms", "acumulado_ms"}} de todos os módulos importados.
+    """
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"], capture_output=True, text=True, check=True)
+
+    modulos = {}
+    # Formato de cada linha: "import time:   <próprio, us> | <acumulado, us> | <espaços><módulo>"
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        if not proprio.strip().isdigit():
+            continue  # cabeçalho
+        modulos[nome.strip()] = {"proprio_ms": int(proprio) / 1000, "acumulado_ms": int(acumulado) / 1000}
+
+    return modulos
+
+
+def medir_parede(codigo: str) -> float:
+    """
+    :return: Tempo de parede, em ms, de `python -c codigo` em um novo interpretador.
+    """
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", codigo], capture_output=True, check=True)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _mediana_por_modulo(execucoes: list, chave: str) -> dict:
+    nomes = set().union(*execucoes)
+    return {nome: statistics.median(execucao[nome][chave] for execucao in execucoes if nome in execucao) for nome in nomes}
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulo", default=MODULO_PADRAO, help="Módulo importado.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Quantidade de medições (cada uma em um novo interpretador).")
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_PADRAO_MS, help="Tempo máximo de importação aceito, em ms.")
+    parser.add_argument("--top", type=int, default=15, help="Quantidade de módulos listados.")
+    parser.add_argument("--saida", default=None, help=f"Arquivo JSON dos resultados (padrão: {PASTA_RESULTADOS}/importacao_<commit>_<data>.json).")
+    args = parser.parse_args()
+
+    execucoes = [medir_importtime(args.modulo) for _ in range(args.repeticoes)]
+    paredes = [medir_parede(f"import {args.modulo}") for _ in range(args.repeticoes)]
+    interpretador = [medir_parede("pass") for _ in range(args.repeticoes)]
+
+    acumulado = _mediana_por_modulo(execucoes, "acumulado_ms")
+    proprio = _mediana_por_modulo(execucoes, "proprio_ms")
+    importacao_ms = acumulado[args.modulo]
+
+    mais_lentos = sorted((nome for nome in acumulado if nome != args.modulo), key=acumulado.get, reverse=True)[:args.top]
+    mais_lentos_proprio = sorted(proprio, key=proprio.get, reverse=True)[:args.top]
+
+    print(f"Importação de {args.modulo}: {importacao_ms:.0f} ms (mediana de {args.repeticoes}; limite {args.limite_ms:.0f} ms)")
+    print(f"Processo completo: {statistics.median(paredes):.0f} ms, dos quais {statistics.median(interpretador):.0f} ms do interpretador vazio")
+    print(f"\n{'Módulo':<60}{'Acumulado (ms)':>16}")
+    for nome in mais_lentos:
+        print(f"{nome:<60}{acumulado[nome]:>16.1f}")
+    print(f"\n{'Módulo':<60}{'Próprio (ms)':>16}")
+    for nome in mais_lentos_proprio:
+        print(f"{nome:<60}{proprio[nome]:>16.1f}")
+
+    commit = _commit_atual()
+    data = datetime.now()
+    resultado = {
+        "versao": VERSAO_RESULTADO,
+        "commit": commit,
+        "data": data.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "modulo": args.modulo,
+        "repeticoes": args.repeticoes,
+        "limite_ms": args.limite_ms,
+        "importacao_ms": importacao_ms,
+        "processo_ms": statistics.median(paredes),
+        "interpretador_ms": statistics.median(interpretador),
+        "modulos_importados": len(acumulado),
+        "mais_lentos_acumulado": {nome: acumulado[nome] for nome in mais_lentos},
+        "mais_lentos_proprio": {nome: proprio[nome] for nome in mais_lentos_proprio},
+    }
+
+    caminho_saida = args.saida or f"{PASTA_RESULTADOS}/importacao_{commit or 'sem_commit'}_{data:%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(caminho_saida) or ".", exist_ok=True)
+    with open(caminho_saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, indent=4)
+
+    print(f"\nResultados gravados em {caminho_saida}")
+
+    if importacao_ms > args.limite_ms:
+        print(f"A importação passou do limite de {args.limite_ms:.0f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
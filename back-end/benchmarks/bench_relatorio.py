@@ -0,0 +1,277 @@
+"""
+Benchmark de ponta a ponta da geração do relatório, sobre um corpus sintético (ver benchmarks.gerar_corpus).
+
+Executa as etapas do pipeline na mesma ordem da fila de relatórios (report/fila_relatorios.py) e mede,
+para cada uma, o tempo de parede, o tempo de CPU (do processo e dos filhos, como os processos de
+leitura e o pdflatex) e o pico de memória residente (RSS), amostrado durante a etapa. Os resultados
+são gravados em JSON, com o commit e a máquina, para comparação entre commits.
+
+A compilação do PDF é pulada se o pdflatex não estiver no PATH (ou com --sem-latex).
+
+Uso (a partir da pasta back-end):
+    python -m benchmarks.bench_relatorio --sites 200 --findings 300 --linhas-csv 200000 [--repeticoes 3] [--saida resultado.json]
+    python -m benchmarks.bench_relatorio --corpus /tmp/corpus   (corpus já gerado por benchmarks.gerar_corpus)
+    python -m benchmarks.bench_relatorio --comparar antes.json depois.json [--tolerancia 10]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+
+
+from src.analysis.vulnerability_handler import processar_relatorio_json, processar_relatorio_csv, extrair_quantidades_vulnerabilidades_por_site
+from src.plot.plot import gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site
+from src.report.report_generator import terminar_relatorio_preprocessado, gerar_graficos_totais, compilar_latex
+from src.utils.trace import AmostradorMemoria
+
+from .gerar_corpus import adicionar_argumentos_corpus, carregar_corpus, gerar_corpus_dos_argumentos
+
+VERSAO_RESULTADO = 1
+PASTA_RESULTADOS = "benchmarks/resultados"
+INTERVALO_AMOSTRAGEM = 0.01
+
+
+def _tempo_cpu() -> float:
+    tempos = os.times()
+    return tempos.user + tempos.system + tempos.children_user + tempos.children_system
+
+
+def medir_etapa(funcao, verboso: bool = False) -> tuple:
+    """
+    Executa `funcao` medindo tempo de parede, tempo de CPU e pico de RSS.
+
+    :return: (retorno da função, medição), em que a medição tem tempo_s, tempo_cpu_s, rss_pico_mb
+        (processo atual), rss_pico_total_mb (processo e filhos), status ("ok" ou "erro") e erro.
+    """
+    resultado = None
+    erro = None
+    cpu_inicio = _tempo_cpu()
+    inicio = time.perf_counter()
+
+    with AmostradorMemoria(INTERVALO_AMOSTRAGEM) as amostrador, open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(sys.stdout if verboso else nulo):
+        try:
+            resultado = funcao()
+        except Exception as e:
+            erro = f"{type(e).__name__}: {e}"
+
+    medicao = {
+        "tempo_s": round(time.perf_counter() - inicio, 4),
+        "tempo_cpu_s": round(_tempo_cpu() - cpu_inicio, 4),
+        "rss_pico_mb": round(amostrador.pico / 2**20, 1),
+        "rss_pico_total_mb": round(amostrador.pico_total / 2**20, 1),
+        "status": "erro" if erro else "ok",
+        "erro": erro,
+    }
+
+    return resultado, medicao
+
+
+def executar_pipeline(corpus: dict, pasta_saida: str, processos: int, compilar: bool, verboso: bool = False) -> dict:
+    """
+    Executa as etapas do relatório sobre o corpus, gravando os arquivos em `pasta_saida`.
+
+    :return: Medição de cada etapa, na ordem de execução.
+    """
+    pasta_scans = corpus["pasta_scans"]
+    pasta_exemplo = corpus["pasta_exemplo"]
+    pasta_relatorio_pronto = f"{pasta_saida}/RelatorioPronto"
+    caminho_por_site = f"{pasta_saida}/vulnerabilidades_agrupadas_por_site.csv"
+
+    os.makedirs(pasta_saida)
+    etapas = {}
+
+    modelo_json, etapas["processar_relatorio_json"] = medir_etapa(
+        lambda: processar_relatorio_json(pasta_scans, pasta_saida, pasta_exemplo, processos), verboso)
+
+    modelo_csv, etapas["processar_relatorio_csv"] = medir_etapa(
+        lambda: processar_relatorio_csv(pasta_scans, pasta_saida, pasta_exemplo, processos), verboso)
+
+    _, etapas["extrair_quantidades_vulnerabilidades_por_site"] = medir_etapa(
+        lambda: extrair_quantidades_vulnerabilidades_por_site(caminho_por_site, pasta_scans, modelo_json), verboso)
+
+    _, etapas["terminar_relatorio_preprocessado"] = medir_etapa(
+        lambda: terminar_relatorio_preprocessado(
+            "Secretaria de Benchmark", "SB", "01/01/2025", "31/01/2025", "2025", "Fevereiro",
+            pasta_saida, f"{pasta_saida}/relatorio_pronto.tex", pasta_exemplo, "https://drive.google.com/",
+            modelo_sites=modelo_json, modelo_servidores=modelo_csv),
+        verboso)
+
+    _, etapas["gerar_graficos_totais"] = medir_etapa(
+        lambda: gerar_graficos_totais(pasta_saida, modelo_json, modelo_csv), verboso)
+
+    _, etapas["gerar_grafico"] = medir_etapa(
+        lambda: gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site(
+            caminho_por_site, f"{pasta_relatorio_pronto}/assets/images-was/Vulnerabilidades_x_site.png", "decrescente"),
+        verboso)
+
+    if compilar:
+        # Duas passadas, como na fila, para resolver sumário e referências
+        def compilar_duas_vezes():
+            compilar_latex(f"{pasta_relatorio_pronto}/main.tex", f"{pasta_relatorio_pronto}/")
+            compilar_latex(f"{pasta_relatorio_pronto}/main.tex", f"{pasta_relatorio_pronto}/")
+            # compilar_latex apenas imprime os erros; o PDF ausente indica a falha
+            if not os.path.exists(f"{pasta_relatorio_pronto}/main.pdf"):
+                raise RuntimeError("main.pdf não foi gerado.")
+
+        _, etapas["compilar_latex"] = medir_etapa(compilar_duas_vezes, verboso)
+    else:
+        etapas["compilar_latex"] = {"status": "ignorada"}
+
+    return etapas
+
+
+def resumir_execucoes(execucoes: list) -> dict:
+    """
+    Resume as repetições de cada etapa: mediana e mínimo dos tempos e maior pico de RSS.
+    """
+    resumo = {}
+    for etapa in execucoes[0]:
+        medicoes = [execucao[etapa] for execucao in execucoes if execucao[etapa]["status"] == "ok"]
+
+        if not medicoes:
+            resumo[etapa] = {"status": execucoes[0][etapa]["status"]}
+            continue
+
+        tempos = [medicao["tempo_s"] for medicao in medicoes]
+        resumo[etapa] = {
+            "status": "ok" if len(medicoes) == len(execucoes) else "erro",
+            "tempo_s": round(statistics.median(tempos), 4),
+            "tempo_min_s": min(tempos),
+            "tempo_cpu_s": round(statistics.median(medicao["tempo_cpu_s"] for medicao in medicoes), 4),
+            "rss_pico_mb": max(medicao["rss_pico_mb"] for medicao in medicoes),
+            "rss_pico_total_mb": max(medicao["rss_pico_total_mb"] for medicao in medicoes),
+        }
+    return resumo
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _imprimir_resumo(resumo: dict):
+    print(f"{'Etapa':<48}{'Tempo (s)':>12}{'CPU (s)':>12}{'RSS (MiB)':>12}{'Total (MiB)':>13}")
+    for etapa, dados in resumo.items():
+        if dados["status"] == "ignorada":
+            print(f"{etapa:<48}{'ignorada':>12}")
+            continue
+        if "tempo_s" not in dados:
+            print(f"{etapa:<48}{'erro':>12}")
+            continue
+        print(f"{etapa:<48}{dados['tempo_s']:>12.3f}{dados['tempo_cpu_s']:>12.3f}{dados['rss_pico_mb']:>12.1f}{dados['rss_pico_total_mb']:>13.1f}")
+
+
+def comparar_resultados(caminho_antes: str, caminho_depois: str, tolerancia: float) -> bool:
+    """
+    Compara dois resultados gravados por este benchmark e imprime a variação de cada etapa.
+
+    :param tolerancia: Aumento percentual de tempo ou de RSS a partir do qual a etapa é marcada como regressão.
+    :return: True se alguma etapa regrediu.
+    """
+    with open(caminho_antes, 'r', encoding='utf-8') as arquivo:
+        antes = json.load(arquivo)
+    with open(caminho_depois, 'r', encoding='utf-8') as arquivo:
+        depois = json.load(arquivo)
+
+    if antes.get("corpus", {}).get("parametros") != depois.get("corpus", {}).get("parametros"):
+        print("Aviso: os resultados foram obtidos com corpus diferentes.")
+
+    print(f"Antes:  {antes.get('commit')} ({antes.get('data')})")
+    print(f"Depois: {depois.get('commit')} ({depois.get('data')})")
+    print(f"{'Etapa':<48}{'Tempo antes':>12}{'depois':>10}{'var.':>9}{'RSS antes':>12}{'depois':>10}{'var.':>9}")
+
+    regrediu = False
+    for etapa, dados_depois in depois["etapas"].items():
+        dados_antes = antes["etapas"].get(etapa, {})
+        if "tempo_s" not in dados_antes or "tempo_s" not in dados_depois:
+            print(f"{etapa:<48}{'-':>12}{'-':>10}")
+            continue
+
+        variacao_tempo = 100 * (dados_depois["tempo_s"] - dados_antes["tempo_s"]) / max(dados_antes["tempo_s"], 1e-9)
+        variacao_rss = 100 * (dados_depois["rss_pico_total_mb"] - dados_antes["rss_pico_total_mb"]) / max(dados_antes["rss_pico_total_mb"], 1e-9)
+        marcador = ""
+        if variacao_tempo > tolerancia or variacao_rss > tolerancia:
+            regrediu = True
+            marcador = "  <- regressão"
+
+        print(f"{etapa:<48}{dados_antes['tempo_s']:>12.3f}{dados_depois['tempo_s']:>10.3f}{variacao_tempo:>8.1f}%"
+              f"{dados_antes['rss_pico_total_mb']:>12.1f}{dados_depois['rss_pico_total_mb']:>10.1f}{variacao_rss:>8.1f}%{marcador}")
+
+    return regrediu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    adicionar_argumentos_corpus(parser)
+    parser.add_argument("--corpus", default=None, help="Usa um corpus já gerado por benchmarks.gerar_corpus (ignora as opções de tamanho).")
+    parser.add_argument("--processos", type=int, default=1, help="Processos usados na leitura dos scans.")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Quantidade de execuções do pipeline.")
+    parser.add_argument("--sem-latex", action="store_true", help="Não compila o PDF.")
+    parser.add_argument("--saida", default=None, help=f"Arquivo JSON dos resultados (padrão: {PASTA_RESULTADOS}/relatorio_<commit>_<data>.json).")
+    parser.add_argument("--verboso", action="store_true", help="Mostra as mensagens impressas pelas etapas.")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"), help="Compara dois resultados em vez de executar o benchmark.")
+    parser.add_argument("--tolerancia", type=float, default=10, help="Aumento percentual considerado regressão em --comparar.")
+    args = parser.parse_args()
+
+    if args.comparar:
+        sys.exit(1 if comparar_resultados(*args.comparar, args.tolerancia) else 0)
+
+    compilar = not args.sem_latex and shutil.which("pdflatex") is not None
+    if not args.sem_latex and not compilar:
+        print("pdflatex não encontrado no PATH; a compilação do PDF será ignorada.")
+
+    with tempfile.TemporaryDirectory(prefix="bench_relatorio_") as pasta_temporaria:
+        if args.corpus:
+            corpus = carregar_corpus(args.corpus)
+        else:
+            print("Gerando corpus sintético...")
+            corpus = gerar_corpus_dos_argumentos(os.path.join(pasta_temporaria, "corpus"), args)
+
+        execucoes = []
+        for repeticao in range(args.repeticoes):
+            print(f"Execução {repeticao + 1}/{args.repeticoes}...")
+            execucoes.append(executar_pipeline(corpus, os.path.join(pasta_temporaria, f"execucao_{repeticao}"), args.processos, compilar, args.verboso))
+
+    resumo = resumir_execucoes(execucoes)
+    _imprimir_resumo(resumo)
+
+    commit = _commit_atual()
+    data = datetime.now()
+    resultado = {
+        "versao": VERSAO_RESULTADO,
+        "commit": commit,
+        "data": data.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "processos": args.processos,
+        "repeticoes": args.repeticoes,
+        "corpus": {chave: corpus[chave] for chave in ("parametros", "bytes_json", "bytes_csv")},
+        "etapas": resumo,
+        "execucoes": execucoes,
+    }
+
+    caminho_saida = args.saida or f"{PASTA_RESULTADOS}/relatorio_{commit or 'sem_commit'}_{data:%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(caminho_saida) or ".", exist_ok=True)
+    with open(caminho_saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, indent=4)
+
+    print(f"Resultados gravados em {caminho_saida}")
+
+
+if __name__ == "__main__":
+    main()
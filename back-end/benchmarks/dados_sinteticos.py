@@ -0,0 +1,96 @@
+"""
+Dados sintéticos no formato do Tenable, usados pelos benchmarks e pelo servidor de testes
+(benchmarks/mock_tenable.py).
+
+- Relatórios do Tenable WAS (JSON de /was/v2/scans/{id}/report), com os campos lidos pela análise e
+  uma evidência em HTML por finding, como nos relatórios reais.
+- CSV de servidores exportado pelo Tenable VM (Nessus).
+
+Os nomes das vulnerabilidades vêm dos catálogos do projeto, para que os relatórios gerados
+passem pelas mesmas categorias dos reais; alguns nomes fora do catálogo são incluídos de propósito.
+"""
+
+import json
+import os
+import random
+import zlib
+from typing import List
+
+CATALOGO_SITES = "../shared/relatorios/Exemplo/vulnerabilidades.json"
+CATALOGO_SERVIDORES = "data/vulnerabilidades_servidores.json"
+
+RISCOS_WAS = ['critical', 'high', 'medium', 'low', 'info']
+RISCOS = ['Critical', 'High', 'Medium', 'Low', 'None']
+
+
+def carregar_nomes_vulnerabilidades(caminho_catalogo: str, extras: int = 5) -> List[str]:
+    """
+    Retorna os nomes de vulnerabilidades do catálogo, mais `extras` nomes que não estão nele.
+    Se o catálogo não existir (ex.: fora da pasta back-end), usa apenas nomes genéricos.
+    """
+    nomes = []
+    if os.path.exists(caminho_catalogo):
+        with open(caminho_catalogo, 'r', encoding='utf-8') as arquivo:
+            nomes = [vulnerabilidade["Vulnerabilidade"] for vulnerabilidade in json.load(arquivo)]
+    return nomes + [f"Vulnerabilidade sintética {i}" for i in range(extras or (0 if nomes else 50))]
+
+
+def gerar_relatorio_was(aleatorio: random.Random, nome_scan: str, target: str, nomes: List[str], findings: int, tamanho_evidencia: int = 2000) -> dict:
+    """
+    Gera o JSON de um relatório do Tenable WAS para `target`.
+
+    :param aleatorio: Gerador de números aleatórios (permite resultados reprodutíveis).
+    :param nome_scan: Nome da configuração do scan.
+    :param target: URL do site escaneado.
+    :param nomes: Nomes de vulnerabilidades sorteados para os findings.
+    :param findings: Quantidade de findings.
+    :param tamanho_evidencia: Tamanho, em caracteres, da evidência em HTML de cada finding.
+    :return: Relatório no formato do Tenable WAS.
+    """
+    paginas = [f"/pagina{i}" for i in range(20)] + ["/", "/login", "/api/v1/status"]
+    evidencia = "<html><body>" + "x" * tamanho_evidencia + "</body></html>"
+
+    lista_findings = []
+    for _ in range(findings):
+        nome = aleatorio.choice(nomes)
+        # O risco e o plugin são derivados do nome, como no Tenable, em que cada plugin tem uma severidade fixa
+        codigo = zlib.crc32(nome.encode('utf-8'))
+        lista_findings.append({
+            "name": nome,
+            "plugin_id": 98000 + codigo % 10000,
+            "risk_factor": RISCOS_WAS[codigo % len(RISCOS_WAS)],
+            "uri": f"{target}{aleatorio.choice(paginas)}",
+            "output": evidencia,
+            "description": "Finding gerado sinteticamente.",
+        })
+
+    return {
+        "config": {"name": nome_scan},
+        "scan": {"target": target},
+        "findings": lista_findings,
+    }
+
+
+def escrever_csv_servidores(arquivo, aleatorio: random.Random, linhas: int, nomes: List[str], hosts: int = 2000) -> None:
+    """
+    Escreve em `arquivo` (aberto em modo texto) um CSV com as colunas usadas pelo relatório
+    (e algumas extras, como no export real do Tenable VM).
+    """
+    riscos_por_nome = {nome: aleatorio.choice(RISCOS) for nome in nomes}
+    lista_hosts = [f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}" for i in range(hosts)]
+
+    arquivo.write("Plugin ID,CVE,CVSS v2.0 Base Score,Risk,Host,Protocol,Port,Name\n")
+    for i in range(linhas):
+        nome = aleatorio.choice(nomes)
+        arquivo.write(f"{i},,5.0,{riscos_por_nome[nome]},{aleatorio.choice(lista_hosts)},tcp,443,\"{nome}\"\n")
+
+
+def gerar_csv_sintetico(caminho: str, linhas: int, hosts: int = 2000, vulnerabilidades: int = 3000, semente: int = 42) -> None:
+    """
+    Gera um CSV de servidores com `vulnerabilidades` nomes genéricos distintos.
+    """
+    aleatorio = random.Random(semente)
+    nomes = [f"Vulnerabilidade sintética {i}" for i in range(vulnerabilidades)]
+
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        escrever_csv_servidores(arquivo, aleatorio, linhas, nomes, hosts)
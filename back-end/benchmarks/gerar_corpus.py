@@ -0,0 +1,177 @@
+"""
+Gera um corpus sintético de scans para os benchmarks: relatórios JSON do Tenable WAS, um CSV de
+servidores do Tenable VM e uma cópia da pasta de exemplo (shared/relatorios/Exemplo) com o catálogo de
+vulnerabilidades de sites no tamanho pedido.
+
+Estrutura gerada:
+    <saida>/scans/<n>.json           relatórios WAS (um por site)
+    <saida>/scans/servidores_scan.csv export do Tenable VM
+    <saida>/exemplo/                 pasta de exemplo usada como caminho_relatorio_exemplo
+    <saida>/corpus.json              parâmetros e tamanho do corpus
+
+O catálogo de servidores continua sendo data/vulnerabilidades_servidores.json (o caminho é fixo em
+report_generator.gerar_relatorio_latex_csv); seus nomes são usados no CSV, junto com
+`vulnerabilidades_csv` nomes fora do catálogo.
+
+Uso (a partir da pasta back-end):
+    python -m benchmarks.gerar_corpus --saida /tmp/corpus --sites 500 --findings 300 --linhas-csv 500000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+
+from .dados_sinteticos import CATALOGO_SERVIDORES, escrever_csv_servidores, gerar_relatorio_was
+
+PASTA_EXEMPLO = "../shared/relatorios/Exemplo"
+NOME_METADADOS = "corpus.json"
+
+
+def redimensionar_catalogo(catalogo: list, tamanho: int, aleatorio: random.Random) -> list:
+    """
+    Retorna um catálogo com `tamanho` vulnerabilidades: as primeiras do catálogo original ou, se
+    `tamanho` for maior, todas elas mais entradas sintéticas com categorias e textos de entradas reais
+    (para que as buscas no descritivo continuem encontrando a categoria e a subcategoria).
+    """
+    if tamanho <= len(catalogo):
+        return catalogo[:tamanho]
+
+    sinteticas = []
+    for i in range(tamanho - len(catalogo)):
+        modelo = aleatorio.choice(catalogo)
+        sinteticas.append({**modelo, "Vulnerabilidade": f"Vulnerabilidade catalogada sintética {i}"})
+
+    return catalogo + sinteticas
+
+
+def gerar_corpus(saida: str, sites: int = 100, findings: int = 200, linhas_csv: int = 100000, hosts: int = 2000, tamanho_catalogo: int = None, vulnerabilidades_csv: int = 200, tamanho_evidencia: int = 2000, semente: int = 42) -> dict:
+    """
+    Gera o corpus em `saida` (a pasta é recriada).
+
+    :param saida: Pasta do corpus.
+    :param sites: Quantidade de relatórios WAS (um site por relatório).
+    :param findings: Quantidade de findings por relatório WAS.
+    :param linhas_csv: Quantidade de linhas do CSV de servidores (0 para não gerar o CSV).
+    :param hosts: Quantidade de hosts distintos no CSV.
+    :param tamanho_catalogo: Quantidade de vulnerabilidades no catálogo de sites (None mantém o original).
+    :param vulnerabilidades_csv: Quantidade de nomes fora do catálogo de servidores usados no CSV.
+    :param tamanho_evidencia: Tamanho, em caracteres, da evidência de cada finding.
+    :param semente: Semente dos dados gerados.
+    :return: Metadados do corpus (também gravados em corpus.json).
+    """
+    aleatorio = random.Random(semente)
+
+    shutil.rmtree(saida, ignore_errors=True)
+    pasta_scans = os.path.join(saida, "scans")
+    pasta_exemplo = os.path.join(saida, "exemplo")
+    os.makedirs(pasta_scans)
+
+    # Pasta de exemplo com o catálogo de sites redimensionado
+    shutil.copytree(PASTA_EXEMPLO, pasta_exemplo)
+    caminho_catalogo = os.path.join(pasta_exemplo, "vulnerabilidades.json")
+    with open(caminho_catalogo, 'r', encoding='utf-8') as arquivo:
+        catalogo = json.load(arquivo)
+    if tamanho_catalogo is not None:
+        catalogo = redimensionar_catalogo(catalogo, tamanho_catalogo, aleatorio)
+        with open(caminho_catalogo, 'w', encoding='utf-8') as arquivo:
+            json.dump(catalogo, arquivo, ensure_ascii=False, indent=4)
+
+    # Alguns nomes fora do catálogo, que vão para "Vulnerabilidades sem Categoria"
+    nomes_sites = [vulnerabilidade["Vulnerabilidade"] for vulnerabilidade in catalogo]
+    nomes_sites += [f"Vulnerabilidade sintética {i}" for i in range(max(1, len(nomes_sites) // 20))]
+
+    bytes_json = 0
+    for i in range(sites):
+        relatorio = gerar_relatorio_was(aleatorio, f"Scan site{i}", f"https://site{i}.exemplo.gov.br", nomes_sites, findings, tamanho_evidencia)
+        caminho = os.path.join(pasta_scans, f"{i}.json")
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo)
+        bytes_json += os.path.getsize(caminho)
+
+    bytes_csv = 0
+    if linhas_csv:
+        with open(CATALOGO_SERVIDORES, 'r', encoding='utf-8') as arquivo:
+            nomes_servidores = [vulnerabilidade["Vulnerabilidade"] for vulnerabilidade in json.load(arquivo)]
+        nomes_servidores += [f"Vulnerabilidade de servidor sintética {i}" for i in range(vulnerabilidades_csv)]
+
+        caminho = os.path.join(pasta_scans, "servidores_scan.csv")
+        with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+            escrever_csv_servidores(arquivo, aleatorio, linhas_csv, nomes_servidores, hosts)
+        bytes_csv = os.path.getsize(caminho)
+
+    metadados = {
+        "parametros": {
+            "sites": sites,
+            "findings": findings,
+            "linhas_csv": linhas_csv,
+            "hosts": hosts,
+            "tamanho_catalogo": len(catalogo),
+            "vulnerabilidades_csv": vulnerabilidades_csv,
+            "tamanho_evidencia": tamanho_evidencia,
+            "semente": semente,
+        },
+        "pasta_scans": pasta_scans,
+        "pasta_exemplo": pasta_exemplo,
+        "bytes_json": bytes_json,
+        "bytes_csv": bytes_csv,
+    }
+
+    with open(os.path.join(saida, NOME_METADADOS), 'w', encoding='utf-8') as arquivo:
+        json.dump(metadados, arquivo, indent=4)
+
+    return metadados
+
+
+def carregar_corpus(pasta: str) -> dict:
+    """
+    Lê os metadados de um corpus gerado por gerar_corpus.
+    """
+    with open(os.path.join(pasta, NOME_METADADOS), 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def adicionar_argumentos_corpus(parser: argparse.ArgumentParser) -> None:
+    """
+    Adiciona ao parser as opções de tamanho do corpus (compartilhadas com benchmarks.bench_relatorio).
+    """
+    parser.add_argument("--sites", type=int, default=100, help="Quantidade de relatórios WAS (um por site).")
+    parser.add_argument("--findings", type=int, default=200, help="Findings por relatório WAS.")
+    parser.add_argument("--linhas-csv", type=int, default=100000, help="Linhas do CSV de servidores (0 para não gerar).")
+    parser.add_argument("--hosts", type=int, default=2000, help="Hosts distintos no CSV de servidores.")
+    parser.add_argument("--tamanho-catalogo", type=int, default=None, help="Vulnerabilidades no catálogo de sites (padrão: o catálogo original).")
+    parser.add_argument("--vulnerabilidades-csv", type=int, default=200, help="Nomes fora do catálogo de servidores usados no CSV.")
+    parser.add_argument("--tamanho-evidencia", type=int, default=2000, help="Tamanho, em caracteres, da evidência de cada finding.")
+    parser.add_argument("--semente", type=int, default=42)
+
+
+def gerar_corpus_dos_argumentos(saida: str, args: argparse.Namespace) -> dict:
+    return gerar_corpus(
+        saida,
+        sites=args.sites,
+        findings=args.findings,
+        linhas_csv=args.linhas_csv,
+        hosts=args.hosts,
+        tamanho_catalogo=args.tamanho_catalogo,
+        vulnerabilidades_csv=args.vulnerabilidades_csv,
+        tamanho_evidencia=args.tamanho_evidencia,
+        semente=args.semente,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saida", required=True, help="Pasta do corpus (é recriada).")
+    adicionar_argumentos_corpus(parser)
+    args = parser.parse_args()
+
+    metadados = gerar_corpus_dos_argumentos(args.saida, args)
+
+    print(f"Corpus gerado em {args.saida}: {args.sites} relatórios WAS ({metadados['bytes_json'] / 2**20:.1f} MiB), "
+          f"CSV com {args.linhas_csv} linhas ({metadados['bytes_csv'] / 2**20:.1f} MiB), "
+          f"catálogo de sites com {metadados['parametros']['tamanho_catalogo']} vulnerabilidades.")
+
+
+if __name__ == "__main__":
+    main()
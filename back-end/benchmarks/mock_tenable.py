@@ -0,0 +1,392 @@
+"""
+Servidor local que imita a API do Tenable, para testes de carga e benchmarks sem acesso ao
+cloud.tenable.com (ex.: na CI ou em máquinas sem internet).
+
+Endpoints atendidos, com dados sintéticos (ver benchmarks/dados_sinteticos.py):
+- GET  /users
+- GET  /scans
+- POST /scans/{id}/export, GET /scans/{id}/export/{file}/status e GET /scans/{id}/export/{file}/download
+- POST /was/v2/configs/search (paginado por limit/offset; filtra pelo X-Impersonate e por folder_name)
+- GET  /was/v2/folders
+- PUT e GET /was/v2/scans/{scan_id}/report
+
+A latência de cada resposta, a taxa de erros (HTTP 500), o tamanho máximo das páginas e o tempo até
+uma exportação ficar pronta são configuráveis. Com a mesma semente, os dados gerados são os mesmos.
+
+Uso (a partir da pasta back-end):
+    python -m benchmarks.mock_tenable --porta 8089 [--latencia 50] [--taxa-erro 0.01] [--itens-por-pagina 50]
+
+e, para apontar o back-end para o servidor:
+    TENABLE_BASE_URL=http://127.0.0.1:8089 flask run
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .dados_sinteticos import CATALOGO_SERVIDORES, CATALOGO_SITES, carregar_nomes_vulnerabilidades, escrever_csv_servidores, gerar_relatorio_was
+
+OPCOES_PADRAO = {
+    "latencia": 0.0,
+    "taxa_erro": 0.0,
+    "itens_por_pagina": 200,
+    "findings_por_relatorio": 200,
+    "tamanho_evidencia": 2000,
+    "linhas_csv": 10000,
+    "tempo_exportacao": 2.0,
+    "semente": 42,
+}
+
+
+def gerar_dados_tenable(usuarios: int, pastas: int, scans_was: int, scans_vm: int, semente: int = 42) -> dict:
+    """
+    Gera os usuários, pastas, configurações de scans WAS e scans VM servidos pelo mock.
+
+    :param usuarios: Quantidade de usuários.
+    :param pastas: Quantidade de pastas do WAS (as mesmas para todos os usuários).
+    :param scans_was: Quantidade de configurações de scans WAS, distribuídas entre usuários e pastas.
+    :param scans_vm: Quantidade de scans do Tenable VM.
+    :param semente: Semente dos dados gerados.
+    :return: Dicionário com "usuarios", "pastas", "configs" e "scans_vm".
+    """
+    aleatorio = random.Random(semente)
+
+    def novo_uuid() -> str:
+        return str(uuid.UUID(int=aleatorio.getrandbits(128), version=4))
+
+    lista_usuarios = [
+        {"id": i + 1, "uuid": novo_uuid(), "user_name": f"usuario{i}@exemplo.gov.br"}
+        for i in range(usuarios)
+    ]
+    lista_pastas = [{"folder_id": novo_uuid(), "name": f"Pasta {i}"} for i in range(pastas)]
+
+    data_base = datetime(2025, 1, 1)
+    configs = []
+    for i in range(scans_was):
+        usuario = lista_usuarios[i % usuarios]
+        pasta = lista_pastas[(i // usuarios) % pastas]
+        criado_em = (data_base + timedelta(hours=i)).isoformat() + "Z"
+        configs.append({
+            "config_id": novo_uuid(),
+            "name": f"Scan site{i}",
+            "description": "Scan gerado sinteticamente.",
+            "target": f"https://site{i}.exemplo.gov.br",
+            "owner_id": usuario["uuid"],
+            "folder": {"id": pasta["folder_id"], "name": pasta["name"]},
+            "created_at": criado_em,
+            "last_scan": {"scan_id": novo_uuid(), "status": "completed", "finalized_at": criado_em},
+        })
+
+    lista_scans_vm = [
+        {
+            "id": i + 1,
+            "uuid": novo_uuid(),
+            "name": f"Scan servidores {i}",
+            "owner": lista_usuarios[i % usuarios]["user_name"],
+            "status": "completed",
+        }
+        for i in range(scans_vm)
+    ]
+
+    return {
+        "usuarios": lista_usuarios,
+        "pastas": lista_pastas,
+        "configs": configs,
+        "scans_vm": lista_scans_vm,
+    }
+
+
+class ManipuladorTenable(BaseHTTPRequestHandler):
+
+    """
+    Atende as requisições do mock. Os dados e as opções ficam no servidor (ver criar_servidor).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    ROTAS = [
+        ("GET", re.compile(r"^/users$"), "_usuarios"),
+        ("GET", re.compile(r"^/scans$"), "_scans_vm"),
+        ("POST", re.compile(r"^/scans/(?P<id_scan>[^/]+)/export$"), "_exportar"),
+        ("GET", re.compile(r"^/scans/(?P<id_scan>[^/]+)/export/(?P<arquivo>[^/]+)/status$"), "_status_exportacao"),
+        ("GET", re.compile(r"^/scans/(?P<id_scan>[^/]+)/export/(?P<arquivo>[^/]+)/download$"), "_baixar_exportacao"),
+        ("POST", re.compile(r"^/was/v2/configs/search$"), "_buscar_configs"),
+        ("GET", re.compile(r"^/was/v2/folders$"), "_pastas"),
+        ("PUT", re.compile(r"^/was/v2/scans/(?P<scan_id>[^/]+)/report$"), "_gerar_relatorio"),
+        ("GET", re.compile(r"^/was/v2/scans/(?P<scan_id>[^/]+)/report$"), "_relatorio"),
+    ]
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def log_message(self, format, *args):
+        if self.server.verboso:
+            super().log_message(format, *args)
+
+    # =================================
+    #   Infraestrutura
+    # =================================
+
+    def _atender(self, metodo: str):
+        url = urlparse(self.path)
+        self.parametros = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        corpo = self.rfile.read(tamanho) if tamanho else b""
+        self.corpo = json.loads(corpo) if corpo else {}
+
+        opcoes = self.server.opcoes
+
+        if opcoes["latencia"]:
+            time.sleep(opcoes["latencia"])
+
+        with self.server.trava:
+            self.server.requisicoes += 1
+            falhar = self.server.aleatorio.random() < opcoes["taxa_erro"]
+
+        if falhar:
+            self._responder_json({"error": "Erro simulado pelo servidor de testes."}, 500)
+            return
+
+        for metodo_rota, padrao, nome in self.ROTAS:
+            encontrado = padrao.match(url.path)
+            if metodo_rota == metodo and encontrado:
+                getattr(self, nome)(**encontrado.groupdict())
+                return
+
+        self._responder_json({"error": f"Rota não encontrada: {metodo} {url.path}"}, 404)
+
+    def _responder_json(self, dados, status: int = 200):
+        corpo = json.dumps(dados).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _usuario_impersonado(self) -> dict:
+        impersonate = self.headers.get("X-Impersonate") or ""
+        nome = impersonate.split("username=", 1)[1] if "username=" in impersonate else None
+        return next((usuario for usuario in self.server.dados["usuarios"] if usuario["user_name"] == nome), None)
+
+    # =================================
+    #   Tenable VM
+    # =================================
+
+    def _usuarios(self):
+        self._responder_json({"users": self.server.dados["usuarios"]})
+
+    def _scans_vm(self):
+        self._responder_json({"scans": self.server.dados["scans_vm"], "folders": []})
+
+    def _exportar(self, id_scan: str):
+        with self.server.trava:
+            self.server.proximo_arquivo += 1
+            arquivo = str(self.server.proximo_arquivo)
+            self.server.exportacoes[arquivo] = {"id_scan": id_scan, "inicio": time.monotonic()}
+
+        self._responder_json({"file": arquivo})
+
+    def _exportacao(self, id_scan: str, arquivo: str) -> dict:
+        exportacao = self.server.exportacoes.get(arquivo)
+        if not exportacao or exportacao["id_scan"] != id_scan:
+            self._responder_json({"error": "Exportação não encontrada."}, 404)
+            return None
+        return exportacao
+
+    def _status_exportacao(self, id_scan: str, arquivo: str):
+        exportacao = self._exportacao(id_scan, arquivo)
+        if exportacao:
+            pronta = time.monotonic() - exportacao["inicio"] >= self.server.opcoes["tempo_exportacao"]
+            self._responder_json({"status": "ready" if pronta else "loading"})
+
+    def _baixar_exportacao(self, id_scan: str, arquivo: str):
+        exportacao = self._exportacao(id_scan, arquivo)
+        if not exportacao:
+            return
+
+        # O CSV é escrito diretamente na conexão, sem Content-Length; o fim do arquivo é o fim da conexão
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        saida = io.TextIOWrapper(self.wfile, encoding="utf-8", newline="")
+        aleatorio = random.Random(f"{self.server.opcoes['semente']}-{id_scan}")
+        escrever_csv_servidores(saida, aleatorio, self.server.opcoes["linhas_csv"], self.server.nomes_servidores)
+        saida.flush()
+        saida.detach()
+
+    # =================================
+    #   Tenable WAS
+    # =================================
+
+    def _buscar_configs(self):
+        configs = self.server.dados["configs"]
+
+        usuario = self._usuario_impersonado()
+        if usuario:
+            configs = [config for config in configs if config["owner_id"] == usuario["uuid"]]
+
+        if self.corpo.get("field") == "folder_name":
+            configs = [config for config in configs if config["folder"]["name"] == self.corpo.get("value")]
+
+        offset = int(self.parametros.get("offset", 0))
+        limit = min(int(self.parametros.get("limit", 10)), self.server.opcoes["itens_por_pagina"])
+
+        self._responder_json({
+            "items": configs[offset:offset + limit],
+            "pagination": {"total": len(configs), "offset": offset, "limit": limit},
+        })
+
+    def _pastas(self):
+        self._responder_json(self.server.dados["pastas"])
+
+    def _config_do_scan(self, scan_id: str) -> dict:
+        config = self.server.configs_por_scan.get(scan_id)
+        if not config:
+            self._responder_json({"error": "Scan não encontrado."}, 404)
+        return config
+
+    def _gerar_relatorio(self, scan_id: str):
+        if self._config_do_scan(scan_id):
+            self._responder_json({})
+
+    def _relatorio(self, scan_id: str):
+        config = self._config_do_scan(scan_id)
+        if not config:
+            return
+
+        opcoes = self.server.opcoes
+        aleatorio = random.Random(opcoes["semente"] + zlib.crc32(scan_id.encode("utf-8")))
+
+        self._responder_json(gerar_relatorio_was(
+            aleatorio,
+            config["name"],
+            config["target"],
+            self.server.nomes_sites,
+            opcoes["findings_por_relatorio"],
+            opcoes["tamanho_evidencia"],
+        ))
+
+
+def criar_servidor(host: str = "127.0.0.1", porta: int = 0, usuarios: int = 5, pastas: int = 3, scans_was: int = 100, scans_vm: int = 10, verboso: bool = False, **opcoes) -> ThreadingHTTPServer:
+    """
+    Cria o servidor de testes (sem iniciá-lo).
+
+    :param host: Endereço de escuta.
+    :param porta: Porta de escuta (0 escolhe uma porta livre; ver servidor.server_address).
+    :param usuarios: Quantidade de usuários.
+    :param pastas: Quantidade de pastas do WAS.
+    :param scans_was: Quantidade de configurações de scans WAS.
+    :param scans_vm: Quantidade de scans do Tenable VM.
+    :param verboso: Se cada requisição deve ser registrada no terminal.
+    :param opcoes: Substituem os valores de OPCOES_PADRAO (latencia em segundos, taxa_erro entre 0 e 1,
+        itens_por_pagina, findings_por_relatorio, tamanho_evidencia, linhas_csv, tempo_exportacao em
+        segundos e semente).
+    :return: Servidor pronto para serve_forever().
+    """
+    desconhecidas = set(opcoes) - set(OPCOES_PADRAO)
+    if desconhecidas:
+        raise TypeError(f"Opções desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    opcoes = {**OPCOES_PADRAO, **opcoes}
+
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorTenable)
+    servidor.daemon_threads = True
+
+    servidor.opcoes = opcoes
+    servidor.verboso = verboso
+    servidor.dados = gerar_dados_tenable(usuarios, pastas, scans_was, scans_vm, opcoes["semente"])
+    servidor.configs_por_scan = {config["last_scan"]["scan_id"]: config for config in servidor.dados["configs"]}
+    servidor.nomes_sites = carregar_nomes_vulnerabilidades(CATALOGO_SITES)
+    servidor.nomes_servidores = carregar_nomes_vulnerabilidades(CATALOGO_SERVIDORES)
+
+    servidor.trava = threading.Lock()
+    servidor.aleatorio = random.Random(opcoes["semente"])
+    servidor.requisicoes = 0
+    servidor.exportacoes = {}
+    servidor.proximo_arquivo = 0
+
+    return servidor
+
+
+def iniciar_em_segundo_plano(servidor: ThreadingHTTPServer) -> threading.Thread:
+    """
+    Inicia o servidor em uma thread daemon. Para encerrá-lo, use servidor.shutdown().
+
+    :return: Thread do servidor.
+    """
+    thread = threading.Thread(target=servidor.serve_forever, name="mock-tenable", daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do Tenable.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8089)
+    parser.add_argument("--latencia", type=float, default=0, help="Latência de cada resposta, em milissegundos.")
+    parser.add_argument("--taxa-erro", type=float, default=0, help="Fração das requisições respondidas com HTTP 500 (0 a 1).")
+    parser.add_argument("--itens-por-pagina", type=int, default=OPCOES_PADRAO["itens_por_pagina"], help="Tamanho máximo das páginas da busca do WAS.")
+    parser.add_argument("--usuarios", type=int, default=5)
+    parser.add_argument("--pastas", type=int, default=3)
+    parser.add_argument("--scans-was", type=int, default=100)
+    parser.add_argument("--scans-vm", type=int, default=10)
+    parser.add_argument("--findings-por-relatorio", type=int, default=OPCOES_PADRAO["findings_por_relatorio"])
+    parser.add_argument("--tamanho-evidencia", type=int, default=OPCOES_PADRAO["tamanho_evidencia"], help="Tamanho, em caracteres, da evidência de cada finding.")
+    parser.add_argument("--linhas-csv", type=int, default=OPCOES_PADRAO["linhas_csv"], help="Linhas do CSV exportado pelos scans VM.")
+    parser.add_argument("--tempo-exportacao", type=float, default=OPCOES_PADRAO["tempo_exportacao"], help="Segundos até uma exportação ficar pronta.")
+    parser.add_argument("--semente", type=int, default=OPCOES_PADRAO["semente"])
+    parser.add_argument("--verboso", action="store_true", help="Registra cada requisição no terminal.")
+    args = parser.parse_args()
+
+    servidor = criar_servidor(
+        args.host,
+        args.porta,
+        usuarios=args.usuarios,
+        pastas=args.pastas,
+        scans_was=args.scans_was,
+        scans_vm=args.scans_vm,
+        verboso=args.verboso,
+        latencia=args.latencia / 1000,
+        taxa_erro=args.taxa_erro,
+        itens_por_pagina=args.itens_por_pagina,
+        findings_por_relatorio=args.findings_por_relatorio,
+        tamanho_evidencia=args.tamanho_evidencia,
+        linhas_csv=args.linhas_csv,
+        tempo_exportacao=args.tempo_exportacao,
+        semente=args.semente,
+    )
+
+    host, porta = servidor.server_address[:2]
+    print(f"Mock do Tenable em http://{host}:{porta} ({len(servidor.dados['configs'])} scans WAS, {len(servidor.dados['scans_vm'])} scans VM)")
+    print(f"Usuários: {', '.join(usuario['user_name'] for usuario in servidor.dados['usuarios'])}")
+    print(f"Pastas: {', '.join(pasta['name'] for pasta in servidor.dados['pastas'])}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Configuração do gunicorn para produção (usada pelo Dockerfile):
+    gunicorn --config gunicorn.conf.py "src.asgi:create_asgi_app()"
+
+Os workers são do uvicorn (ASGI): as buscas de scans no Tenable são atendidas no event loop de cada
+worker, e as demais rotas do Flask em um pool de threads (ver src/asgi.py).
+
+Dimensionamento (todos ajustáveis por variáveis de ambiente):
+- GUNICORN_THREADS (padrão 8): requisições do app Flask atendidas ao mesmo tempo por worker (lido em
+  src/asgi.py). As rotas passam a maior parte do tempo esperando o MongoDB e o Tenable, então threads
+  são suficientes e baratas. As buscas de scans no event loop não ocupam essas threads.
+- GUNICORN_WORKERS (padrão 2): processos. Os workers só atendem HTTP: os relatórios são gerados pelo
+  consumidor da fila, um processo à parte (python -m src.consumidor_relatorios), dimensionado por
+  `workers_relatorio` e `processos_ingestao` (config.json).
+- GUNICORN_MAX_REQUESTS (padrão 1000) e GUNICORN_MAX_REQUESTS_JITTER (padrão 100): reciclagem dos
+  workers, para devolver memória fragmentada. O jitter evita que todos reiniciem juntos.
+- GUNICORN_TIMEOUT (padrão 60): segundos sem sinal de vida até o worker ser considerado travado.
+- GUNICORN_GRACEFUL_TIMEOUT (padrão 30): no desligamento ou na reciclagem, tempo dado aos workers
+  para terminar as requisições em andamento.
+- GUNICORN_BIND (padrão 0.0.0.0:5000).
+
+Com preload_app, o app é importado uma única vez no processo principal, antes de criar os workers,
+que herdam os módulos por copy-on-write.
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+preload_app = True
+accesslog = "-"
+
+# As métricas de cada worker são gravadas nesta pasta e somadas em /metrics (ver utils/metricas.py).
+# Precisa estar definida antes de o app (e o prometheus_client) ser importado, e começar vazia.
+PASTA_METRICAS = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "metricas_gunicorn"))
+shutil.rmtree(PASTA_METRICAS, ignore_errors=True)
+os.makedirs(PASTA_METRICAS)
+
+
+def when_ready(server):
+    """
+    Executado no processo principal após importar o app e antes de criar os workers.
+    """
+    from src.database.database import fechar_cliente
+
+    # Nenhum cliente do MongoDB aberto durante a importação do app é herdado pelos workers, que abrem o seu
+    fechar_cliente()
+
+    # Tira os objetos já criados do coletor de lixo, que de outra forma escreveria neles nos workers e
+    # desfaria o compartilhamento das páginas de memória
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,129 @@
+"""
+Índice do catálogo de vulnerabilidades (vulnerabilidades.json / vulnerabilidades_servidores.json) e
+do descritivo de categorias e subcategorias, usado na geração do conteúdo LaTeX.
+
+As buscas por nome de vulnerabilidade, categoria e subcategoria são feitas em dicionários montados
+uma única vez, em vez de percorrer as listas do catálogo a cada vulnerabilidade encontrada. Quando há
+entradas repetidas, vale a primeira ocorrência, como na busca linear que o índice substitui.
+
+Os índices ficam em memória por processo e são reconstruídos quando algum dos arquivos muda
+(tamanho ou mtime), já que o catálogo é editado pelas rotas de gerenciamento de vulnerabilidades.
+"""
+
+import os
+import threading
+
+from ..utils.json_utils import carregar_json_utf
+from ..utils.metricas import registrar_consulta_cache
+
+DESCRICAO_INDISPONIVEL = "Descrição não disponível."
+
+# Acima deste tamanho (em caracteres) o Anexo A em construção passa da memória para um arquivo temporário
+TAMANHO_ANEXO_EM_MEMORIA = 1024 * 1024
+
+_catalogos = {}
+_trava_catalogos = threading.Lock()
+
+
+def padronizar(texto: str) -> str:
+    """Remove espaços extras e converte para lowercase para padronizar."""
+    return texto.strip().lower() if texto else ""
+
+
+class CatalogoVulnerabilidades:
+    """
+    Índice do catálogo de vulnerabilidades e do descritivo de categorias/subcategorias.
+
+    :param vulnerabilidades_dados: Lista de vulnerabilidades do catálogo (com Vulnerabilidade, Categoria,
+        Subcategoria, Descrição, Solução e Imagem).
+    :param descritivo_vulnerabilidades: Lista de categorias e subcategorias no formato de _montar_descritivo.
+    """
+
+    def __init__(self, vulnerabilidades_dados: list, descritivo_vulnerabilidades: list):
+        self._por_nome = {}
+        for vuln in vulnerabilidades_dados:
+            self._por_nome.setdefault(vuln.get("Vulnerabilidade"), vuln)
+
+        self._descricao_categoria = {}
+        self._descricao_subcategoria = {}
+        for item in descritivo_vulnerabilidades:
+            self._descricao_categoria.setdefault(padronizar(item.get("categoria")), item["descricao"])
+            self._descricao_subcategoria.setdefault(padronizar(item.get("subcategoria")), item["descricao"])
+
+    def buscar_vulnerabilidade(self, nome: str) -> dict:
+        """
+        Busca os dados de uma vulnerabilidade pelo nome exato.
+
+        :param nome: Nome da vulnerabilidade.
+        :return: Dados da vulnerabilidade no catálogo, ou None se não estiver cadastrada.
+        """
+        return self._por_nome.get(nome)
+
+    def descricao_categoria(self, categoria_padronizada: str) -> str:
+        """
+        :param categoria_padronizada: Nome da categoria já padronizado (ver padronizar).
+        :return: Descrição da categoria, ou DESCRICAO_INDISPONIVEL.
+        """
+        return self._descricao_categoria.get(categoria_padronizada, DESCRICAO_INDISPONIVEL)
+
+    def descricao_subcategoria(self, subcategoria_padronizada: str) -> str:
+        """
+        :param subcategoria_padronizada: Nome da subcategoria já padronizado (ver padronizar).
+        :return: Descrição da subcategoria, ou DESCRICAO_INDISPONIVEL.
+        """
+        return self._descricao_subcategoria.get(subcategoria_padronizada, DESCRICAO_INDISPONIVEL)
+
+
+def _montar_descritivo(dados: dict) -> list:
+    """
+    Achata o descritivo de categorias em uma lista com uma entrada por categoria e por subcategoria.
+
+    :param dados: Conteúdo do arquivo de descritivo (JSON), com a lista "vulnerabilidades".
+    :return: Lista de dicionários com categoria, subcategoria (quando houver) e descricao.
+    """
+    descritivo = []
+    for categoria in dados["vulnerabilidades"]:
+        descritivo.append({
+            "categoria": categoria["categoria"],
+            "descricao": categoria["descricao"]
+        })
+        for subcategoria in categoria.get("subcategorias", []):
+            descritivo.append({
+                "categoria": categoria["categoria"],
+                "subcategoria": subcategoria["subcategoria"],
+                "descricao": subcategoria["descricao"]
+            })
+    return descritivo
+
+
+def _assinatura(caminho: str) -> tuple:
+    stat = os.stat(caminho)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def obter_catalogo(caminho_vulnerabilidades: str, caminho_descritivo: str) -> CatalogoVulnerabilidades:
+    """
+    Retorna o índice do catálogo, reaproveitando o já montado neste processo enquanto os arquivos
+    não forem alterados.
+
+    :param caminho_vulnerabilidades: Caminho do catálogo de vulnerabilidades (JSON).
+    :param caminho_descritivo: Caminho do descritivo de categorias e subcategorias (JSON).
+    :return: Índice do catálogo.
+    """
+    chave = (os.path.abspath(caminho_vulnerabilidades), os.path.abspath(caminho_descritivo))
+    assinatura = (_assinatura(caminho_vulnerabilidades), _assinatura(caminho_descritivo))
+
+    with _trava_catalogos:
+        em_memoria = _catalogos.get(chave)
+        if em_memoria and em_memoria[0] == assinatura:
+            registrar_consulta_cache("catalogo", True)
+            return em_memoria[1]
+
+        registrar_consulta_cache("catalogo", False)
+
+        catalogo = CatalogoVulnerabilidades(
+            carregar_json_utf(caminho_vulnerabilidades),
+            _montar_descritivo(carregar_json_utf(caminho_descritivo))
+        )
+        _catalogos[chave] = (assinatura, catalogo)
+        return catalogo
@@ -1,54 +1,175 @@
 from collections import defaultdict
+from functools import partial
 import json
 import os
-import re
+import shutil
+import tempfile
 from typing import List
 import pandas as pd
-from ..utils.json_utils import carregar_json_utf
+from ..utils.utils import mapear_arquivos
+from ..utils.cache_utils import obter_resumo_em_cache
+from .catalogo import CatalogoVulnerabilidades, padronizar, TAMANHO_ANEXO_EM_MEMORIA
 
 
-def obter_vulnerabilidades_comum_csv(csv_files: List[str]) -> dict:
+RISCOS_CSV = ['critical', 'high', 'medium', 'low']
+
+# Host e Risk se repetem muito nos exports do Nessus: como categorias, cada valor distinto
+# é armazenado (e normalizado) uma única vez
+DTYPES_CSV = {'Name': str, 'Host': 'category', 'Risk': 'category'}
+
+def _resumir_bloco_csv(df: pd.DataFrame) -> tuple:
     """
-    Obtém as vulnerabilidades comuns entre os arquivos CSV, agrupando-as por Name,
-    listando os hosts afetados e a severidade (Risk).
+    Agrupa por Name as vulnerabilidades de um bloco (DataFrame) lido de um arquivo CSV.
+
+    Parâmetros:
+    - df (pd.DataFrame): Bloco com as colunas Name, Host e Risk.
+
+    Retorna:
+    - tuple: (vulnerabilidades agrupadas por Name com hosts e risks sem repetição, hosts únicos do bloco),
+             ambos na ordem em que aparecem no bloco.
+    """
+    # Em colunas categóricas, map aplica a normalização apenas sobre as categorias distintas
+    host = df['Host'].map(str.strip, na_action='ignore')
+
+    # Hosts analisados: todas as linhas com Host preenchido, independentemente da severidade
+    hosts = host.dropna()
+    hosts = hosts[hosts != ''].unique().tolist()
+
+    # Para o agrupamento os valores já normalizados voltam a ser objetos (str), pois groupby().agg(list)
+    # não reconstrói listas a partir de colunas categóricas
+    df = pd.DataFrame({
+        'Name': df['Name'].str.strip(),
+        'Host': host.astype(object),
+        'Risk': df['Risk'].map(lambda risk: risk.strip().lower(), na_action='ignore').astype(object),
+    }).dropna(subset=['Name', 'Host', 'Risk'])
+    df = df[df['Risk'].isin(RISCOS_CSV)]
+
+    # drop_duplicates mantém a primeira ocorrência e groupby(sort=False) preserva a ordem do arquivo
+    hosts_por_nome = df.drop_duplicates(['Name', 'Host']).groupby('Name', sort=False)['Host'].agg(list)
+    riscos_por_nome = df.drop_duplicates(['Name', 'Risk']).groupby('Name', sort=False)['Risk'].agg(list)
+
+    vulnerabilidades = {
+        name: {"hosts": hosts_nome, "risks": riscos_por_nome[name]}
+        for name, hosts_nome in hosts_por_nome.items()
+    }
+    return vulnerabilidades, hosts
+
+def resumir_arquivo_csv(csv_file: str, tamanho_chunk: int = None) -> dict:
+    """
+    Lê um único arquivo CSV e, em uma só passagem vetorizada, agrupa as vulnerabilidades por Name
+    e extrai os hosts analisados.
+
+    Parâmetros:
+    - csv_file (str): Caminho do arquivo CSV.
+    - tamanho_chunk (int): Se informado, o arquivo é lido em blocos com essa quantidade de linhas e
+      agregado incrementalmente, permitindo processar exports maiores que a memória disponível.
+
+    Retorna:
+    - dict: Resumo do arquivo com as chaves:
+        - 'vulnerabilidades': vulnerabilidades agrupadas por Name, contendo os hosts e as severidades
+          (risks) sem repetição, na ordem em que aparecem no arquivo.
+        - 'hosts': hosts únicos do arquivo, na ordem em que aparecem.
+        - 'erro': mensagem do erro, apenas se o arquivo não pôde ser lido (com o resumo vazio). Um resumo
+          com erro não é gravado no cache (ver utils/cache_utils.obter_resumo_em_cache).
+    """
+    # Dicionários são usados como conjuntos ordenados, preservando a ordem de primeira ocorrência
+    vulnerabilidades = {}
+    hosts = {}
+
+    try:
+        leitor = pd.read_csv(csv_file, usecols=['Name', 'Host', 'Risk'], dtype=DTYPES_CSV, chunksize=tamanho_chunk or None)
+        blocos = leitor if tamanho_chunk else [leitor]
+
+        for bloco in blocos:
+            vulnerabilidades_bloco, hosts_bloco = _resumir_bloco_csv(bloco)
+
+            hosts.update(dict.fromkeys(hosts_bloco))
+            for name, dados in vulnerabilidades_bloco.items():
+                atual = vulnerabilidades.setdefault(name, {"hosts": {}, "risks": {}})
+                atual["hosts"].update(dict.fromkeys(dados["hosts"]))
+                atual["risks"].update(dict.fromkeys(dados["risks"]))
+    except Exception as e:
+        print(f"Erro ao processar {csv_file}: {e}")
+        return {"vulnerabilidades": {}, "hosts": [], "erro": str(e)}
+
+    return {
+        "vulnerabilidades": {
+            name: {"hosts": list(dados["hosts"]), "risks": list(dados["risks"])}
+            for name, dados in vulnerabilidades.items()
+        },
+        "hosts": list(hosts)
+    }
+
+def _resumir_arquivo_csv(csv_file: str, tamanho_chunk: int = None, pasta_cache: str = None) -> dict:
+    """
+    Retorna o resumo de um arquivo CSV, consultando antes o cache persistente (ver utils/cache_utils),
+    se informado. Fica no nível do módulo para poder ser executada em um pool de processos.
+    """
+    if pasta_cache:
+        return obter_resumo_em_cache(pasta_cache, csv_file, "csv", partial(resumir_arquivo_csv, tamanho_chunk=tamanho_chunk))
+    return resumir_arquivo_csv(csv_file, tamanho_chunk)
+
+def carregar_scans_csv(csv_files: List[str], processos: int = 1, tamanho_chunk: int = None, pasta_cache: str = None) -> dict:
+    """
+    Lê cada arquivo CSV uma única vez e monta o modelo compartilhado do relatório de servidores.
 
     Parâmetros:
     - csv_files (List[str]): Lista com os caminhos dos arquivos CSV.
+    - processos (int): Quantidade de processos usados na leitura dos arquivos. Os resumos parciais
+      são combinados na ordem dos arquivos, então o resultado é idêntico ao da leitura serial.
+    - tamanho_chunk (int): Quantidade de linhas por bloco na leitura de cada arquivo (ver resumir_arquivo_csv).
+    - pasta_cache (str): Pasta do cache persistente de resumos. Arquivos que não mudaram desde a
+      última leitura não são lidos novamente.
 
     Retorna:
-    - dict: Dicionário com vulnerabilidades agrupadas por Name, contendo os hosts afetados (sem repetição)
-            e a severidade (risk).
+    - dict: Modelo com as chaves:
+        - 'vulnerabilidades_comuns': vulnerabilidades agrupadas por Name (ver obter_vulnerabilidades_comum_csv).
+        - 'riscos': contagem por nível de risco (ver contar_vulnerabilidades_csv).
+        - 'hosts': lista de hosts únicos.
     """
     # Utiliza defaultdict para agrupar vulnerabilidades por nome
     common_vulnerabilities = defaultdict(lambda: {"hosts": set(), "risks": set()})
+    hosts = set()  # Usando um conjunto para evitar duplicatas
 
-    # Itera sobre cada arquivo CSV
-    if not csv_files:
-        return {}
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file, usecols=['Name', 'Host', 'Risk'])
-            df = df.dropna(subset=['Name', 'Host', 'Risk'])
-
-            for _, row in df.iterrows():
-                name = str(row['Name']).strip()
-                host = str(row['Host']).strip()
-                risk = str(row['Risk']).strip().lower()
-
-                if risk in {'critical', 'high', 'medium', 'low'}:
-                    common_vulnerabilities[name]["hosts"].add(host)
-                    common_vulnerabilities[name]["risks"].add(risk)
-        except Exception as e:
-            print(f"Erro ao processar {csv_file}: {e}")
+    # Combina os resumos de cada arquivo
+    resumir = partial(_resumir_arquivo_csv, tamanho_chunk=tamanho_chunk, pasta_cache=pasta_cache)
+    for resumo in mapear_arquivos(resumir, csv_files, processos):
+        for name, dados in resumo["vulnerabilidades"].items():
+            common_vulnerabilities[name]["hosts"].update(dados["hosts"])
+            common_vulnerabilities[name]["risks"].update(dados["risks"])
+        hosts.update(resumo["hosts"])
 
     # Converte sets para listas para facilitar exportação ou exibição
-    return {
+    vulnerabilidades_comuns = {
         name: {
             "hosts": list(data["hosts"]),
             "risks": list(data["risks"])
         }
         for name, data in common_vulnerabilities.items()
     }
+
+    return {
+        "vulnerabilidades_comuns": vulnerabilidades_comuns,
+        "riscos": contar_vulnerabilidades_csv(vulnerabilidades_comuns),
+        "hosts": list(hosts)
+    }
+
+def obter_vulnerabilidades_comum_csv(csv_files: List[str], processos: int = 1) -> dict:
+    """
+    Obtém as vulnerabilidades comuns entre os arquivos CSV, agrupando-as por Name,
+    listando os hosts afetados e a severidade (Risk).
+
+    Parâmetros:
+    - csv_files (List[str]): Lista com os caminhos dos arquivos CSV.
+    - processos (int): Quantidade de processos usados na leitura dos arquivos.
+
+    Retorna:
+    - dict: Dicionário com vulnerabilidades agrupadas por Name, contendo os hosts afetados (sem repetição)
+            e a severidade (risk).
+    """
+    if not csv_files:
+        return {}
+    return carregar_scans_csv(csv_files, processos)["vulnerabilidades_comuns"]
     
 def contar_vulnerabilidades_csv(vulnerabilidades: dict) -> dict:
     """
@@ -86,149 +207,37 @@ def extrair_hosts_csv(csv_files: List[str]) -> List[str]:
     Retorna:
     - List[str]: Lista com os hosts únicos encontrados nos arquivos.
     """
-    hosts = set()  # Usando um conjunto para evitar duplicatas
-
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file, usecols=['Host'])
-            df['Host'] = df['Host'].astype(str).str.strip()
-
-            for host in df['Host'].dropna():
-                if host:
-                    hosts.add(host)
-        except Exception as e:
-            print(f"Erro ao processar {csv_file}: {e}")
-
-    return list(hosts)
-
-def montar_conteudo_latex_csv(caminho_arquivo, vulnerabilidades_dados, caminho_relatorio_exemplo: str):
-    """
-    Monta o conteúdo LaTeX para um relatório de vulnerabilidades a partir de um arquivo de relatório e dados adicionais.
-
-    Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo de relatório contendo as vulnerabilidades.
-    - vulnerabilidades_dados (list): Lista de dicionários contendo informações adicionais sobre as vulnerabilidades 
-      (como categoria, subcategoria, descrição, solução e imagem).
-
-    Retorno:
-    - str: Conteúdo completo em LaTeX, pronto para ser inserido em um relatório.
-    """
-
-    # Carregar as vulnerabilidades do arquivo de relatório
-    vulnerabilidades = carregar_vulnerabilidades_do_relatorio_csv(caminho_arquivo)
-    
-    descritivos_vulnerabilidade = carregar_descritivo_vulnerabilidades_csv(f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades_servidores.json")
-    
-    # Gerar o conteúdo LaTeX para as vulnerabilidades carregadas
-    conteudo_latex = gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabilidades_dados, descritivos_vulnerabilidade)
-    
-    return conteudo_latex  # Retorna o conteúdo LaTeX completo
-
-def carregar_descritivo_vulnerabilidades_csv(caminho_arquivo):
-    """
-    Carrega e organiza as informações de categorias e subcategorias de vulnerabilidades 
-    a partir de um arquivo JSON.
-
-    Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo JSON contendo as descrições.
-
-    Retorno:
-    - list: Uma lista de dicionários contendo as descrições de categorias e subcategorias.
-    """
-    descritivo = []
-
-    dados = carregar_json_utf(caminho_arquivo)
-        
-    for categoria in dados["vulnerabilidades"]:
-        print(categoria)
-        categoria_nome = categoria["categoria"]
-        categoria_descricao = categoria["descricao"]
-        
-        # Adiciona a categoria principal
-        descritivo.append({
-            "categoria": categoria_nome,
-            "descricao": categoria_descricao
-        })
-
-        # Adiciona as subcategorias, se existirem
-        for subcategoria in categoria.get("subcategorias", []):
-            descritivo.append({
-                "categoria": categoria_nome,
-                "subcategoria": subcategoria["subcategoria"],
-                "descricao": subcategoria["descricao"]
-            })
-
-    return descritivo  # Retorna a lista com descrições organizadas
+    return carregar_scans_csv(csv_files)["hosts"]
 
-
-
-def carregar_vulnerabilidades_do_relatorio_csv(caminho_arquivo):
+def montar_vulnerabilidades_relatorio_csv(vulnerabilidades_comuns: dict) -> list:
     """
-    Carrega e extrai informações de vulnerabilidades e hosts afetados a partir de um arquivo de relatório.
+    Converte as vulnerabilidades agrupadas por Name na lista usada pela geração do LaTeX, ordenada pela
+    quantidade de hosts afetados, como no relatório em texto (gerar_relatorio_txt_csv).
 
     Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo de relatório contendo as vulnerabilidades.
+    - vulnerabilidades_comuns (dict): Dicionário retornado por obter_vulnerabilidades_comum_csv.
 
     Retorno:
     - list: Uma lista de dicionários com dados de cada vulnerabilidade.
     """
     vulnerabilities = []
 
-    with open(caminho_arquivo, 'r', encoding="utf-8") as file:
-        vulnerability = None
-        severity = None
-        collecting_hosts = False
-        affected_hosts = []
-
-        for line in file:
-            line = line.strip()
-
-            # Identifica nova vulnerabilidade
-            match_vuln = re.match(r'^Vulnerabilidade:\s*(.+)', line)
-            if match_vuln:
-                # Salva a anterior
-                if vulnerability:
-                    vulnerabilities.append({
-                        "Vulnerabilidade": vulnerability,
-                        "Severidade": severity,
-                        "Total de Hosts Afetados": len(affected_hosts),
-                        "Hosts": affected_hosts
-                    })
-                vulnerability = match_vuln.group(1).strip()
-                severity = None
-                affected_hosts = []
-                collecting_hosts = False
-                continue
-
-            # Captura a severidade
-            match_sev = re.match(r'^Severidade:\s*(.+)', line)
-            if match_sev:
-                severity = match_sev.group(1).strip().lower()
-                collecting_hosts = False
-                continue
-
-            # Detecta início da lista de hosts
-            if line.startswith("Hosts Afetados:"):
-                collecting_hosts = True
-                continue
-
-            # Coleta os hosts após o título
-            if collecting_hosts and line and not line.startswith("Vulnerabilidade:"):
-                affected_hosts.append(line.strip())
-
-        # Adiciona a última vulnerabilidade
-        if vulnerability:
-            vulnerabilities.append({
-                "Vulnerabilidade": vulnerability,
-                "Severidade": severity,
-                "Total de Hosts Afetados": len(affected_hosts),
-                "Hosts": affected_hosts
-            })
+    sorted_vulnerabilities = sorted(
+        vulnerabilidades_comuns.items(),
+        key=lambda item: len(item[1]['hosts']),
+        reverse=True
+    )
+    for name, data in sorted_vulnerabilities:
+        affected_hosts = [host.strip() for host in data['hosts'] if host.strip()]
+        vulnerabilities.append({
+            "Vulnerabilidade": name.strip(),
+            "Severidade": ', '.join(data['risks']).strip().lower(),
+            "Total de Hosts Afetados": len(affected_hosts),
+            "Hosts": affected_hosts
+        })
 
     return vulnerabilities
 
-
-
 def gerar_latex_vulnerabilidades(vulnerabilidades, json_path='data/vulnerabilidades_servidores.json'):
     # Garante que o diretório existe
     pasta_destino = 'data/relatoriosprontos'
@@ -309,26 +318,25 @@ def gerar_latex_vulnerabilidades(vulnerabilidades, json_path='data/vulnerabilida
 
 
 
-def gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabilidades_dados, descritivo_vulnerabilidades):
+def escrever_conteudo_latex_para_vulnerabilidades_csv(saida, vulnerabilidades, catalogo: CatalogoVulnerabilidades):
     """
     Gera o conteúdo em LaTeX para as vulnerabilidades, corrigindo duplicações, preservando a capitalização,
     e ordenando categorias e subcategorias em ordem alfabética. A categoria "Outras Vulnerabilidades Críticas e Explorações"
     é sempre exibida por último.
 
+    O conteúdo é escrito em partes diretamente em `saida`, sem montar o documento inteiro em memória. O Anexo A,
+    que vem depois de todas as categorias, é acumulado em um arquivo temporário (em memória enquanto for pequeno)
+    e copiado para `saida` ao final.
+
     Parâmetros:
+    - saida: Objeto com método write (arquivo aberto em modo texto, io.StringIO etc.).
     - vulnerabilidades (list): Lista de vulnerabilidades extraídas do arquivo.
-    - vulnerabilidades_dados (list): Dados adicionais sobre as vulnerabilidades.
-    - descritivo_vulnerabilidades (list): Descrições de categorias e subcategorias.
-
-    Retorno:
-    - str: Conteúdo formatado em LaTeX.
+    - catalogo (CatalogoVulnerabilidades): Índice com os dados adicionais das vulnerabilidades e as descrições
+      de categorias e subcategorias.
     """
-    def padronizar(texto):
-        """Remove espaços extras e converte para lowercase para padronizar."""
-        return texto.strip().lower() if texto else ""
-
-    conteudo = ""  # Inicializa o conteúdo LaTeX
-    anexo_conteudo = ""  # Inicializa o conteúdo do Anexo A
+    escrever = saida.write
+    anexo = tempfile.SpooledTemporaryFile(max_size=TAMANHO_ANEXO_EM_MEMORIA, mode='w+', encoding='utf-8')  # Conteúdo do Anexo A
+    escrever_anexo = anexo.write
     categorias = {}  # Dicionário para organizar as vulnerabilidades por categoria e subcategoria
     categorias_formatadas = {}  # Para armazenar os nomes originais (com capitalização correta)
     vulnerabilidades_sem_categoria = []  # Lista para vulnerabilidades sem categoria
@@ -341,7 +349,7 @@ def gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabili
         affected_uris = v["Hosts"]
 
         # Busca os dados adicionais da vulnerabilidade
-        dados_vuln = next((vuln for vuln in vulnerabilidades_dados if vuln["Vulnerabilidade"] == vulnerabilidade_nome), None)
+        dados_vuln = catalogo.buscar_vulnerabilidade(vulnerabilidade_nome)
         
         if dados_vuln:
             categoria = padronizar(dados_vuln["Categoria"])
@@ -384,13 +392,9 @@ def gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabili
         categoria_formatada = categorias_formatadas[categoria_padronizada]
         
         # Busca a descrição da categoria no descritivo
-        descricao_categoria = next(
-            (item["descricao"] for item in descritivo_vulnerabilidades 
-             if padronizar(item.get("categoria")) == categoria_padronizada), 
-            "Descrição não disponível."
-        )
-        conteudo += f"%-------------- INÍCIO DA CATEGORIA {categoria_formatada} --------------\n"
-        conteudo += f"\\subsection{{{categoria_formatada}}}\n{descricao_categoria}\n\n"
+        descricao_categoria = catalogo.descricao_categoria(categoria_padronizada)
+        escrever(f"%-------------- INÍCIO DA CATEGORIA {categoria_formatada} --------------\n")
+        escrever(f"\\subsection{{{categoria_formatada}}}\n{descricao_categoria}\n\n")
 
         # Ordenar subcategorias
         subcategorias = categorias[categoria_padronizada]
@@ -398,20 +402,16 @@ def gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabili
             subcategoria_formatada = categorias_formatadas[subcategoria_padronizada]
 
             # Busca a descrição da subcategoria no descritivo
-            descricao_subcategoria = next(
-                (item["descricao"] for item in descritivo_vulnerabilidades 
-                 if padronizar(item.get("subcategoria")) == subcategoria_padronizada), 
-                "Descrição não disponível."
-            )
-            conteudo += f"%-------------- INÍCIO DA SUBCATEGORIA {subcategoria_formatada} --------------\n"
-            conteudo += f"\\subsubsection{{{subcategoria_formatada}}}\n{descricao_subcategoria}\n\n"
-            conteudo += "\\begin{enumerate}\n"
+            descricao_subcategoria = catalogo.descricao_subcategoria(subcategoria_padronizada)
+            escrever(f"%-------------- INÍCIO DA SUBCATEGORIA {subcategoria_formatada} --------------\n")
+            escrever(f"\\subsubsection{{{subcategoria_formatada}}}\n{descricao_subcategoria}\n\n")
+            escrever("\\begin{enumerate}\n")
 
             for v in subcategorias[subcategoria_padronizada]:
-                conteudo += f"%-------------- INÍCIO DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n"
-                conteudo += f"\\item \\textbf{{{v['Vulnerabilidade']}}}\\\\\n"
+                escrever(f"%-------------- INÍCIO DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n")
+                escrever(f"\\item \\textbf{{{v['Vulnerabilidade']}}}\\\\\n")
                 if v["Imagem"]:
-                    conteudo += (
+                    escrever(
                         r"""
                         \begin{figure}[h!]
                         \centering
@@ -420,54 +420,54 @@ def gerar_conteudo_latex_para_vulnerabilidades_csv(vulnerabilidades, vulnerabili
                         \FloatBarrier
                         """
                     )
-                conteudo += f"\\textbf{{Descrição:}} {v['Descricao']}\n\n"
-                conteudo += f"\\textbf{{Solução:}} {v['Solucao']}\n\n"
-                conteudo += f"\\textbf{{Total de URIs Afetadas:}} {v['Total de URI Afetadas']}\n\n"
+                escrever(f"\\textbf{{Descrição:}} {v['Descricao']}\n\n")
+                escrever(f"\\textbf{{Solução:}} {v['Solucao']}\n\n")
+                escrever(f"\\textbf{{Total de URIs Afetadas:}} {v['Total de URI Afetadas']}\n\n")
 
                 # Lida com a exibição de instâncias afetadas
                 if len(v["URI Afetadas"]) > 10:
-                    conteudo += "\\textbf{Instâncias Afetadas (parcial):}\n\\begin{itemize}\n"
+                    escrever("\\textbf{Instâncias Afetadas (parcial):}\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"][:10]:
-                        conteudo += f"    \\item \\url{{{uri}}}\n"
-                    conteudo += "\\end{itemize}\n"
-                    conteudo += (
+                        escrever(f"    \\item \\url{{{uri}}}\n")
+                    escrever("\\end{itemize}\n")
+                    escrever(
                         "A lista completa das aplicações que possuem esta vulnerabilidade pode ser "
                         f"encontrada no \\hyperref[anexoA]{{Anexo A}}.\n\n"
                     )
 
                     # Adiciona o restante ao anexo
-                    anexo_conteudo += f"%-------------- INÍCIO DO ANEXO PARA {v['Vulnerabilidade']} --------------\n"
-                    anexo_conteudo += f"\\subsubsection*{{{v['Vulnerabilidade']}}}\n"
-                    anexo_conteudo += "\\begin{multicols}{3}\n\\small\n\\begin{itemize}\n"
+                    escrever_anexo(f"%-------------- INÍCIO DO ANEXO PARA {v['Vulnerabilidade']} --------------\n")
+                    escrever_anexo(f"\\subsubsection*{{{v['Vulnerabilidade']}}}\n")
+                    escrever_anexo("\\begin{multicols}{3}\n\\small\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"]:
-                        anexo_conteudo += f"    \\item \\url{{{uri}}}\n"
-                    anexo_conteudo += "\\end{itemize}\n\\end{multicols}\n\n"
+                        escrever_anexo(f"    \\item \\url{{{uri}}}\n")
+                    escrever_anexo("\\end{itemize}\n\\end{multicols}\n\n")
                 else:
-                    conteudo += "\\textbf{Instâncias Afetadas:}\n\\begin{itemize}\n"
+                    escrever("\\textbf{Instâncias Afetadas:}\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"]:
-                        conteudo += f"    \\item \\url{{{uri}}}\n"
-                    conteudo += "\\end{itemize}\n\n"
-                conteudo += f"%-------------- FIM DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n"
+                        escrever(f"    \\item \\url{{{uri}}}\n")
+                    escrever("\\end{itemize}\n\n")
+                escrever(f"%-------------- FIM DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n")
 
-            conteudo += "\\end{enumerate}\n"
-            conteudo += f"%-------------- FIM DA SUBCATEGORIA {subcategoria_formatada} --------------\n"
+            escrever("\\end{enumerate}\n")
+            escrever(f"%-------------- FIM DA SUBCATEGORIA {subcategoria_formatada} --------------\n")
 
-        conteudo += f"%-------------- FIM DA CATEGORIA {categoria_formatada} --------------\n"
+        escrever(f"%-------------- FIM DA CATEGORIA {categoria_formatada} --------------\n")
 
     # Adiciona as vulnerabilidades sem categoria, se existirem
     if vulnerabilidades_sem_categoria:
-        conteudo += "%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------\n"
-        conteudo += "\\section{Vulnerabilidades sem Categoria}\n\\begin{itemize}\n"
+        escrever("%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------\n")
+        escrever("\\section{Vulnerabilidades sem Categoria}\n\\begin{itemize}\n")
         for vuln in vulnerabilidades_sem_categoria:
-            conteudo += f"    \\item {vuln}\n"
-        conteudo += "\\end{itemize}\n"
-        conteudo += "%-------------- FIM DAS VULNERABILIDADES SEM CATEGORIA --------------\n"
+            escrever(f"    \\item {vuln}\n")
+        escrever("\\end{itemize}\n")
+        escrever("%-------------- FIM DAS VULNERABILIDADES SEM CATEGORIA --------------\n")
 
     # Adiciona o Anexo A, se necessário
-    if anexo_conteudo:
-        conteudo += "%-------------- INÍCIO DO ANEXO A --------------\n"
-        conteudo += "\\section*{Anexo A}\n\\label{anexoA}\n"
-        conteudo += anexo_conteudo
-        conteudo += "%-------------- FIM DO ANEXO A --------------\n"
-
-    return conteudo
\ No newline at end of file
+    with anexo:
+        if anexo.tell():
+            escrever("%-------------- INÍCIO DO ANEXO A --------------\n")
+            escrever("\\section*{Anexo A}\n\\label{anexoA}\n")
+            anexo.seek(0)
+            shutil.copyfileobj(anexo, saida)
+            escrever("%-------------- FIM DO ANEXO A --------------\n")
@@ -14,17 +14,21 @@ Funções presentes:
 
 ##LIBS
 from collections import defaultdict
+from functools import partial
 import json
-import re
 from urllib.parse import urlparse, urljoin
 import glob
 import os
 from typing import List
 import json
 from pathlib import Path
+import shutil
+import tempfile
 
-from ..utils.utils import contar_riscos, limpar_protocolos_url
-from ..utils.json_utils import carregar_json, carregar_json_utf
+from ..utils.utils import limpar_protocolos_url, mapear_arquivos
+from ..utils.json_utils import carregar_scan_json
+from ..utils.cache_utils import obter_resumo_em_cache
+from .catalogo import CatalogoVulnerabilidades, padronizar, TAMANHO_ANEXO_EM_MEMORIA
 
 
 CAMINHO_RELATORIOS_JSON = "data/arquivos_json"
@@ -66,42 +70,162 @@ def extrair_targets(json_files: List[str]) -> List[str]:
     Retorna:
     - List[str]: Lista com os targets extraídos dos arquivos JSON, sem duplicatas.
     """
-    targets = set()  # Usando um conjunto para evitar duplicatas
-    for json_file in json_files:
-        
-        data = carregar_json(json_file)
-        target = data.get('scan', {}).get('target', 'Não disponível')
-        
-        if target != 'Não disponível':
-            targets.add(target)  # Adiciona o target ao conjunto
-            
-    return list(targets)  # Retorna uma lista com os targets únicos
+    return carregar_scans_json(json_files)["targets"]
 
-def obter_vulnerabilidades_comum(json_files: List[str]) -> dict:
+def obter_vulnerabilidades_comum(json_files: List[str], processos: int = 1) -> dict:
     """
     Obtém as vulnerabilidades comuns entre os arquivos JSON, agrupando-as por nome e plugin_id.
 
     Parâmetros:
     - json_files (List[str]): Lista com os caminhos dos arquivos JSON.
+    - processos (int): Quantidade de processos usados na leitura dos arquivos.
 
     Retorna:
     - dict: Dicionário com vulnerabilidades agrupadas por (nome, plugin_id) e as URIs afetadas.
     """
-    common_vulnerabilities = defaultdict(list)
-    for json_file in json_files:
-        data = carregar_json(json_file)
-        target = data.get('scan', {}).get('target', 'Não disponível')
-        
-        for finding in data.get('findings', []):
-            risk_factor = finding.get('risk_factor', 'Não disponível')
+    return carregar_scans_json(json_files, processos)["vulnerabilidades_comuns"]
+
+def resumir_scan_json(data: dict) -> dict:
+    """
+    Percorre os findings de um único scan WAS uma só vez, extraindo tudo o que o relatório
+    precisa desse arquivo.
+
+    Parâmetros:
+    - data (dict): Conteúdo do arquivo JSON exportado pelo Tenable WAS.
+
+    Retorna:
+    - dict: Resumo do scan com as chaves:
+        - 'target': domínio analisado (ou None, se ausente no arquivo).
+        - 'riscos': contagem de vulnerabilidades por nível de risco.
+        - 'vulnerabilidades': URIs afetadas agrupadas por (nome, plugin_id).
+        - 'site': linha do quantitativo por site (ou None, se o target estiver ausente).
+    """
+    target = data.get('scan', {}).get('target', 'Não disponível')
+
+    riscos = {'High': 0, 'Critical': 0, 'Low': 0, 'Medium': 0}
+    vulnerabilidades = defaultdict(list)
+
+    for finding in data.get('findings', []):
+        risk_factor = finding.get('risk_factor', 'Não disponível')
+        if "info" not in risk_factor:
+            risco = risk_factor.lower()
+            if risco == 'high':
+                riscos['High'] += 1
+            elif risco == 'critical':
+                riscos['Critical'] += 1
+            elif risco == 'low':
+                riscos['Low'] += 1
+            elif risco == 'medium':
+                riscos['Medium'] += 1
+
             uri = finding.get('uri', 'Não disponível')
             name = finding.get('name', 'Não disponível')
             plugin_id = finding.get('plugin_id', 'Não disponível')
-            if "info" not in risk_factor:
-                #Formatando as URI para possuir apenas o domínio e sem duplicatas
-                formatted_uri = formatar_uri(target, uri)
-                common_vulnerabilities[(name, plugin_id)].append(formatted_uri)
-    return common_vulnerabilities
+            #Formatando as URI para possuir apenas o domínio e sem duplicatas
+            vulnerabilidades[(name, plugin_id)].append(formatar_uri(target, uri))
+
+    site = None
+    if target != 'Não disponível':
+        site = {
+            'Site': limpar_protocolos_url(target),
+            'Critical': riscos['Critical'],
+            'High': riscos['High'],
+            'Medium': riscos['Medium'],
+            'Low': riscos['Low'],
+            'Total': sum(riscos.values())
+        }
+
+    return {
+        'target': target if target != 'Não disponível' else None,
+        'riscos': riscos,
+        'vulnerabilidades': vulnerabilidades,
+        'site': site
+    }
+
+def combinar_resumos_json(resumos) -> dict:
+    """
+    Combina os resumos individuais (ver resumir_scan_json) no modelo compartilhado do relatório.
+
+    Parâmetros:
+    - resumos (Iterable[dict]): Resumos dos scans, na ordem dos arquivos.
+
+    Retorna:
+    - dict: Modelo com as chaves:
+        - 'riscos': contagem total de vulnerabilidades por nível de risco.
+        - 'vulnerabilidades_comuns': URIs afetadas agrupadas por (nome, plugin_id).
+        - 'targets': lista de targets únicos.
+        - 'sites': quantitativo de vulnerabilidades por site.
+    """
+    riscos = {'High': 0, 'Critical': 0, 'Low': 0, 'Medium': 0}
+    vulnerabilidades_comuns = defaultdict(list)
+    targets = set()  # Usando um conjunto para evitar duplicatas
+    sites = []
+
+    for resumo in resumos:
+        for risco, quantidade in resumo['riscos'].items():
+            riscos[risco] += quantidade
+
+        for chave, uris in resumo['vulnerabilidades'].items():
+            vulnerabilidades_comuns[chave].extend(uris)
+
+        if resumo['target'] is not None:
+            targets.add(resumo['target'])
+
+        if resumo['site'] is not None:
+            sites.append(resumo['site'])
+
+    return {
+        'riscos': riscos,
+        'vulnerabilidades_comuns': vulnerabilidades_comuns,
+        'targets': list(targets),
+        'sites': sites
+    }
+
+def _resumo_json_para_cache(json_file: str) -> dict:
+    """
+    Resume um arquivo JSON no formato gravado no cache, em que as vulnerabilidades agrupadas por
+    (nome, plugin_id) viram uma lista de [nome, plugin_id, uris], já que o JSON não aceita tuplas como chave.
+    """
+    resumo = resumir_scan_json(carregar_scan_json(json_file))
+    resumo['vulnerabilidades'] = [[name, plugin_id, uris] for (name, plugin_id), uris in resumo['vulnerabilidades'].items()]
+    return resumo
+
+def _resumo_json_do_cache(resumo: dict) -> dict:
+    """
+    Reconstrói as chaves (nome, plugin_id) de um resumo lido do cache (ver _resumo_json_para_cache).
+    """
+    vulnerabilidades = defaultdict(list)
+    for name, plugin_id, uris in resumo['vulnerabilidades']:
+        vulnerabilidades[(name, plugin_id)] = uris
+    return {**resumo, 'vulnerabilidades': vulnerabilidades}
+
+def _resumir_arquivo_json(json_file: str, pasta_cache: str = None) -> dict:
+    """
+    Carrega um arquivo JSON em streaming e retorna o seu resumo, consultando antes o cache persistente
+    (ver utils/cache_utils), se informado. Fica no nível do módulo para poder ser executada em um pool
+    de processos.
+    """
+    if pasta_cache:
+        return _resumo_json_do_cache(obter_resumo_em_cache(pasta_cache, json_file, "json", _resumo_json_para_cache))
+    return resumir_scan_json(carregar_scan_json(json_file))
+
+def carregar_scans_json(json_files: List[str], processos: int = 1, pasta_cache: str = None) -> dict:
+    """
+    Carrega cada arquivo JSON uma única vez e monta o modelo compartilhado com contagem por risco,
+    vulnerabilidades agrupadas, targets e quantitativo por site.
+
+    Parâmetros:
+    - json_files (List[str]): Lista com os caminhos dos arquivos JSON.
+    - processos (int): Quantidade de processos usados na leitura dos arquivos. Os resumos parciais
+      são combinados na ordem dos arquivos, então o resultado é idêntico ao da leitura serial.
+    - pasta_cache (str): Pasta do cache persistente de resumos. Arquivos que não mudaram desde a
+      última leitura não são lidos novamente.
+
+    Retorna:
+    - dict: Modelo dos scans (ver combinar_resumos_json).
+    """
+    resumir = partial(_resumir_arquivo_json, pasta_cache=pasta_cache)
+    return combinar_resumos_json(mapear_arquivos(resumir, json_files, processos))
 
 def extrair_dominio(target: str) -> str:
     """
@@ -148,156 +272,53 @@ def contar_vulnerabilidades(json_files: List[str]) -> dict:
     Retorna:
     - dict: Dicionário com contagem das vulnerabilidades por tipo.
     """
-    risk_factor_counts = {'High': 0, 'Critical': 0, 'Low': 0, 'Medium': 0}
-    for json_file in json_files:
-        data = carregar_json(json_file)
-        for finding in data.get('findings', []):
-            risk_factor = finding.get('risk_factor', 'Não disponível')
-            if "info" not in risk_factor:
-                if risk_factor.lower() == 'high':
-                    risk_factor_counts['High'] += 1
-                elif risk_factor.lower() == 'critical':
-                    risk_factor_counts['Critical'] += 1
-                elif risk_factor.lower() == 'low':
-                    risk_factor_counts['Low'] += 1
-                elif risk_factor.lower() == 'medium':
-                    risk_factor_counts['Medium'] += 1
-    return risk_factor_counts
-
-def montar_conteudo_latex(caminho_arquivo, vulnerabilidades_dados, caminho_relatorio_exemplo: str):
-    """
-    Monta o conteúdo LaTeX para um relatório de vulnerabilidades a partir de um arquivo de relatório e dados adicionais.
+    return carregar_scans_json(json_files)["riscos"]
 
-    Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo de relatório contendo as vulnerabilidades.
-    - vulnerabilidades_dados (list): Lista de dicionários contendo informações adicionais sobre as vulnerabilidades 
-      (como categoria, subcategoria, descrição, solução e imagem).
-
-    Retorno:
-    - str: Conteúdo completo em LaTeX, pronto para ser inserido em um relatório.
+def montar_vulnerabilidades_relatorio(vulnerabilidades_comuns: dict) -> list:
     """
-
-
-    # Carregar as vulnerabilidades do arquivo de relatório
-    vulnerabilidades = carregar_vulnerabilidades_do_relatorio(caminho_arquivo)
-    
-    descritivos_vulnerabilidade = carregar_descritivo_vulnerabilidades(f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades.json")
-
-    # Gerar o conteúdo LaTeX para as vulnerabilidades carregadas
-    conteudo_latex = gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidades_dados, descritivos_vulnerabilidade)
-    
-
-    return conteudo_latex  # Retorna o conteúdo LaTeX completo
-
-def carregar_vulnerabilidades_do_relatorio(caminho_arquivo):
-    """
-    Carrega e extrai informações de vulnerabilidades a partir de um arquivo de relatório.
+    Converte as vulnerabilidades agrupadas por (nome, plugin_id) na lista usada pela geração do LaTeX,
+    com os mesmos critérios do relatório em texto (gerar_relatorio_txt): apenas vulnerabilidades com mais
+    de uma URI, ordenadas pela quantidade de URIs distintas afetadas.
 
     Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo de relatório contendo as vulnerabilidades.
+    - vulnerabilidades_comuns (dict): Dicionário retornado por obter_vulnerabilidades_comum.
 
     Retorno:
     - list: Uma lista de dicionários, onde cada dicionário contém os dados de uma vulnerabilidade.
     """
-    
-    vulnerabilities = []  # Lista para armazenar as vulnerabilidades extraídas
-
-    with open(caminho_arquivo, 'r', encoding="utf-8") as file:
-        vulnerability = None  
-        total_affected_uris = None  
-        affected_uris = []  
+    vulnerabilities = []
 
-        
-        for line in file:
-            line = line.strip()  # Remove espaços em branco no início e fim de cada linha
-            
-            match_vulnerability = re.match(r"^Vulnerabilidade:(.*)", line)
-            if match_vulnerability:
-                # Quando encontra uma nova vulnerabilidade, armazena a anterior (se houver) e reinicia os dados
-                if vulnerability:
-                    vulnerabilities.append({
-                        "Vulnerabilidade": vulnerability,
-                        "Total de URI Afetadas": total_affected_uris,
-                        "URI Afetadas": affected_uris
-                    })
-                vulnerability = match_vulnerability.group(1).strip()  # Extrai o nome da vulnerabilidade
-                affected_uris = []  # Reseta as URIs afetadas para a nova vulnerabilidade
-                continue
-
-            match_total_uris = re.match(r"^Total de URI Afetadas:(\d+)", line)
-            if match_total_uris:
-                total_affected_uris = int(match_total_uris.group(1))  # Extrai o número de URIs afetadas
-                continue
-
-            match_uris = re.match(r"^http(s)?://.*", line)
-            if match_uris:
-                affected_uris.append(line)  # Adiciona a URI à lista de afetadas
-
-        # Ao final, adiciona a última vulnerabilidade lida
-        if vulnerability:
+    sorted_vulnerabilities = sorted(vulnerabilidades_comuns.items(), key=lambda x: len(set(x[1])), reverse=True)
+    for (name, plugin_id), uris in sorted_vulnerabilities:
+        if len(uris) > 1:
+            unique_uris = list(set(uris))
             vulnerabilities.append({
-                "Vulnerabilidade": vulnerability,
-                "Total de URI Afetadas": total_affected_uris,
-                "URI Afetadas": affected_uris
+                "Vulnerabilidade": name.strip(),
+                "Total de URI Afetadas": len(unique_uris),
+                "URI Afetadas": [uri for uri in unique_uris if uri.startswith(("http://", "https://"))]
             })
 
-    return vulnerabilities  # Retorna a lista de vulnerabilidades extraídas
+    return vulnerabilities
 
-def carregar_descritivo_vulnerabilidades(caminho_arquivo):
-    """
-    Carrega e organiza as informações de categorias e subcategorias de vulnerabilidades 
-    a partir de um arquivo JSON.
-
-    Parâmetros:
-    - caminho_arquivo (str): O caminho completo do arquivo JSON contendo as descrições.
-
-    Retorno:
-    - list: Uma lista de dicionários contendo as descrições de categorias e subcategorias.
-    """
-    descritivo = []
-
-    dados = carregar_json_utf(caminho_arquivo)
-        
-    for categoria in dados["vulnerabilidades"]:
-        categoria_nome = categoria["categoria"]
-        categoria_descricao = categoria["descricao"]
-        
-        # Adiciona a categoria principal
-        descritivo.append({
-            "categoria": categoria_nome,
-            "descricao": categoria_descricao
-        })
-
-        # Adiciona as subcategorias, se existirem
-        for subcategoria in categoria.get("subcategorias", []):
-            descritivo.append({
-                "categoria": categoria_nome,
-                "subcategoria": subcategoria["subcategoria"],
-                "descricao": subcategoria["descricao"]
-            })
-
-    return descritivo  # Retorna a lista com descrições organizadas
-
-def gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidades_dados, descritivo_vulnerabilidades):
+def escrever_conteudo_latex_para_vulnerabilidades(saida, vulnerabilidades, catalogo: CatalogoVulnerabilidades):
     """
     Gera o conteúdo em LaTeX para as vulnerabilidades, corrigindo duplicações, preservando a capitalização,
     e ordenando categorias e subcategorias em ordem alfabética. A categoria "Outras Vulnerabilidades Críticas e Explorações"
     é sempre exibida por último.
 
+    O conteúdo é escrito em partes diretamente em `saida`, sem montar o documento inteiro em memória. O Anexo A,
+    que vem depois de todas as categorias, é acumulado em um arquivo temporário (em memória enquanto for pequeno)
+    e copiado para `saida` ao final.
+
     Parâmetros:
+    - saida: Objeto com método write (arquivo aberto em modo texto, io.StringIO etc.).
     - vulnerabilidades (list): Lista de vulnerabilidades extraídas do arquivo.
-    - vulnerabilidades_dados (list): Dados adicionais sobre as vulnerabilidades.
-    - descritivo_vulnerabilidades (list): Descrições de categorias e subcategorias.
-
-    Retorno:
-    - str: Conteúdo formatado em LaTeX.
+    - catalogo (CatalogoVulnerabilidades): Índice com os dados adicionais das vulnerabilidades e as descrições
+      de categorias e subcategorias.
     """
-    def padronizar(texto):
-        """Remove espaços extras e converte para lowercase para padronizar."""
-        return texto.strip().lower() if texto else ""
-
-    conteudo = ""  # Inicializa o conteúdo LaTeX
-    anexo_conteudo = ""  # Inicializa o conteúdo do Anexo A
+    escrever = saida.write
+    anexo = tempfile.SpooledTemporaryFile(max_size=TAMANHO_ANEXO_EM_MEMORIA, mode='w+', encoding='utf-8')  # Conteúdo do Anexo A
+    escrever_anexo = anexo.write
     categorias = {}  # Dicionário para organizar as vulnerabilidades por categoria e subcategoria
     categorias_formatadas = {}  # Para armazenar os nomes originais (com capitalização correta)
     vulnerabilidades_sem_categoria = []  # Lista para vulnerabilidades sem categoria
@@ -309,7 +330,7 @@ def gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidade
         affected_uris = v["URI Afetadas"]
 
         # Busca os dados adicionais da vulnerabilidade
-        dados_vuln = next((vuln for vuln in vulnerabilidades_dados if vuln["Vulnerabilidade"] == vulnerabilidade_nome), None)
+        dados_vuln = catalogo.buscar_vulnerabilidade(vulnerabilidade_nome)
         
         if dados_vuln:
             categoria = padronizar(dados_vuln["Categoria"])
@@ -352,13 +373,9 @@ def gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidade
         categoria_formatada = categorias_formatadas[categoria_padronizada]
         
         # Busca a descrição da categoria no descritivo
-        descricao_categoria = next(
-            (item["descricao"] for item in descritivo_vulnerabilidades 
-             if padronizar(item.get("categoria")) == categoria_padronizada), 
-            "Descrição não disponível."
-        )
-        conteudo += f"%-------------- INÍCIO DA CATEGORIA {categoria_formatada} --------------\n"
-        conteudo += f"\\subsection{{{categoria_formatada}}}\n{descricao_categoria}\n\n"
+        descricao_categoria = catalogo.descricao_categoria(categoria_padronizada)
+        escrever(f"%-------------- INÍCIO DA CATEGORIA {categoria_formatada} --------------\n")
+        escrever(f"\\subsection{{{categoria_formatada}}}\n{descricao_categoria}\n\n")
 
         # Ordenar subcategorias
         subcategorias = categorias[categoria_padronizada]
@@ -366,20 +383,16 @@ def gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidade
             subcategoria_formatada = categorias_formatadas[subcategoria_padronizada]
 
             # Busca a descrição da subcategoria no descritivo
-            descricao_subcategoria = next(
-                (item["descricao"] for item in descritivo_vulnerabilidades 
-                 if padronizar(item.get("subcategoria")) == subcategoria_padronizada), 
-                "Descrição não disponível."
-            )
-            conteudo += f"%-------------- INÍCIO DA SUBCATEGORIA {subcategoria_formatada} --------------\n"
-            conteudo += f"\\subsubsection{{{subcategoria_formatada}}}\n{descricao_subcategoria}\n\n"
-            conteudo += "\\begin{enumerate}\n"
+            descricao_subcategoria = catalogo.descricao_subcategoria(subcategoria_padronizada)
+            escrever(f"%-------------- INÍCIO DA SUBCATEGORIA {subcategoria_formatada} --------------\n")
+            escrever(f"\\subsubsection{{{subcategoria_formatada}}}\n{descricao_subcategoria}\n\n")
+            escrever("\\begin{enumerate}\n")
 
             for v in subcategorias[subcategoria_padronizada]:
-                conteudo += f"%-------------- INÍCIO DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n"
-                conteudo += f"\\item \\textbf{{{v['Vulnerabilidade']}}}\n"
+                escrever(f"%-------------- INÍCIO DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n")
+                escrever(f"\\item \\textbf{{{v['Vulnerabilidade']}}}\n")
                 if v["Imagem"]:
-                    conteudo += (
+                    escrever(
                         r"""
                         \begin{figure}[h!]
                         \centering
@@ -388,57 +401,57 @@ def gerar_conteudo_latex_para_vulnerabilidades(vulnerabilidades, vulnerabilidade
                         \FloatBarrier
                         """
                     )
-                conteudo += f"\\textbf{{Descrição:}} {v['Descricao']}\n\n"
-                conteudo += f"\\textbf{{Solução:}} {v['Solucao']}\n\n"
-                conteudo += f"\\textbf{{Total de URIs Afetadas:}} {v['Total de URI Afetadas']}\n\n"
+                escrever(f"\\textbf{{Descrição:}} {v['Descricao']}\n\n")
+                escrever(f"\\textbf{{Solução:}} {v['Solucao']}\n\n")
+                escrever(f"\\textbf{{Total de URIs Afetadas:}} {v['Total de URI Afetadas']}\n\n")
 
                 # Lida com a exibição de instâncias afetadas
                 if len(v["URI Afetadas"]) > 10:
-                    conteudo += "\\textbf{Instâncias Afetadas (parcial):}\n\\begin{itemize}\n"
+                    escrever("\\textbf{Instâncias Afetadas (parcial):}\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"][:10]:
-                        conteudo += f"    \\item \\url{{{uri}}}\n"
-                    conteudo += "\\end{itemize}\n"
-                    conteudo += (
+                        escrever(f"    \\item \\url{{{uri}}}\n")
+                    escrever("\\end{itemize}\n")
+                    escrever(
                         "A lista completa das aplicações que possuem esta vulnerabilidade pode ser "
                         f"encontrada no \\hyperref[anexoA]{{Anexo A}}.\n\n"
                     )
 
                     # Adiciona o restante ao anexo
-                    anexo_conteudo += f"%-------------- INÍCIO DO ANEXO PARA {v['Vulnerabilidade']} --------------\n"
-                    anexo_conteudo += f"\\subsubsection*{{{v['Vulnerabilidade']}}}\n"
-                    anexo_conteudo += "\\begin{multicols}{3}\n\\small\n\\begin{itemize}\n"
+                    escrever_anexo(f"%-------------- INÍCIO DO ANEXO PARA {v['Vulnerabilidade']} --------------\n")
+                    escrever_anexo(f"\\subsubsection*{{{v['Vulnerabilidade']}}}\n")
+                    escrever_anexo("\\begin{multicols}{3}\n\\small\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"]:
-                        anexo_conteudo += f"    \\item \\url{{{uri}}}\n"
-                    anexo_conteudo += "\\end{itemize}\n\\end{multicols}\n\n"
+                        escrever_anexo(f"    \\item \\url{{{uri}}}\n")
+                    escrever_anexo("\\end{itemize}\n\\end{multicols}\n\n")
                 else:
-                    conteudo += "\\textbf{Instâncias Afetadas:}\n\\begin{itemize}\n"
+                    escrever("\\textbf{Instâncias Afetadas:}\n\\begin{itemize}\n")
                     for uri in v["URI Afetadas"]:
-                        conteudo += f"    \\item \\url{{{uri}}}\n"
-                    conteudo += "\\end{itemize}\n\n"
-                conteudo += f"%-------------- FIM DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n"
+                        escrever(f"    \\item \\url{{{uri}}}\n")
+                    escrever("\\end{itemize}\n\n")
+                escrever(f"%-------------- FIM DA VULNERABILIDADE {v['Vulnerabilidade']} --------------\n")
 
-            conteudo += "\\end{enumerate}\n"
-            conteudo += f"%-------------- FIM DA SUBCATEGORIA {subcategoria_formatada} --------------\n"
+            escrever("\\end{enumerate}\n")
+            escrever(f"%-------------- FIM DA SUBCATEGORIA {subcategoria_formatada} --------------\n")
 
-        conteudo += f"%-------------- FIM DA CATEGORIA {categoria_formatada} --------------\n"
+        escrever(f"%-------------- FIM DA CATEGORIA {categoria_formatada} --------------\n")
 
     # Adiciona as vulnerabilidades sem categoria, se existirem
     if vulnerabilidades_sem_categoria:
-        conteudo += "%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------\n"
-        conteudo += "\\section{Vulnerabilidades sem Categoria}\n\\begin{itemize}\n"
+        escrever("%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------\n")
+        escrever("\\section{Vulnerabilidades sem Categoria}\n\\begin{itemize}\n")
         for vuln in vulnerabilidades_sem_categoria:
-            conteudo += f"    \\item {vuln}\n"
-        conteudo += "\\end{itemize}\n"
-        conteudo += "%-------------- FIM DAS VULNERABILIDADES SEM CATEGORIA --------------\n"
+            escrever(f"    \\item {vuln}\n")
+        escrever("\\end{itemize}\n")
+        escrever("%-------------- FIM DAS VULNERABILIDADES SEM CATEGORIA --------------\n")
 
     # Adiciona o Anexo A, se necessário
-    if anexo_conteudo:
-        conteudo += "%-------------- INÍCIO DO ANEXO A --------------\n"
-        conteudo += "\\section*{Anexo A}\n\\label{anexoA}\n"
-        conteudo += anexo_conteudo
-        conteudo += "%-------------- FIM DO ANEXO A --------------\n"
-
-    return conteudo
+    with anexo:
+        if anexo.tell():
+            escrever("%-------------- INÍCIO DO ANEXO A --------------\n")
+            escrever("\\section*{Anexo A}\n\\label{anexoA}\n")
+            anexo.seek(0)
+            shutil.copyfileobj(anexo, saida)
+            escrever("%-------------- FIM DO ANEXO A --------------\n")
 
 def extrair_dados_vulnerabilidades(data: dict) -> dict:
     """
@@ -450,19 +463,4 @@ def extrair_dados_vulnerabilidades(data: dict) -> dict:
     Retorno:
     - dict: Dados de vulnerabilidade extraídos, incluindo nome do site e contagem de riscos.
     """
-    target = data.get('scan', {}).get('target', 'Não disponível')
-    if target == 'Não disponível':
-        return None
-
-    risk_factor_counts = contar_riscos(data.get('findings', []))
-    cleaned_target = limpar_protocolos_url(target)
-    total = sum(risk_factor_counts.values())
-    
-    return {
-        'Site': cleaned_target,
-        'Critical': risk_factor_counts['Critical'],
-        'High': risk_factor_counts['High'],
-        'Medium': risk_factor_counts['Medium'],
-        'Low': risk_factor_counts['Low'],
-        'Total': total
-    }
\ No newline at end of file
+    return resumir_scan_json(data)['site']
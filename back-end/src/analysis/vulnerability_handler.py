@@ -5,92 +5,154 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'analysis')))
-from .json_parser import *
+from .json_parser import localizar_arquivos, carregar_scans_json, montar_vulnerabilidades_relatorio
 from ..report.report_generator import gerar_relatorio_latex, gerar_relatorio_txt, gerar_relatorio_txt_csv, gerar_relatorio_latex_csv
-from .csv_parser import obter_vulnerabilidades_comum_csv, contar_vulnerabilidades_csv, extrair_hosts_csv
+from .csv_parser import carregar_scans_csv, montar_vulnerabilidades_relatorio_csv
 from ..utils.utils import verificar_e_salvar_vulnerabilidades_ausentes
+from ..utils.trace import rastreado, rastrear
 
     
-def processar_relatorio_json(caminho_arquivos_json: str, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str) -> None:
+@rastreado()
+def processar_relatorio_json(caminho_arquivos_json: str, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str, processos: int = 1, pasta_cache: str = None, salvar_txt: bool = False, modelo_scans: dict = None, gerar_latex: bool = True) -> dict:
  
     """
     Função que encontra os arquivos JSON de relatórios, conta as vulnerabilidades e gera o relatório.
+
+    Cada arquivo é carregado uma única vez; o modelo resultante (ver carregar_scans_json) é retornado
+    para que as etapas seguintes, como extrair_quantidades_vulnerabilidades_por_site, o reutilizem.
+    A leitura dos arquivos pode ser distribuída em `processos` processos e reaproveitar o cache
+    persistente de resumos em `pasta_cache`. O relatório em texto (Sites_agrupados_por_vulnerabilidades.txt)
+    só é gravado se `salvar_txt` for verdadeiro; o LaTeX é gerado diretamente a partir do modelo.
+    Se `modelo_scans` já tiver sido carregado (ver carregar_scans_json), a leitura dos arquivos é pulada.
+    Com `gerar_latex` falso, o LaTeX não é gerado aqui, e sim depois, por gerar_latex_relatorio_json.
     """
     caminhos_relatorios = localizar_arquivos(caminho_arquivos_json, "json") 
     # data/relatórios_prontos/
 
     if caminhos_relatorios:
-        
+
+        # Carregar os scans uma única vez: riscos, vulnerabilidades agrupadas, targets e quantitativo por site
+        if modelo_scans is None:
+            with rastrear("carregar_scans_json", arquivos=len(caminhos_relatorios)):
+                modelo_scans = carregar_scans_json(caminhos_relatorios, processos, pasta_cache)
+
         # Contar as vulnerabilidades dividindo-as por criticas, altas, médias e baixas
-        quantidade_vulnerabilidades_por_risco = contar_vulnerabilidades(caminhos_relatorios)
+        quantidade_vulnerabilidades_por_risco = modelo_scans["riscos"]
 
         # Obter vulnerabilidades comuns entre sites 
-        vulnerabilidades_comuns = obter_vulnerabilidades_comum(caminhos_relatorios)
+        vulnerabilidades_comuns = modelo_scans["vulnerabilidades_comuns"]
 
         #Obter Vulnerabilidades não categorizadas
         nome_arquivo_ausentes = "vulnerabilidades_sites_ausentes.txt" 
-        verificar_e_salvar_vulnerabilidades_ausentes(vulnerabilidades_comuns,"../shared/relatorios/Exemplo/vulnerabilidades.json", caminho_salvar_relatorio,nome_arquivo_ausentes)
+        with rastrear("verificar_vulnerabilidades_ausentes"):
+            verificar_e_salvar_vulnerabilidades_ausentes(vulnerabilidades_comuns,"../shared/relatorios/Exemplo/vulnerabilidades.json", caminho_salvar_relatorio,nome_arquivo_ausentes)
 
         # Obter os targets
-        targets = extrair_targets(caminhos_relatorios)
+        targets = modelo_scans["targets"]
 
-        # Gerar o relatório
-        gerar_relatorio_txt(f"{caminho_salvar_relatorio}/Sites_agrupados_por_vulnerabilidades.txt", quantidade_vulnerabilidades_por_risco, vulnerabilidades_comuns, targets)
+        # Gerar o relatório em texto (opcional)
+        if salvar_txt:
+            gerar_relatorio_txt(f"{caminho_salvar_relatorio}/Sites_agrupados_por_vulnerabilidades.txt", quantidade_vulnerabilidades_por_risco, vulnerabilidades_comuns, targets)
 
         # Gerar o relatório em LaTeX
-        gerar_relatorio_latex(f"{caminho_salvar_relatorio}/(LATEX)Sites_agrupados_por_vulnerabilidades.txt", caminho_salvar_relatorio, caminho_relatorios_exemplo)
+        if gerar_latex:
+            gerar_latex_relatorio_json(modelo_scans, caminho_salvar_relatorio, caminho_relatorios_exemplo)
+
+        return modelo_scans
+
+    return None
     
-def processar_relatorio_csv(caminho_arquivos_csv: str, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str) -> None:
+@rastreado()
+def processar_relatorio_csv(caminho_arquivos_csv: str, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str, processos: int = 1, tamanho_chunk: int = None, pasta_cache: str = None, salvar_txt: bool = False, modelo_scans: dict = None, gerar_latex: bool = True) -> dict:
 
     """
     Função que encontra os arquivos CSV de relatórios, conta as vulnerabilidades e gera o relatório.
+    A leitura dos arquivos pode ser distribuída em `processos` processos, feita em blocos de
+    `tamanho_chunk` linhas e reaproveitar o cache persistente de resumos em `pasta_cache`.
+    O relatório em texto só é gravado se `salvar_txt` for verdadeiro. Se `modelo_scans` já tiver sido
+    carregado, a leitura dos arquivos é pulada. Com `gerar_latex` falso, o LaTeX fica para
+    gerar_latex_relatorio_csv. Retorna o modelo dos scans (ver carregar_scans_csv).
     """
     caminhos_relatorios = localizar_arquivos(caminho_arquivos_csv, "csv")
     if caminhos_relatorios:
+
+        # Ler os arquivos uma única vez: vulnerabilidades agrupadas, contagem por risco e hosts
+        if modelo_scans is None:
+            with rastrear("carregar_scans_csv", arquivos=len(caminhos_relatorios)):
+                modelo_scans = carregar_scans_csv(caminhos_relatorios, processos, tamanho_chunk, pasta_cache)
         
         # Obter vulnerabilidades comuns entre sites 
-        vulnerabilidades_comuns = obter_vulnerabilidades_comum_csv(caminhos_relatorios)
+        vulnerabilidades_comuns = modelo_scans["vulnerabilidades_comuns"]
         
         #Obter Vulnerabilidades não categorizadas
         nome_arquivo_ausentes = "vulnerabilidades_servidores_ausentes.txt" 
-        verificar_e_salvar_vulnerabilidades_ausentes(vulnerabilidades_comuns,"../shared/relatorios/Exemplo/vulnerabilidades_servidores.json", caminho_salvar_relatorio,nome_arquivo_ausentes)
+        with rastrear("verificar_vulnerabilidades_ausentes"):
+            verificar_e_salvar_vulnerabilidades_ausentes(vulnerabilidades_comuns,"../shared/relatorios/Exemplo/vulnerabilidades_servidores.json", caminho_salvar_relatorio,nome_arquivo_ausentes)
 
         # Contar as vulnerabilidades dividindo-as por criticas, altas, médias e baixas
-        quantidade_vulnerabilidades_por_risco = contar_vulnerabilidades_csv(vulnerabilidades_comuns)
+        quantidade_vulnerabilidades_por_risco = modelo_scans["riscos"]
         
         # Obter os targets
-        targets = extrair_hosts_csv(caminhos_relatorios)
+        targets = modelo_scans["hosts"]
 
-        # Gerar o relatório
-        gerar_relatorio_txt_csv(f"{caminho_salvar_relatorio}/Servidores_agrupados_por_vulnerabilidades.txt", quantidade_vulnerabilidades_por_risco, vulnerabilidades_comuns, targets)
+        # Gerar o relatório em texto (opcional)
+        if salvar_txt:
+            gerar_relatorio_txt_csv(f"{caminho_salvar_relatorio}/Servidores_agrupados_por_vulnerabilidades.txt", quantidade_vulnerabilidades_por_risco, vulnerabilidades_comuns, targets)
 
         # Gerar o relatório em LaTeX
-        gerar_relatorio_latex_csv(f"{caminho_salvar_relatorio}/(LATEX)Servidores_agrupados_por_vulnerabilidades.txt", caminho_salvar_relatorio, caminho_relatorios_exemplo)
+        if gerar_latex:
+            gerar_latex_relatorio_csv(modelo_scans, caminho_salvar_relatorio, caminho_relatorios_exemplo)
+
+        return modelo_scans
+
+    return None
+
+@rastreado()
+def gerar_latex_relatorio_json(modelo_scans: dict, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str) -> None:
+
+    """
+    Gera o LaTeX das vulnerabilidades de sites, (LATEX)Sites_agrupados_por_vulnerabilidades.txt, a partir
+    do modelo retornado por processar_relatorio_json. Sem modelo (pasta sem scans JSON), não faz nada.
+    """
+    if modelo_scans is None:
+        return
+
+    vulnerabilidades_relatorio = montar_vulnerabilidades_relatorio(modelo_scans["vulnerabilidades_comuns"])
+    gerar_relatorio_latex(f"{caminho_salvar_relatorio}/(LATEX)Sites_agrupados_por_vulnerabilidades.txt", vulnerabilidades_relatorio, caminho_relatorios_exemplo)
 
-def extrair_quantidades_vulnerabilidades_por_site(OUTPUT_PATH, caminhos_json):
+@rastreado()
+def gerar_latex_relatorio_csv(modelo_scans: dict, caminho_salvar_relatorio: str, caminho_relatorios_exemplo: str) -> None:
+
+    """
+    Gera o LaTeX das vulnerabilidades de servidores, (LATEX)Servidores_agrupados_por_vulnerabilidades.txt,
+    a partir do modelo retornado por processar_relatorio_csv. Sem modelo (pasta sem scans CSV), não faz nada.
+    """
+    if modelo_scans is None:
+        return
+
+    vulnerabilidades_relatorio = montar_vulnerabilidades_relatorio_csv(modelo_scans["vulnerabilidades_comuns"])
+    gerar_relatorio_latex_csv(f"{caminho_salvar_relatorio}/(LATEX)Servidores_agrupados_por_vulnerabilidades.txt", vulnerabilidades_relatorio, caminho_relatorios_exemplo)
+
+@rastreado()
+def extrair_quantidades_vulnerabilidades_por_site(OUTPUT_PATH, caminhos_json, modelo_scans: dict = None):
     """
     Extrai dados de vulnerabilidades por site a partir de arquivos JSON,
     organiza os dados e gera um relatório no formato CSV.
+
+    Se o modelo dos scans já carregado por processar_relatorio_json for informado,
+    os arquivos JSON não são lidos novamente.
     """
     try:
-        # Caminho dos arquivos JSON
-        CAMINHO_RELATORIOS_JSON = caminhos_json
-        files = localizar_arquivos(CAMINHO_RELATORIOS_JSON, "json")
-
-        # Lista para armazenar os dados extraídos
-        new_rows = []
-        print("Iniciando extração de vulnerabilidades...")
-
-        # Extrair dados dos arquivos JSON
-        for file in files:
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        if modelo_scans is None:
+            # Caminho dos arquivos JSON
+            CAMINHO_RELATORIOS_JSON = caminhos_json
+            files = localizar_arquivos(CAMINHO_RELATORIOS_JSON, "json")
 
-            extracted_data = extrair_dados_vulnerabilidades(data)
-            print(f"Dados extraídos para o arquivo {file}: {extracted_data}")
+            print("Iniciando extração de vulnerabilidades...")
+            modelo_scans = carregar_scans_json(files)
 
-            if extracted_data:
-                new_rows.append(extracted_data)
+        # Lista com os dados extraídos
+        new_rows = modelo_scans["sites"]
 
         # Ordenar os dados por total de vulnerabilidades em ordem decrescente
         sorted_rows = sorted(new_rows, key=lambda x: x['Total'], reverse=True)
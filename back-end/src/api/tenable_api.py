@@ -1,9 +1,47 @@
 from dotenv import load_dotenv
-import os, time
-from httpx import Client
+import hashlib
+import os, random, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+import threading
+from typing import Any, Callable, Iterator
+from cachetools import TTLCache
+from httpx import Client, HTTPTransport, USE_CLIENT_DEFAULT
+
+from ..utils.cache_utils import registrar_no_manifesto
+from ..utils.metricas import TransporteMedido, registrar_consulta_cache
 
 load_dotenv("credentials.env")
 
+# Endereço da API do Tenable; pode ser trocado pela variável TENABLE_BASE_URL (ex.: para apontar para
+# o servidor local de testes em benchmarks/mock_tenable.py)
+URL_TENABLE_PADRAO = "https://cloud.tenable.com"
+
+# Paginação das buscas do WAS (/was/v2/configs/search)
+ITENS_POR_PAGINA_WAS = 200
+MAX_PAGINAS_SIMULTANEAS = 4
+
+# Cache das listagens do Tenable: tempo de expiração (em segundos) por endpoint
+TTL_CACHE_TENABLE = {
+    "users": 600,
+    "scans": 60,
+    "was_folders": 300,
+    "was_configs": 120,
+}
+# Quantidade máxima de entradas (ex.: usuários ou pastas distintas) por endpoint
+TAMANHO_CACHE_TENABLE = 256
+
+# Exportações (ex.: CSV dos scans VM): prazo total padrão de espera, timeout de cada requisição
+# e tamanho dos blocos gravados em disco durante o download
+PRAZO_EXPORTACAO = 1800
+TIMEOUT_REQUISICAO_EXPORTACAO = 60
+TAMANHO_BLOCO_DOWNLOAD = 1024 * 1024
+
+
+class ExportacaoCancelada(Exception):
+    """Levantada quando a espera por uma exportação do Tenable é cancelada."""
+
+
 class TenableApi():
 
     _instance = None
@@ -28,46 +66,177 @@ class TenableApi():
         }
 
 
-        self.client = Client(base_url="https://cloud.tenable.com", verify=False, headers=self.headers)
+        self.base_url = os.getenv("TENABLE_BASE_URL", URL_TENABLE_PADRAO)
+
+        # As requisições passam por TransporteMedido, que registra a duração de cada uma em /metrics
+        self.client = Client(base_url=self.base_url, headers=self.headers, transport=TransporteMedido(HTTPTransport(verify=False)))
+
+        self._caches = {endpoint: TTLCache(maxsize=TAMANHO_CACHE_TENABLE, ttl=ttl) for endpoint, ttl in TTL_CACHE_TENABLE.items()}
+        self._estatisticas_cache = {endpoint: {"hits": 0, "misses": 0} for endpoint in TTL_CACHE_TENABLE}
+        self._trava_cache = threading.Lock()
+
+        self._initialized = True
+
+    def _obter_em_cache(self, endpoint: str, chave: Any, buscar: Callable[[], Any]) -> Any:
+
+        """
+        Retorna o valor em cache de `endpoint`/`chave` ou, se ausente ou expirado, o obtém com `buscar`
+        e o guarda pelo TTL do endpoint (ver TTL_CACHE_TENABLE). A requisição é feita fora da trava,
+        então buscas simultâneas pela mesma chave podem ir ao Tenable mais de uma vez.
+
+        Os valores em cache são compartilhados entre as chamadas e não devem ser alterados.
+        """
+
+        encontrado, valor = self.consultar_cache(endpoint, chave)
+
+        if encontrado:
+            return valor
+
+        valor = buscar()
+
+        self.guardar_em_cache(endpoint, chave, valor)
+
+        return valor
+
+    def consultar_cache(self, endpoint: str, chave: Any) -> tuple:
+
+        """
+        Consulta o cache de `endpoint`/`chave`, contabilizando o hit ou miss.
+        Usado também por AsyncTenableApi, que compartilha este cache.
+
+        :return: (True, valor) se a entrada existir e não tiver expirado; caso contrário, (False, None).
+        """
+
+        with self._trava_cache:
+            try:
+                valor = self._caches[endpoint][chave]
+                self._estatisticas_cache[endpoint]["hits"] += 1
+                registrar_consulta_cache(f"tenable_{endpoint}", True)
+                return True, valor
+            except KeyError:
+                self._estatisticas_cache[endpoint]["misses"] += 1
+                registrar_consulta_cache(f"tenable_{endpoint}", False)
+                return False, None
+
+    def guardar_em_cache(self, endpoint: str, chave: Any, valor: Any) -> None:
+
+        with self._trava_cache:
+            self._caches[endpoint][chave] = valor
+
+    def invalidar_cache(self, endpoint: str = None, chave: Any = None) -> None:
+
+        """
+        Descarta entradas do cache das listagens do Tenable.
+
+        :param endpoint: Endpoint a invalidar (chave de TTL_CACHE_TENABLE); None invalida todos.
+        :param chave: Entrada específica do endpoint (ex.: nome do usuário); None invalida o endpoint inteiro.
+        """
+
+        with self._trava_cache:
+            for nome, cache in self._caches.items():
+                if endpoint is not None and nome != endpoint:
+                    continue
+                if chave is None:
+                    cache.clear()
+                else:
+                    cache.pop(chave, None)
+
+    def estatisticas_cache(self) -> dict:
+
+        """
+        :return: Hits, misses e quantidade de entradas atuais do cache de cada endpoint.
+        """
+
+        with self._trava_cache:
+            return {
+                endpoint: {**contadores, "entradas": len(self._caches[endpoint])}
+                for endpoint, contadores in self._estatisticas_cache.items()
+            }
+
+    def _buscar_usuarios(self) -> dict:
+
+        usuarios = {}
+
+        for user in self.client.get("/users").json()["users"]:
+            usuarios.setdefault(user["user_name"], user["uuid"])
+
+        return usuarios
 
     def get_user_id_from_username(self, user_name):
 
-        url = "/users"
+        usuarios = self._obter_em_cache("users", None, self._buscar_usuarios)
+
+        return usuarios.get(user_name)
+
+    def _buscar_pagina_was(self, url: str, offset: int, limit: int, headers: dict = None, payload: dict = None) -> dict:
+
+        response = self.client.post(url, headers=headers, json=payload, params={"limit": limit, "offset": offset})
+        response.raise_for_status()
+
+        return response.json()
 
-        users_json = self.client.get(url).json()["users"]
+    def paginar_busca_was(self, url: str, headers: dict = None, payload: dict = None, itens_por_pagina: int = ITENS_POR_PAGINA_WAS, max_simultaneos: int = MAX_PAGINAS_SIMULTANEAS, em_ordem: bool = False) -> Iterator[dict]:
 
-        for user in users_json:
+        """
+        Percorre todas as páginas de uma busca do WAS (ex.: /was/v2/configs/search), produzindo os itens
+        à medida que as páginas chegam.
 
-            if (user["user_name"] == user_name):
+        A primeira página informa o total; as demais são pedidas em paralelo, em até `max_simultaneos`
+        threads. Se o servidor devolver menos itens do que os pedidos na primeira página (limite de
+        página menor que `itens_por_pagina`), as demais páginas seguem o tamanho efetivamente recebido.
+        Com `em_ordem`, os itens saem na ordem das páginas; caso contrário, na ordem em que as páginas
+        forem respondidas.
 
-                return user["uuid"]
+        :param url: Endpoint de busca.
+        :param headers: Headers adicionais da requisição (ex.: X-Impersonate).
+        :param payload: Filtro da busca, enviado no corpo.
+        :param itens_por_pagina: Quantidade de itens pedidos por página.
+        :param max_simultaneos: Quantidade máxima de páginas pedidas ao mesmo tempo.
+        :param em_ordem: Se os itens devem ser produzidos na ordem das páginas.
+        :return: Iterador sobre os itens de todas as páginas.
+        """
 
-        return None
+        primeira_pagina = self._buscar_pagina_was(url, 0, itens_por_pagina, headers, payload)
+
+        yield from primeira_pagina["items"]
+
+        total = primeira_pagina["pagination"]["total"]
+        itens_por_pagina = min(itens_por_pagina, len(primeira_pagina["items"]))
+
+        if not itens_por_pagina:
+            return
+
+        offsets = range(itens_por_pagina, total, itens_por_pagina)
+
+        if not offsets:
+            return
+
+        buscar = partial(self._buscar_pagina_was, url, limit=itens_por_pagina, headers=headers, payload=payload)
+
+        with ThreadPoolExecutor(max_workers=min(max_simultaneos, len(offsets))) as executor:
+            paginas = [executor.submit(buscar, offset) for offset in offsets]
+
+            for pagina in (paginas if em_ordem else as_completed(paginas)):
+                yield from pagina.result()["items"]
 
     def get_all_web_app_scans_from_username(self, user_name: str) -> dict:
 
         user_id = self.get_user_id_from_username(user_name)
 
-        total_scans = self.client.post("/was/v2/configs/search").json()["pagination"]["total"]
-        itens_per_request = 200
-
         webb_app_scans: dict = {}
 
-        for offset in range(0, total_scans, itens_per_request):
-            limit = min(itens_per_request, total_scans - offset)
-
-            scans = self.client.post(f"/was/v2/configs/search?limit={limit}&offset={offset}").json()["items"]
+        scans = self._obter_em_cache("was_configs", None, lambda: list(self.paginar_busca_was("/was/v2/configs/search")))
 
-            for scan in scans:
+        for scan in scans:
 
-                if (scan["owner_id"] == user_id):
-                    webb_app_scans[scan["config_id"]] = scan
+            if (scan["owner_id"] == user_id):
+                webb_app_scans[scan["config_id"]] = scan
         
         return webb_app_scans
     
     def get_web_app_scans_from_folder_of_user(self, folder_name: str, user_name: str):
 
-        url = "https://cloud.tenable.com/was/v2/configs/search"
+        url = "/was/v2/configs/search"
 
         headers = {
             "accept": "application/json",
@@ -76,35 +245,22 @@ class TenableApi():
             'X-Impersonate' : f"username={user_name}"
         }
 
-        params = {
-            "limit" : 200
-        }
-
         payload = {
             "field": "folder_name",
             "operator": "match",
             "value": folder_name,
         }
 
-        scans = self.client.post(url, headers=headers, json=payload, params=params).json()
-
-        current = 200
-        total = scans['pagination']['total']
-
-        if total > current:
-
-            params['offset'] = current
-
-            response = self.client.post(url, headers=headers, json=payload, params=params).json()
-
-            print(response)
-
-            for scan in response['items']:
-                scans['items'].append(scan)
+        items = self._obter_em_cache(
+            "was_configs",
+            (folder_name, user_name),
+            lambda: list(self.paginar_busca_was(url, headers=headers, payload=payload, em_ordem=True))
+        )
 
-            current += 200
-
-        return scans
+        return {
+            "items": items,
+            "pagination": {"total": len(items), "offset": 0, "limit": len(items)}
+        }
 
 
     def get_web_app_folders_from_username(self, user_name: str) -> dict:
@@ -118,7 +274,13 @@ class TenableApi():
             'X-Impersonate' : f"username={user_name}"
         }
         
-        response = self.client.get(url=url, headers=headers).json()
+        def buscar():
+            response = self.client.get(url=url, headers=headers)
+            # Uma resposta de erro levanta a exceção aqui, para não ficar em cache no lugar das pastas
+            response.raise_for_status()
+            return response.json()
+
+        response = self._obter_em_cache("was_folders", user_name, buscar)
 
         return response
     
@@ -135,85 +297,199 @@ class TenableApi():
         
         return result
     
-    def download_scans_results_json(self, target_dir: str, scans: dict) -> None:
+    def _download_scan_result_json(self, target_dir: str, data: dict, timeout: float = None) -> dict:
+
+        scan_id = (data.get("last_scan") or {}).get("scan_id")
+
+        resultado = {"scan_id": scan_id, "nome": data.get("name"), "sucesso": False, "erro": None}
+
+        if not scan_id:
+            resultado["erro"] = "Scan sem execução concluída (last_scan vazio)."
+            return resultado
+
+        url = f"/was/v2/scans/{scan_id}/report"
+
+        # No httpx, timeout=None desativa o timeout; sem valor informado vale o padrão do Client
+        if timeout is None:
+            timeout = USE_CLIENT_DEFAULT
+
+        try:
+            response = self.client.put(url, timeout=timeout)
+
+            if response.status_code != 200:
+                resultado["erro"] = f"Falha ao gerar o relatório do scan (HTTP {response.status_code})."
+                return resultado
+
+            #
+            #   Salvando dados do scan
+            #
+            resultado.update(self.baixar_para_arquivo(url, f"{target_dir}/{scan_id}.json", timeout))
+            resultado["sucesso"] = True
+
+        except Exception as e:
+            resultado["erro"] = f"{type(e).__name__}: {e}"
+
+        return resultado
+
+    def download_scans_results_json(self, target_dir: str, scans: dict, max_simultaneos: int = 1, timeout: float = None) -> dict:
+
+        """
+        Baixa o relatório JSON de cada scan WAS selecionado para `target_dir`.
+
+        Os downloads são feitos em até `max_simultaneos` threads ao mesmo tempo (o Client do httpx é
+        compartilhado entre elas) e cada requisição respeita o `timeout`, em segundos. A falha de um scan
+        não interrompe os demais.
+
+        :param target_dir: Pasta onde os arquivos <scan_id>.json serão salvos.
+        :param scans: Resultado da busca de scans ({"items": [...]}).
+        :param max_simultaneos: Quantidade máxima de downloads simultâneos.
+        :param timeout: Timeout de cada requisição, em segundos (None usa o padrão do Client).
+        :return: Resumo com total, sucessos, falhas e o resultado de cada scan (com tamanho e SHA-256 do
+            arquivo, quando baixado), na ordem recebida. Os arquivos baixados são registrados no manifesto
+            da pasta (ver utils/cache_utils.registrar_no_manifesto).
+        """
 
         scans = scans["items"]
 
-        for data in scans:
+        baixar = partial(self._download_scan_result_json, target_dir, timeout=timeout)
 
-            scan_id = data["last_scan"]["scan_id"]
+        if max_simultaneos <= 1 or len(scans) <= 1:
+            resultados = [baixar(data) for data in scans]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_simultaneos, len(scans))) as executor:
+                resultados = list(executor.map(baixar, scans))
 
-            url = f"/was/v2/scans/{scan_id}/report"
+        registrar_no_manifesto(target_dir, {
+            f"{resultado['scan_id']}.json": resultado for resultado in resultados if resultado["sucesso"]
+        })
 
-            response = self.client.put(url)
+        sucessos = sum(1 for resultado in resultados if resultado["sucesso"])
 
-            if response.status_code == 200:
-                response = self.client.get(url)
+        return {
+            "total": len(resultados),
+            "sucessos": sucessos,
+            "falhas": len(resultados) - sucessos,
+            "scans": resultados,
+        }
 
-                #
-                #   Salvando dados do scan
-                #
-                with open(f"{target_dir}/{scan_id}.json", "w", encoding="utf-8") as file:
-                    file.write(response.text)
+    def _buscar_vmscans(self) -> dict:
+
+        scans = {}
+
+        for scan in self.client.get("/scans").json()["scans"]:
+            scans.setdefault(scan["name"], scan)
+
+        return scans
 
     def get_vmscans_from_name(self, name: str) -> dict:
 
-        url = "/scans"
+        scans = self._obter_em_cache("scans", None, self._buscar_vmscans)
 
-        scans_json = self.client.get(url).json()["scans"]
+        return scans.get(name)
+    
+    def aguardar_exportacao(self, url_status: str, prazo: float = PRAZO_EXPORTACAO, intervalo_inicial: float = 1, intervalo_maximo: float = 30, cancelamento: threading.Event = None) -> None:
 
-        for scan in scans_json:
+        """
+        Consulta o status de uma exportação do Tenable até ela ficar pronta ("ready").
 
-            if (scan["name"] == name):
+        O intervalo entre as consultas dobra a cada tentativa, até `intervalo_maximo`, com jitter
+        (entre metade e o intervalo inteiro) para que várias exportações não consultem em sincronia.
 
-                return scan
+        :param url_status: Endpoint de status da exportação (ex.: /scans/{id}/export/{file}/status).
+        :param prazo: Tempo máximo total de espera, em segundos.
+        :param intervalo_inicial: Intervalo antes da segunda consulta, em segundos.
+        :param intervalo_maximo: Limite do intervalo entre consultas, em segundos.
+        :param cancelamento: Evento que, quando sinalizado, interrompe a espera.
+        :raises TimeoutError: Se a exportação não ficar pronta dentro do prazo.
+        :raises ExportacaoCancelada: Se `cancelamento` for sinalizado.
+        :raises RuntimeError: Se o Tenable informar erro na exportação.
+        """
 
-        return None
-    
-    def download_vmscans_csv(self, target_dir: str, id_scan: str, story_id: str) -> None:
+        cancelamento = cancelamento or threading.Event()
+        limite = time.monotonic() + prazo
+        intervalo = intervalo_inicial
 
-        print(id_scan)
-        print(story_id)
+        while True:
+            status = self.client.get(url_status, timeout=TIMEOUT_REQUISICAO_EXPORTACAO).json()["status"]
 
-        url = f"https://cloud.tenable.com/scans/{id_scan}/export?history_id={story_id}"
+            if status == "ready":
+                return
 
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "X-ApiKeys": f"accessKey={self.access_key}; secretKey={self.secret_key}",
-        }
+            if status == "error":
+                raise RuntimeError(f"O Tenable informou erro na exportação ({url_status}).")
 
-        payload = {
-            "chapters": "",
-            "format": "csv"
-        }
+            restante = limite - time.monotonic()
+
+            if restante <= 0:
+                raise TimeoutError(f"A exportação não ficou pronta em {prazo:g} segundos ({url_status}).")
+
+            espera = min(random.uniform(intervalo / 2, intervalo), restante)
+
+            if cancelamento.wait(espera):
+                raise ExportacaoCancelada(f"Exportação cancelada ({url_status}).")
+
+            intervalo = min(intervalo * 2, intervalo_maximo)
 
-        client = Client(headers=headers)
+    def baixar_para_arquivo(self, url: str, caminho_arquivo: str, timeout: float = TIMEOUT_REQUISICAO_EXPORTACAO) -> dict:
 
-        response = client.post(url, json=payload).json()
+        """
+        Baixa o conteúdo de `url` direto para o disco, em blocos, sem mantê-lo inteiro em memória.
+        O arquivo é escrito em um temporário na mesma pasta e só então renomeado para `caminho_arquivo`,
+        então leitores nunca encontram um arquivo pela metade. O SHA-256 é calculado durante a gravação.
 
-        print(response)
+        :param url: Endpoint do download.
+        :param caminho_arquivo: Caminho final do arquivo.
+        :param timeout: Timeout de conexão e entre blocos recebidos, em segundos.
+        :return: Dicionário com "tamanho" (bytes gravados) e "sha256" do conteúdo.
+        """
 
-        # temp_token = response["temp_token"]
+        caminho_temporario = f"{caminho_arquivo}.parcial"
+        tamanho = 0
+        sha256 = hashlib.sha256()
 
-        file = response["file"]
+        try:
+            with self.client.stream("GET", url, timeout=timeout) as response:
+                response.raise_for_status()
 
-        response = client.get(f"https://cloud.tenable.com/scans/{id_scan}/export/{file}/status").json()["status"]
+                with open(caminho_temporario, "wb") as arquivo:
+                    for bloco in response.iter_bytes(TAMANHO_BLOCO_DOWNLOAD):
+                        arquivo.write(bloco)
+                        sha256.update(bloco)
+                        tamanho += len(bloco)
 
-        while (response != "ready"):
-            response = client.get(f"https://cloud.tenable.com/scans/{id_scan}/export/{file}/status").json()["status"]
-            time.sleep(1)
+            os.replace(caminho_temporario, caminho_arquivo)
 
-        response = client.get(
-            f"https://cloud.tenable.com/scans/{id_scan}/export/{file}/download")
+        finally:
+            if os.path.exists(caminho_temporario):
+                os.remove(caminho_temporario)
 
-        with open(f"{target_dir}/servidores_scan.csv", "w", encoding="utf-8") as file:
-            file.write(response.text)
+        return {"tamanho": tamanho, "sha256": sha256.hexdigest()}
 
-            
+    def download_vmscans_csv(self, target_dir: str, id_scan: str, story_id: str, prazo: float = PRAZO_EXPORTACAO, cancelamento: threading.Event = None) -> None:
 
+        """
+        Exporta em CSV uma execução (history_id) de um scan do Tenable VM e a salva em
+        `target_dir`/servidores_scan.csv.
+
+        :param target_dir: Pasta de destino.
+        :param id_scan: ID do scan.
+        :param story_id: history_id da execução do scan.
+        :param prazo: Tempo máximo de espera pela exportação, em segundos.
+        :param cancelamento: Evento que, quando sinalizado, interrompe a espera.
+        """
+
+        payload = {
+            "chapters": "",
+            "format": "csv"
+        }
 
+        response = self.client.post(f"/scans/{id_scan}/export", params={"history_id": story_id}, json=payload, timeout=TIMEOUT_REQUISICAO_EXPORTACAO)
+        response.raise_for_status()
 
+        file = response.json()["file"]
 
+        self.aguardar_exportacao(f"/scans/{id_scan}/export/{file}/status", prazo, cancelamento=cancelamento)
 
+        registro = self.baixar_para_arquivo(f"/scans/{id_scan}/export/{file}/download", f"{target_dir}/servidores_scan.csv")
 
+        registrar_no_manifesto(target_dir, {"servidores_scan.csv": registro})
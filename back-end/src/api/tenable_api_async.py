@@ -0,0 +1,208 @@
+"""
+Versão assíncrona (asyncio + httpx.AsyncClient) das consultas ao Tenable usadas nas buscas de scans
+(ver src/asgi.py, que atende essas rotas no event loop do worker do uvicorn).
+
+As buscas podem ser aguardadas de event loops diferentes: o do worker, em produção, ou o loop criado
+pelo asgiref para cada view assíncrona do Flask, no servidor de desenvolvimento. Um AsyncClient preso a
+um desses loops perderia as conexões quando o loop fosse fechado; por isso a AsyncTenableApi mantém um
+único event loop em uma thread de fundo, dono do AsyncClient e do pool de conexões, e quem chama apenas
+aguarda (await) o resultado das consultas executadas nele. Enquanto uma consulta espera o Tenable, o
+loop atende as consultas das demais requisições, e as páginas de uma busca do WAS são pedidas em
+paralelo sem criar threads.
+
+O cache das listagens é o mesmo da TenableApi (ver TTL_CACHE_TENABLE), então invalidar_cache vale para
+as duas versões.
+"""
+
+import asyncio
+import os
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits
+
+from .tenable_api import ITENS_POR_PAGINA_WAS, MAX_PAGINAS_SIMULTANEAS, TenableApi
+from ..utils.metricas import TransporteMedidoAsync
+
+# Conexões simultâneas com o Tenable, somando todas as requisições atendidas pelo processo
+MAX_CONEXOES_TENABLE = 20
+
+
+def _no_loop_compartilhado(metodo):
+    """
+    Executa o método (uma corrotina) no event loop da AsyncTenableApi e aguarda o resultado a partir do
+    loop de quem chamou. Chamadas feitas de dentro do próprio loop são executadas diretamente.
+    """
+    @wraps(metodo)
+    async def executar(self, *args, **kwargs):
+        loop = self._obter_loop()
+        corrotina = metodo(self, *args, **kwargs)
+
+        if asyncio.get_running_loop() is loop:
+            return await corrotina
+
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(corrotina, loop))
+
+    return executar
+
+
+class AsyncTenableApi():
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncTenableApi, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        # Credenciais, URL e cache vêm da versão síncrona
+        self._api = TenableApi()
+
+        self._loop = None
+        self._pid = None
+        self.client = None
+        self._trava = threading.Lock()
+
+        self._initialized = True
+
+    def _obter_loop(self) -> asyncio.AbstractEventLoop:
+
+        """
+        Retorna o event loop da thread de fundo, criando-o (junto com o AsyncClient) na primeira chamada
+        do processo. Depois de um fork, o filho cria o seu, pois a thread do pai não existe nele.
+        """
+
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+
+        with self._trava:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="tenable-async", daemon=True).start()
+
+                self.client = AsyncClient(
+                    base_url=self._api.base_url,
+                    headers=self._api.headers,
+                    transport=TransporteMedidoAsync(AsyncHTTPTransport(verify=False, limits=Limits(max_connections=MAX_CONEXOES_TENABLE)))
+                )
+                self._loop = loop
+                self._pid = os.getpid()
+
+        return self._loop
+
+    def fechar(self) -> None:
+
+        """
+        Fecha o AsyncClient e encerra o event loop da thread de fundo (ex.: ao encerrar o processo).
+        Uma nova chamada à API cria outros.
+        """
+
+        with self._trava:
+            if self._loop is None or self._pid != os.getpid():
+                return
+
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+            self.client = None
+
+    def invalidar_cache(self, endpoint: str = None, chave: Any = None) -> None:
+
+        self._api.invalidar_cache(endpoint, chave)
+
+    async def _obter_em_cache(self, endpoint: str, chave: Any, buscar: Callable[[], Awaitable[Any]]) -> Any:
+
+        encontrado, valor = self._api.consultar_cache(endpoint, chave)
+
+        if encontrado:
+            return valor
+
+        valor = await buscar()
+
+        self._api.guardar_em_cache(endpoint, chave, valor)
+
+        return valor
+
+    async def _buscar_pagina_was(self, url: str, offset: int, limit: int, headers: dict = None, payload: dict = None) -> dict:
+
+        response = await self.client.post(url, headers=headers, json=payload, params={"limit": limit, "offset": offset})
+        response.raise_for_status()
+
+        return response.json()
+
+    @_no_loop_compartilhado
+    async def paginar_busca_was(self, url: str, headers: dict = None, payload: dict = None, itens_por_pagina: int = ITENS_POR_PAGINA_WAS, max_simultaneos: int = MAX_PAGINAS_SIMULTANEAS) -> list:
+
+        """
+        Busca todas as páginas de uma busca do WAS, como TenableApi.paginar_busca_was, mas pedindo as
+        páginas após a primeira em até `max_simultaneos` requisições concorrentes no event loop.
+
+        :return: Itens de todas as páginas, na ordem das páginas.
+        """
+
+        primeira_pagina = await self._buscar_pagina_was(url, 0, itens_por_pagina, headers, payload)
+
+        itens = list(primeira_pagina["items"])
+
+        total = primeira_pagina["pagination"]["total"]
+        itens_por_pagina = min(itens_por_pagina, len(itens))
+
+        if not itens_por_pagina:
+            return itens
+
+        semaforo = asyncio.Semaphore(max_simultaneos)
+
+        async def buscar(offset: int) -> dict:
+            async with semaforo:
+                return await self._buscar_pagina_was(url, offset, itens_por_pagina, headers, payload)
+
+        paginas = await asyncio.gather(*(buscar(offset) for offset in range(itens_por_pagina, total, itens_por_pagina)))
+
+        for pagina in paginas:
+            itens.extend(pagina["items"])
+
+        return itens
+
+    @_no_loop_compartilhado
+    async def get_web_app_scans_from_folder_of_user(self, folder_name: str, user_name: str) -> dict:
+
+        headers = {'X-Impersonate': f"username={user_name}"}
+
+        payload = {
+            "field": "folder_name",
+            "operator": "match",
+            "value": folder_name,
+        }
+
+        items = await self._obter_em_cache(
+            "was_configs",
+            (folder_name, user_name),
+            lambda: self.paginar_busca_was("/was/v2/configs/search", headers=headers, payload=payload)
+        )
+
+        return {
+            "items": items,
+            "pagination": {"total": len(items), "offset": 0, "limit": len(items)}
+        }
+
+    async def _buscar_vmscans(self) -> dict:
+
+        scans = {}
+
+        for scan in (await self.client.get("/scans")).json()["scans"]:
+            scans.setdefault(scan["name"], scan)
+
+        return scans
+
+    @_no_loop_compartilhado
+    async def get_vmscans_from_name(self, name: str) -> dict:
+
+        scans = await self._obter_em_cache("scans", None, self._buscar_vmscans)
+
+        return scans.get(name)
@@ -0,0 +1,126 @@
+"""
+Aplicação ASGI do back-end, servida em produção pelo gunicorn com workers do uvicorn (ver gunicorn.conf.py):
+    gunicorn --config gunicorn.conf.py "src.asgi:create_asgi_app()"
+
+As buscas de scans no Tenable (ROTAS_ASSINCRONAS) são atendidas diretamente no event loop do worker:
+enquanto uma busca aguarda o Tenable, o mesmo worker atende as demais, sem ocupar uma thread por
+requisição. As outras rotas (e o preflight do CORS das buscas) continuam no app Flask (create_app),
+executado em até THREADS_WSGI threads por worker pelo adaptador WSGI do a2wsgi.
+
+No servidor de desenvolvimento (python -m src.main) as mesmas buscas são views assíncronas do Flask.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from a2wsgi import WSGIMiddleware
+
+from .main import create_app
+from .api.tenable_api_async import AsyncTenableApi
+from .routes.scans.scans_webapp import ORIGENS_BUSCA_SCANS, buscar_scans_da_pasta
+from .routes.scans.scans_vm import buscar_scan_vm_por_nome
+from .utils.metricas import REQUISICOES_HTTP
+
+# Requisições do app Flask atendidas ao mesmo tempo por worker
+THREADS_WSGI = int(os.getenv("GUNICORN_THREADS", 8))
+
+# (método, caminho) -> (blueprint, função que recebe o corpo JSON e retorna (corpo, status), origens do CORS)
+ROTAS_ASSINCRONAS = {
+    ("POST", "/scans/webapp/scansfromfolderofuser/"): ("scans", buscar_scans_da_pasta, ORIGENS_BUSCA_SCANS),
+    ("POST", "/scansvm/getScanByName/"): ("scansvm", buscar_scan_vm_por_nome, ORIGENS_BUSCA_SCANS),
+}
+
+
+async def _ler_corpo(receive) -> bytes:
+    corpo = b""
+    while True:
+        mensagem = await receive()
+        corpo += mensagem.get("body", b"")
+        if not mensagem.get("more_body"):
+            return corpo
+
+
+def _montar_resposta(corpo, status: int, origem: str, origens: list) -> tuple:
+    """
+    Converte o retorno de uma rota assíncrona na resposta HTTP, como o Flask faria: dicionários viram
+    JSON e textos, HTML. Se a origem for aceita, inclui os headers do CORS (como o @cross_origin).
+
+    :return: (status, headers, corpo em bytes).
+    """
+    if isinstance(corpo, dict):
+        conteudo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        headers = [(b"content-type", b"application/json")]
+    else:
+        conteudo = str(corpo).encode("utf-8")
+        headers = [(b"content-type", b"text/html; charset=utf-8")]
+
+    headers.append((b"content-length", str(len(conteudo)).encode()))
+
+    if origem in origens:
+        headers.append((b"access-control-allow-origin", origem.encode("latin-1")))
+        headers.append((b"vary", b"Origin"))
+
+    return status, headers, conteudo
+
+
+async def _atender_rota_assincrona(scope, receive, send, blueprint: str, rota, origens: list) -> None:
+    inicio = time.perf_counter()
+
+    corpo = await _ler_corpo(receive)
+    try:
+        data = json.loads(corpo) if corpo else None
+    except ValueError:
+        data = None
+
+    try:
+        resposta, status = await rota(data)
+    except Exception as e:
+        print(f"Erro em {scope['method']} {scope['path']}: {e}")
+        resposta, status = "Internal Server Error", 500
+
+    headers_requisicao = dict(scope.get("headers", []))
+    origem = headers_requisicao.get(b"origin", b"").decode("latin-1")
+
+    status, headers, conteudo = _montar_resposta(resposta, status, origem, origens)
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": conteudo})
+
+    REQUISICOES_HTTP.labels(blueprint, scope["path"], scope["method"], str(status)).observe(time.perf_counter() - inicio)
+
+
+async def _atender_lifespan(receive, send) -> None:
+    while True:
+        mensagem = await receive()
+
+        if mensagem["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+
+        elif mensagem["type"] == "lifespan.shutdown":
+            # Fecha o AsyncClient e o event loop de fundo da AsyncTenableApi, se tiverem sido criados
+            await asyncio.to_thread(AsyncTenableApi().fechar)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+def create_asgi_app():
+    """
+    Cria a aplicação ASGI: as ROTAS_ASSINCRONAS no event loop e as demais no app Flask.
+
+    :return: Aplicação ASGI.
+    """
+    app_wsgi = WSGIMiddleware(create_app(), workers=THREADS_WSGI)
+
+    async def aplicacao(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await _atender_lifespan(receive, send)
+
+        if scope["type"] == "http":
+            encontrada = ROTAS_ASSINCRONAS.get((scope["method"], scope["path"]))
+            if encontrada:
+                return await _atender_rota_assincrona(scope, receive, send, *encontrada)
+
+        return await app_wsgi(scope, receive, send)
+
+    return aplicacao
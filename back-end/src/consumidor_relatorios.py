@@ -0,0 +1,39 @@
+# back-end/src/consumidor_relatorios.py
+
+"""
+Consumidor da fila de relatórios: processo separado do servidor web que gera os relatórios enfileirados
+pela rota /listas/gerarRelatorioDeLista/ (ver report/fila_relatorios.py).
+
+Uso (a partir da pasta back-end, ao lado do gunicorn ou do servidor de desenvolvimento):
+    python -m src.consumidor_relatorios
+
+Ao receber SIGTERM ou SIGINT, o consumidor para de reservar novos relatórios e termina os que estão em
+andamento antes de sair. As métricas do processo ficam em http://<host>:<porta_metricas_consumidor>/metrics.
+"""
+
+import signal
+import threading
+
+from prometheus_client import start_http_server
+
+from .report.fila_relatorios import config, consumir_fila
+
+
+def main():
+    parar = threading.Event()
+
+    def encerrar(sinal, frame):
+        print("Encerrando o consumidor após os relatórios em andamento...")
+        parar.set()
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+
+    start_http_server(config.porta_metricas_consumidor)
+
+    print(f"Consumidor da fila de relatórios iniciado ({config.workers_relatorio} thread(s)).")
+    consumir_fila(parar)
+
+
+if __name__ == '__main__':
+    main()
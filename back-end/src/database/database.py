@@ -1,10 +1,155 @@
-from pymongo import MongoClient
-from typing import Any, Dict, List
+import os
+import threading
+from pymongo import ASCENDING, MongoClient, ReturnDocument
+from pymongo.errors import ConnectionFailure, PyMongoError
+from typing import Any, Dict, List, Tuple
 from bson.objectid import ObjectId # <-- ADICIONE ESTA IMPORTAÇÃO
+from flask import g
+
+from ..utils.config import Config
+from ..utils.metricas import OuvinteComandosMongo
+
+# Índices criados por garantir_indices: {coleção: [(campos, opções)]}
+# - listas.nomeLista é único: o nome identifica a lista nas rotas, e o índice impede nomes repetidos
+#   mesmo com requisições simultâneas.
+# - relatorios.id_lista não é único: cada nova geração do relatório de uma lista cria outro documento.
+# - relatorios.status + criado_em atende o consumidor da fila, que busca o pedido "na_fila" mais antigo.
+INDICES = {
+    "listas": [
+        ([("nomeLista", ASCENDING)], {"unique": True, "name": "nomeLista_unico"}),
+    ],
+    "relatorios": [
+        ([("id_lista", ASCENDING)], {"name": "id_lista"}),
+        ([("status", ASCENDING), ("criado_em", ASCENDING)], {"name": "status_criado_em"}),
+    ],
+}
+
+# Intervalo mínimo, em segundos, entre as tentativas do consumidor da fila de criar os índices que ainda
+# faltam (ver fila_relatorios.consumir_fila)
+INTERVALO_TENTATIVA_INDICES = 60
+
+# Índices de INDICES já criados (ou confirmados) neste processo, como (banco, nome)
+_indices_criados = set()
+_trava_indices = threading.Lock()
+
+# MongoClient compartilhado pelo processo, com o PID de quem o criou
+_cliente = None
+_pid_cliente = None
+_trava_cliente = threading.Lock()
+
+
+def obter_cliente() -> MongoClient:
+    """
+    Retorna o MongoClient do processo, criando-o na primeira chamada.
+
+    O cliente mantém um pool de conexões (tamanhos e timeouts vindos do Config, URI de MONGO_URI) e é
+    thread-safe, então é compartilhado por todas as requisições e threads. Como um MongoClient não pode
+    ser usado depois de um fork, um processo filho (ex.: workers de servidores que fazem fork) cria o
+    seu próprio cliente na primeira chamada, em vez de reaproveitar o do processo pai.
+
+    :return: Cliente do MongoDB.
+    """
+    global _cliente, _pid_cliente
+
+    pid = os.getpid()
+    if _cliente is not None and _pid_cliente == pid:
+        return _cliente
+
+    with _trava_cliente:
+        if _cliente is None or _pid_cliente != pid:
+            config = Config("config.json")
+            _cliente = MongoClient(
+                config.mongo_uri,
+                maxPoolSize=config.mongo_max_pool_size,
+                minPoolSize=config.mongo_min_pool_size,
+                serverSelectionTimeoutMS=config.mongo_timeout_selecao_ms,
+                connectTimeoutMS=config.mongo_timeout_conexao_ms,
+                waitQueueTimeoutMS=config.mongo_timeout_espera_pool_ms,
+                # Só conecta no primeiro comando, para que o cliente possa ser criado antes de um fork
+                connect=False,
+                # O ouvinte registra a duração e a quantidade de comandos em /metrics
+                event_listeners=[OuvinteComandosMongo()],
+            )
+            _pid_cliente = pid
+
+        return _cliente
+
+
+def fechar_cliente() -> None:
+    """
+    Fecha o MongoClient do processo (ex.: ao encerrar o servidor). Uma nova chamada a obter_cliente cria outro.
+    """
+    global _cliente, _pid_cliente
+
+    with _trava_cliente:
+        if _cliente is not None and _pid_cliente == os.getpid():
+            _cliente.close()
+        _cliente = None
+        _pid_cliente = None
+
+
+def garantir_indices(db_name: str = "database") -> bool:
+    """
+    Cria os índices de INDICES que ainda não foram criados neste processo (create_index não faz nada se o
+    índice já existe). Se o MongoDB estiver indisponível ou os dados existentes violarem um índice único
+    (ex.: listas com o mesmo nome), o problema é informado e o índice fica pendente.
+
+    Chamada ao iniciar, fora das requisições: pelo create_app e pelo consumidor da fila, que também tenta
+    de novo os pendentes a cada INTERVALO_TENTATIVA_INDICES segundos.
+
+    :return: True se todos os índices de INDICES existem.
+    """
+    with _trava_indices:
+        return _criar_indices_pendentes(db_name)
+
+
+def _criar_indices_pendentes(db_name: str) -> bool:
+    db = obter_cliente()[db_name]
+
+    for colecao, indices in INDICES.items():
+        for campos, opcoes in indices:
+            if (db_name, opcoes["name"]) in _indices_criados:
+                continue
+            try:
+                db[colecao].create_index(campos, **opcoes)
+                _indices_criados.add((db_name, opcoes["name"]))
+            except ConnectionFailure as e:
+                # Sem conexão, os demais índices também falhariam (cada um esperando o timeout)
+                print(f"Erro ao criar os índices do MongoDB: {e}")
+                return False
+            except PyMongoError as e:
+                print(f"Erro ao criar o índice {opcoes['name']} em {colecao}: {e}")
+
+    return _todos_indices_criados(db_name)
+
+
+def _todos_indices_criados(db_name: str) -> bool:
+    return all((db_name, opcoes["name"]) in _indices_criados for indices in INDICES.values() for _, opcoes in indices)
+
+
+def indice_criado(nome: str, db_name: str = "database") -> bool:
+    """
+    Informa se o índice `nome` de INDICES já foi criado. Enquanto um índice único não existir, as rotas
+    verificam a duplicidade com uma consulta antes de gravar (ex.: criarLista).
+    """
+    return (db_name, nome) in _indices_criados
+
+
+def obter_database(db_name: str = "database") -> "Database":
+    """
+    Retorna o Database da requisição Flask atual, criado na primeira chamada e reaproveitado até o fim
+    da requisição. Fora de uma requisição (ex.: threads da fila de relatórios), use Database().
+    """
+    chave = f"database_{db_name}"
+    if chave not in g:
+        setattr(g, chave, Database(db_name))
+    return getattr(g, chave)
+
 
 class Database:
     def __init__(self, db_name: str = "database"):
-        self.client = MongoClient("mongodb://localhost:27017/")
+        # Todas as instâncias usam o cliente (e o pool de conexões) compartilhado do processo
+        self.client = obter_cliente()
         self.db = self.client[db_name]
 
     def insert_one(self, collection_name: str, data: Dict[str, Any]):
@@ -13,15 +158,41 @@ class Database:
     def insert_many(self, collection_name: str, data_list: List[Dict[str, Any]]):
         return self.db[collection_name].insert_many(data_list)
 
-    def find_one(self, collection_name: str, query: Dict[str, Any]):
-        return self.db[collection_name].find_one(query)
+    def find_one(self, collection_name: str, query: Dict[str, Any], projection: Dict[str, Any] = None):
+        return self.db[collection_name].find_one(query, projection)
 
-    def find(self, collection_name: str, query: Dict[str, Any] = {}):
-        return list(self.db[collection_name].find(query))
+    def find(self, collection_name: str, query: Dict[str, Any] = {}, projection: Dict[str, Any] = None, sort: List[Tuple[str, int]] = None, skip: int = 0, limit: int = 0):
+        """
+        Busca os documentos de `query`, opcionalmente só com os campos de `projection`, ordenados por
+        `sort` ([(campo, 1 ou -1)]) e paginados por `skip`/`limit` (limit 0 retorna todos).
+        """
+        return list(self.db[collection_name].find(query, projection, sort=sort, skip=skip, limit=limit))
 
     def update_one(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]):
+        """
+        Atualiza, com um único $set, todos os campos de `update` no primeiro documento de `query`.
+        A atualização é atômica: os campos mudam juntos, em uma única ida ao banco.
+        """
         return self.db[collection_name].update_one(query, {"$set": update})
 
+    def update_many(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]):
+        """
+        Aplica os campos de `update` (um único $set) a todos os documentos que correspondem a `query`.
+        """
+        return self.db[collection_name].update_many(query, {"$set": update})
+
+    def find_one_and_update(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any], projection: Dict[str, Any] = None, retornar_novo: bool = True, sort: List[Tuple[str, int]] = None):
+        """
+        Como update_one, mas retorna o documento atualizado na mesma ida ao banco.
+
+        :param retornar_novo: Se True, retorna o documento após a atualização; se False, como estava antes.
+        :param sort: Ordem usada para escolher o documento quando vários correspondem a `query`.
+        :return: O documento (só com os campos de `projection`, se informada) ou None se nenhum corresponder a `query`.
+        """
+        return self.db[collection_name].find_one_and_update(
+            query, {"$set": update}, projection, sort=sort,
+            return_document=ReturnDocument.AFTER if retornar_novo else ReturnDocument.BEFORE)
+
     def delete_one(self, collection_name: str, query: Dict[str, Any]):
         return self.db[collection_name].delete_one(query)
 
@@ -32,7 +203,8 @@ class Database:
         return self.db[collection_name].count_documents(query)
 
     def close(self):
-        self.client.close()
+        # O cliente é compartilhado pelo processo e não é fechado aqui (ver fechar_cliente)
+        pass
 
     # --- ADICIONE ESTE NOVO MÉTODO ---
     def get_object_id(self, id_string: str) -> ObjectId:
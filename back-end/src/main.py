@@ -3,37 +3,51 @@
 from .utils.config import Config
 config = Config("config.json")
 
-from .api.tenable_api import TenableApi
-from pathlib import Path
-from .analysis.vulnerability_handler import *
-from .report.report_generator import terminar_relatorio_preprocessado, compilar_latex
-import time
-from .plot.plot import gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site, gerar_grafico_donut
-
+# Os módulos da geração de relatórios (pandas, matplotlib, plasTeX) não são importados aqui: só o
+# consumidor da fila os carrega (ver consumidor_relatorios.py), e a inicialização fica rápida
 
 from .routes.scans.scans_webapp import scans_bp
 from .routes.listas.listas import listas_bp
 from .routes.relatorios.relatorios import relatorios_bp
 from .routes.relatorios.gerenciarVulnerabilidades import gerenciar_vulnerabilidades_bp # Nova importação
 from .routes.scans.scans_vm import scans_vm_bp
+from .routes.metricas.metricas import metricas_bp
+from .utils.metricas import instrumentar_app
+from .database.database import garantir_indices
 from flask import Flask
 
-# --- Mova a criação da instância 'app' e o registro dos blueprints para o escopo global ---
-app = Flask(__name__)
+def create_app() -> Flask:
+    """
+    Cria o app Flask com todos os blueprints e as métricas.
+
+    Usada pelo servidor de desenvolvimento e, em produção, pela aplicação ASGI servida pelo gunicorn
+    (ver src/asgi.py e gunicorn.conf.py):
+        python -m src.main
+        gunicorn --config gunicorn.conf.py "src.asgi:create_asgi_app()"
+
+    Os relatórios enfileirados são gerados por outro processo, que deve rodar junto:
+        python -m src.consumidor_relatorios
+    """
+    app = Flask(__name__)
+
+    app.register_blueprint(scans_bp)
+    app.register_blueprint(listas_bp)
+    app.register_blueprint(scans_vm_bp)
+    app.register_blueprint(relatorios_bp)
+    app.register_blueprint(gerenciar_vulnerabilidades_bp)
+    app.register_blueprint(metricas_bp)
+
+    instrumentar_app(app)
+
+    # Cria os índices do MongoDB uma vez, ao iniciar, e não nas requisições. Se o MongoDB estiver
+    # indisponível, o consumidor da fila tenta de novo (ver database.garantir_indices)
+    garantir_indices()
 
-app.register_blueprint(scans_bp)
-app.register_blueprint(listas_bp)
-app.register_blueprint(scans_vm_bp)
-app.register_blueprint(relatorios_bp)
-app.register_blueprint(gerenciar_vulnerabilidades_bp)
-# -----------------------------------------------------------------------------------------
+    return app
 
-# A função 'main' pode ser removida se não for usada para mais nada, ou mantida para outros propósitos.
-# Mas a execução da app.run() deve ser no if __name__ == "__main__"
-# def main():
-#     print(app.url_map)
-#     app.run(debug=True)
 
 if __name__ == "__main__":
+    # Servidor de desenvolvimento (um processo, recarrega ao editar); em produção use o gunicorn
+    app = create_app()
     print(app.url_map) # Opcional: para ver as rotas no terminal
-    app.run(debug=True, host='0.0.0.0', port=5000) # <--- Use host e port aqui também para garantir execução local
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000) # <--- Use host e port aqui também para garantir execução local
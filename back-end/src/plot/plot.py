@@ -4,6 +4,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from ..utils.trace import rastreado
+
+@rastreado()
 def gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site(input_file: str, graph_output_path: str, ordem: str = "descendente"):
     """
     Gera um gráfico de barras do quantitativo de vulnerabilidades por site e salva em um arquivo PNG.
@@ -0,0 +1,463 @@
+"""
+Fila de geração de relatórios em segundo plano.
+
+A rota /listas/gerarRelatorioDeLista/ apenas registra o pedido na coleção `relatorios`, com status
+"na_fila" e os parâmetros do formulário; a fila é a própria coleção. Um processo separado, o consumidor
+(ver src/consumidor_relatorios.py e consumir_fila), reserva os pedidos em ordem de chegada e executa a
+leitura dos scans, o LaTeX, os gráficos e as compilações do pdflatex, fora dos workers do servidor web.
+O andamento de cada etapa fica gravado no próprio documento do relatório, que é consultado pelo
+front-end através de /listas/statusRelatorio/.
+
+Como a fila fica no MongoDB, os pedidos "na_fila" sobrevivem a reinícios e são gerados quando um
+consumidor voltar. Já um relatório "executando" cujo consumidor morreu (ex.: contêiner encerrado antes
+de terminar) para de renovar atualizado_em; o consumidor o marca como "erro" após PRAZO_SEM_SINAL
+segundos (ver recuperar_relatorios_orfaos), e o front-end deixa de acompanhá-lo.
+
+Formato do documento em `relatorios` (além dos campos já existentes):
+- status: "na_fila", "executando", "concluido" ou "erro".
+- atualizado_em: último sinal de vida do relatório; durante a geração, o consumidor o renova a cada
+  INTERVALO_SINAL_VIDA segundos.
+- parametros: dados do formulário usados na geração (ver CAMPOS_PARAMETROS).
+- etapa_atual: chave da etapa em execução (ver ETAPAS_RELATORIO).
+- progresso: percentual de etapas concluídas (0 a 100).
+- etapas: {etapa: {"status": "pendente" | "executando" | "concluida" | "erro", "inicio": datetime, "fim": datetime,
+  "duracao_s", "cpu_s", "memoria_pico_mb"}}; as medições são gravadas ao fim da etapa.
+- erro: mensagem do erro, se houver.
+- rastreamento: spans de todas as funções medidas durante a geração (ver utils/trace.py).
+- arquivo_trace: caminho do trace no formato do Chrome, se config.exportar_trace_chrome estiver ativo.
+"""
+
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bson import ObjectId
+from prometheus_client import Gauge
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from ..database.database import INTERVALO_TENTATIVA_INDICES, Database, garantir_indices
+from ..utils.config import Config
+from ..utils.metricas import criar_metricas_fila
+from ..utils.trace import Rastreamento, iniciar_rastreamento, rastrear
+
+# Etapas do pipeline, na ordem de execução, com a descrição exibida no front-end
+ETAPAS_RELATORIO = {
+    "leitura": "Leitura dos scans",
+    "agregacao": "Agrupamento das vulnerabilidades",
+    "latex": "Montagem do LaTeX",
+    "graficos": "Geração dos gráficos",
+    "compilacao": "Compilação do PDF",
+}
+
+# Campos do formulário gravados no documento do relatório e usados pelo consumidor
+CAMPOS_PARAMETROS = ("nomeSecretaria", "siglaSecretaria", "dataInicio", "dataFim", "ano", "mes", "linkGoogleDrive")
+
+# Segundos entre as consultas do consumidor quando a fila está vazia
+INTERVALO_CONSULTA_FILA = 2
+
+# Segundos entre as renovações de atualizado_em durante a geração, e tempo sem renovação após o qual um
+# relatório "executando" é considerado abandonado
+INTERVALO_SINAL_VIDA = 30
+PRAZO_SEM_SINAL = 300
+
+config = Config("config.json")
+
+
+def enfileirar_relatorio(id_lista: str, parametros: dict) -> str:
+    """
+    Registra um novo relatório na coleção `relatorios`, com status "na_fila", para ser gerado pelo consumidor.
+
+    :param id_lista: ID da lista cujos scans serão usados.
+    :param parametros: Dados do formulário (nomeSecretaria, siglaSecretaria, dataInicio, dataFim, ano, mes, linkGoogleDrive).
+    :return: ID do relatório criado, usado para consultar o andamento.
+    """
+    db = Database()
+    agora = datetime.now()
+
+    id_relatorio = db.insert_one("relatorios", {
+        "nome": parametros.get("nomeSecretaria"),
+        "id_lista": id_lista,
+        "parametros": {campo: parametros.get(campo) for campo in CAMPOS_PARAMETROS},
+        "destino_relatorio_preprocessado": None,
+        "status": "na_fila",
+        "etapa_atual": None,
+        "progresso": 0,
+        "etapas": {etapa: {"status": "pendente", "inicio": None, "fim": None} for etapa in ETAPAS_RELATORIO},
+        "erro": None,
+        "criado_em": agora,
+        "atualizado_em": agora,
+    }).inserted_id
+
+    db.close()
+
+    return str(id_relatorio)
+
+
+def obter_status_relatorio(id_relatorio: str) -> dict:
+    """
+    Retorna o andamento da geração de um relatório.
+
+    :param id_relatorio: ID do relatório.
+    :return: Dicionário com status, etapa atual, progresso, etapas, erro e, quando concluído, a URL do PDF
+        (urlPdf); None se o relatório não existir.
+    """
+    db = Database()
+    # O rastreamento pode ter centenas de spans e não é usado aqui
+    relatorio = db.find_one("relatorios", {"_id": ObjectId(id_relatorio)}, {"rastreamento": 0})
+    db.close()
+    if not relatorio:
+        return None
+
+    etapas = relatorio.get("etapas") or {}
+
+    return {
+        "idRelatorio": str(relatorio["_id"]),
+        # Relatórios gerados antes da fila não têm status e já estavam prontos ao serem gravados
+        "status": relatorio.get("status", "concluido"),
+        "etapaAtual": relatorio.get("etapa_atual"),
+        "progresso": relatorio.get("progresso", 100),
+        "etapas": [
+            {
+                "etapa": etapa,
+                "descricao": descricao,
+                "status": etapas.get(etapa, {}).get("status", "pendente"),
+                "inicio": _formatar_data(etapas.get(etapa, {}).get("inicio")),
+                "fim": _formatar_data(etapas.get(etapa, {}).get("fim")),
+                "duracaoS": etapas.get(etapa, {}).get("duracao_s"),
+            }
+            for etapa, descricao in ETAPAS_RELATORIO.items()
+        ],
+        "erro": relatorio.get("erro"),
+        "atualizadoEm": _formatar_data(relatorio.get("atualizado_em")),
+        "urlPdf": f"/listas/baixarRelatorioPdf/?idRelatorio={relatorio['_id']}" if relatorio.get("status", "concluido") == "concluido" else None,
+    }
+
+
+def caminho_pdf_relatorio(id_relatorio) -> str:
+    """
+    :param id_relatorio: ID do relatório.
+    :return: Caminho do PDF compilado pelo consumidor, na pasta compartilhada config.caminho_shared_relatorios.
+    """
+    return f"{config.caminho_shared_relatorios}/{id_relatorio}/relatorio_preprocessado/RelatorioPronto/main.pdf"
+
+
+def _formatar_data(data: datetime) -> str:
+    return data.isoformat() if data else None
+
+
+def _iniciar_etapa(db: Database, id_relatorio: ObjectId, etapa: str):
+    db.update_one("relatorios", {"_id": id_relatorio}, {
+        "status": "executando",
+        "etapa_atual": etapa,
+        "atualizado_em": datetime.now(),
+        f"etapas.{etapa}.status": "executando",
+        f"etapas.{etapa}.inicio": datetime.now(),
+    })
+
+
+def _concluir_etapa(db: Database, id_relatorio: ObjectId, etapa: str, span: dict):
+    concluidas = list(ETAPAS_RELATORIO).index(etapa) + 1
+    db.update_one("relatorios", {"_id": id_relatorio}, {
+        f"etapas.{etapa}.status": "concluida",
+        f"etapas.{etapa}.fim": datetime.now(),
+        f"etapas.{etapa}.duracao_s": span["duracao_s"],
+        f"etapas.{etapa}.cpu_s": span["cpu_s"],
+        f"etapas.{etapa}.memoria_pico_mb": span["memoria_pico_mb"],
+        "progresso": round(100 * concluidas / len(ETAPAS_RELATORIO)),
+        "atualizado_em": datetime.now(),
+    })
+
+
+def importar_pipeline() -> None:
+    """
+    Importa antecipadamente os módulos usados por executar_relatorio. Usada na inicialização do
+    consumidor, para que o primeiro relatório não pague a importação.
+    """
+    from ..analysis import vulnerability_handler  # noqa: F401 (importa json_parser, csv_parser e report_generator)
+    from ..plot import plot  # noqa: F401
+
+
+def _reservar_proximo(db: Database) -> dict:
+    """
+    Reserva o relatório mais antigo da fila, trocando o status para "executando" na mesma operação;
+    com vários consumidores, cada pedido é entregue a um só.
+
+    :return: O documento reservado (id_lista e parametros) ou None se a fila estiver vazia.
+    """
+    return db.find_one_and_update(
+        "relatorios", {"status": "na_fila"}, {"status": "executando", "atualizado_em": datetime.now()},
+        projection={"id_lista": 1, "parametros": 1}, sort=[("criado_em", ASCENDING)])
+
+
+def recuperar_relatorios_orfaos(db: Database) -> int:
+    """
+    Marca como "erro" os relatórios abandonados:
+    - "executando" sem renovar atualizado_em há mais de PRAZO_SEM_SINAL segundos (o consumidor que os
+      gerava foi encerrado no meio);
+    - "na_fila" sem parâmetros, enfileirados antes de a fila ser gravada no MongoDB, que não podem ser gerados.
+
+    :return: Quantidade de relatórios marcados.
+    """
+    agora = datetime.now()
+    limite = agora - timedelta(seconds=PRAZO_SEM_SINAL)
+
+    abandonados = db.update_many("relatorios", {
+        "status": "executando",
+        "$or": [{"atualizado_em": {"$lt": limite}}, {"atualizado_em": {"$exists": False}}],
+    }, {
+        "status": "erro",
+        "erro": "A geração foi interrompida (o processo que gerava o relatório foi encerrado). Gere o relatório novamente.",
+        "atualizado_em": agora,
+    })
+
+    sem_parametros = db.update_many("relatorios", {"status": "na_fila", "parametros": {"$exists": False}}, {
+        "status": "erro",
+        "erro": "O pedido foi perdido em um reinício do back-end. Gere o relatório novamente.",
+        "atualizado_em": agora,
+    })
+
+    return abandonados.modified_count + sem_parametros.modified_count
+
+
+def _renovar_sinal_de_vida(id_relatorio: ObjectId, terminou: threading.Event):
+    """
+    Renova atualizado_em do relatório a cada INTERVALO_SINAL_VIDA segundos, até `terminou` ser sinalizado.
+    """
+    db = Database()
+
+    while not terminou.wait(INTERVALO_SINAL_VIDA):
+        try:
+            db.update_one("relatorios", {"_id": id_relatorio}, {"atualizado_em": datetime.now()})
+        except PyMongoError as e:
+            print(f"Erro ao renovar o sinal de vida do relatório {id_relatorio}: {e}")
+
+
+def _consumir(parar: threading.Event, em_execucao: Gauge):
+    """
+    Laço de uma thread do consumidor: reserva e gera relatórios até `parar` ser sinalizado. O relatório
+    em andamento é terminado antes de sair, e é contado em `em_execucao` (relatorios_em_execucao).
+    """
+    db = Database()
+
+    while not parar.is_set():
+        try:
+            relatorio = _reservar_proximo(db)
+        except PyMongoError as e:
+            print(f"Erro ao consultar a fila de relatórios: {e}")
+            relatorio = None
+
+        if relatorio is None:
+            parar.wait(INTERVALO_CONSULTA_FILA)
+            continue
+
+        terminou = threading.Event()
+        sinal_de_vida = threading.Thread(target=_renovar_sinal_de_vida, args=(relatorio["_id"], terminou), daemon=True)
+        sinal_de_vida.start()
+
+        try:
+            with em_execucao.track_inprogress():
+                executar_relatorio(relatorio["_id"], relatorio["id_lista"], relatorio.get("parametros") or {})
+        finally:
+            terminou.set()
+            sinal_de_vida.join()
+
+
+def _recuperar(db: Database):
+    try:
+        marcados = recuperar_relatorios_orfaos(db)
+        if marcados:
+            print(f"{marcados} relatório(s) abandonado(s) marcado(s) com erro.")
+    except PyMongoError as e:
+        print(f"Erro ao recuperar os relatórios abandonados: {e}")
+
+
+def consumir_fila(parar: threading.Event) -> None:
+    """
+    Consome a fila de relatórios com `config.workers_relatorio` threads, até `parar` ser sinalizado;
+    então espera os relatórios em andamento terminarem. Enquanto isso, atualiza relatorios_na_fila e
+    marca os relatórios abandonados (ver recuperar_relatorios_orfaos), também ao iniciar. Cria os índices
+    do MongoDB ao iniciar e, se algum falhar, tenta de novo a cada INTERVALO_TENTATIVA_INDICES segundos.
+
+    :param parar: Evento que encerra o consumidor (ex.: sinalizado ao receber SIGTERM).
+    """
+    from .report_generator import pre_carregar_catalogos
+
+    importar_pipeline()
+    pre_carregar_catalogos(config.caminho_shared_relatorios_exemplo)
+
+    na_fila, em_execucao = criar_metricas_fila()
+
+    indices_criados = garantir_indices()
+    ultima_tentativa_indices = time.monotonic()
+
+    db = Database()
+    _recuperar(db)
+
+    threads = [threading.Thread(target=_consumir, args=(parar, em_execucao), name=f"relatorio-{i}") for i in range(config.workers_relatorio)]
+    for thread in threads:
+        thread.start()
+
+    ultima_recuperacao = time.monotonic()
+    while not parar.wait(INTERVALO_CONSULTA_FILA):
+        try:
+            na_fila.set(db.count_documents("relatorios", {"status": "na_fila"}))
+        except PyMongoError as e:
+            print(f"Erro ao consultar a fila de relatórios: {e}")
+
+        if time.monotonic() - ultima_recuperacao >= INTERVALO_SINAL_VIDA:
+            _recuperar(db)
+            ultima_recuperacao = time.monotonic()
+
+        if not indices_criados and time.monotonic() - ultima_tentativa_indices >= INTERVALO_TENTATIVA_INDICES:
+            indices_criados = garantir_indices()
+            ultima_tentativa_indices = time.monotonic()
+
+    for thread in threads:
+        thread.join()
+
+
+def executar_relatorio(id_relatorio: ObjectId, id_lista: str, parametros: dict):
+    """
+    Executa todas as etapas da geração de um relatório, registrando o andamento no documento do relatório.
+    Roda nas threads do consumidor (ver consumir_fila); erros são registrados no documento em vez de propagados.
+    O tempo, a CPU e a memória de cada etapa (e das funções medidas dentro delas) são gravados no
+    documento ao final, com ou sem erro (ver utils/trace.py).
+
+    :param id_relatorio: ID do relatório (criado por enfileirar_relatorio).
+    :param id_lista: ID da lista cujos scans serão usados.
+    :param parametros: Dados do formulário (ver enfileirar_relatorio).
+    """
+    # Os módulos do pipeline carregam pandas, matplotlib e plasTeX (segundos de importação), então não
+    # são importados pelo servidor web, que só importa este módulo para enfileirar e consultar relatórios
+    from ..analysis.json_parser import localizar_arquivos, carregar_scans_json
+    from ..analysis.csv_parser import carregar_scans_csv
+    from ..analysis.vulnerability_handler import (processar_relatorio_json, processar_relatorio_csv, extrair_quantidades_vulnerabilidades_por_site,
+                                                  gerar_latex_relatorio_json, gerar_latex_relatorio_csv)
+    from ..plot.plot import gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site
+    from .report_generator import terminar_relatorio_preprocessado, gerar_graficos_totais, compilar_latex
+
+    db = Database()
+    etapa = None
+    pasta_destino_relatorio_preprocessado = f"{config.caminho_shared_relatorios}/{id_relatorio}/relatorio_preprocessado/"
+
+    with iniciar_rastreamento(f"relatorio {id_relatorio}") as rastreamento:
+        try:
+            objeto_id_lista = ObjectId(id_lista)
+            lista = db.find_one("listas", {"_id": objeto_id_lista})
+            pasta_scans = lista["pastas_scans_webapp"]
+
+            db.update_one("relatorios", {"_id": id_relatorio}, {"destino_relatorio_preprocessado": pasta_destino_relatorio_preprocessado})
+            Path(pasta_destino_relatorio_preprocessado).mkdir(parents=True, exist_ok=True)
+
+            # =================================
+            etapa = "leitura"
+            _iniciar_etapa(db, id_relatorio, etapa)
+
+            with rastrear(etapa) as span:
+                arquivos_json = localizar_arquivos(pasta_scans, "json")
+                arquivos_csv = localizar_arquivos(pasta_scans, "csv")
+                span["atributos"].update({"arquivos_json": len(arquivos_json), "arquivos_csv": len(arquivos_csv)})
+
+                modelo_scans_json = carregar_scans_json(arquivos_json, config.processos_ingestao, config.caminho_cache_scans) if arquivos_json else None
+                modelo_scans_csv = carregar_scans_csv(arquivos_csv, config.processos_ingestao, config.tamanho_chunk_csv, config.caminho_cache_scans) if arquivos_csv else None
+
+            _concluir_etapa(db, id_relatorio, etapa, span)
+
+            # =================================
+            etapa = "agregacao"
+            _iniciar_etapa(db, id_relatorio, etapa)
+
+            with rastrear(etapa) as span:
+                # O LaTeX das vulnerabilidades é gerado na etapa seguinte
+                processar_relatorio_json(pasta_scans, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo, salvar_txt=config.salvar_txt_intermediarios, modelo_scans=modelo_scans_json, gerar_latex=False)
+                processar_relatorio_csv(pasta_scans, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo, salvar_txt=config.salvar_txt_intermediarios, modelo_scans=modelo_scans_csv, gerar_latex=False)
+                extrair_quantidades_vulnerabilidades_por_site(f"{pasta_destino_relatorio_preprocessado}/vulnerabilidades_agrupadas_por_site.csv", pasta_scans, modelo_scans_json)
+
+            _concluir_etapa(db, id_relatorio, etapa, span)
+
+            # =================================
+            etapa = "latex"
+            _iniciar_etapa(db, id_relatorio, etapa)
+
+            with rastrear(etapa) as span:
+                gerar_latex_relatorio_json(modelo_scans_json, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo)
+                gerar_latex_relatorio_csv(modelo_scans_csv, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo)
+                terminar_relatorio_preprocessado(
+                    parametros.get("nomeSecretaria"),
+                    parametros.get("siglaSecretaria"),
+                    parametros.get("dataInicio"),
+                    parametros.get("dataFim"),
+                    parametros.get("ano"),
+                    parametros.get("mes"),
+                    pasta_destino_relatorio_preprocessado,
+                    f"{pasta_destino_relatorio_preprocessado}/relatorio_pronto.tex",
+                    config.caminho_shared_relatorios_exemplo,
+                    parametros.get("linkGoogleDrive"),
+                    modelo_sites=modelo_scans_json,
+                    modelo_servidores=modelo_scans_csv)
+
+            _concluir_etapa(db, id_relatorio, etapa, span)
+
+            # =================================
+            etapa = "graficos"
+            _iniciar_etapa(db, id_relatorio, etapa)
+
+            with rastrear(etapa) as span:
+                gerar_graficos_totais(pasta_destino_relatorio_preprocessado, modelo_scans_json, modelo_scans_csv)
+                gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site(
+                    f"{pasta_destino_relatorio_preprocessado}/vulnerabilidades_agrupadas_por_site.csv", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/assets/images-was/Vulnerabilidades_x_site.png", "decrescente"
+                )
+
+            _concluir_etapa(db, id_relatorio, etapa, span)
+
+            # =================================
+            etapa = "compilacao"
+            _iniciar_etapa(db, id_relatorio, etapa)
+
+            with rastrear(etapa) as span:
+                compilar_latex(f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/main.tex", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/")
+                compilar_latex(f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/main.tex", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/")
+
+            # O PDF fica na pasta compartilhada com o servidor web, que o entrega em /listas/baixarRelatorioPdf/
+            if not os.path.isfile(caminho_pdf_relatorio(id_relatorio)):
+                raise FileNotFoundError(f"O PDF do relatório não foi gerado: {caminho_pdf_relatorio(id_relatorio)}")
+
+            _concluir_etapa(db, id_relatorio, etapa, span)
+
+            db.update_one("relatorios", {"_id": id_relatorio}, {"status": "concluido", "etapa_atual": None, "atualizado_em": datetime.now()})
+            db.update_one("listas", {"_id": objeto_id_lista}, {"relatorioGerado": True})
+
+        except Exception as e:
+            traceback.print_exc()
+            atualizacao = {"status": "erro", "erro": str(e), "atualizado_em": datetime.now()}
+            if etapa:
+                atualizacao[f"etapas.{etapa}.status"] = "erro"
+                atualizacao[f"etapas.{etapa}.fim"] = datetime.now()
+            db.update_one("relatorios", {"_id": id_relatorio}, atualizacao)
+
+        finally:
+            _salvar_rastreamento(db, id_relatorio, rastreamento, pasta_destino_relatorio_preprocessado)
+            db.close()
+
+
+def _salvar_rastreamento(db: Database, id_relatorio: ObjectId, rastreamento: Rastreamento, pasta_destino: str):
+    """
+    Grava os spans no documento do relatório e, se configurado, o trace do Chrome em `pasta_destino`/trace.json.
+    Falhas aqui não alteram o status do relatório.
+    """
+    try:
+        atualizacao = {"rastreamento": rastreamento.spans}
+
+        if config.exportar_trace_chrome and os.path.isdir(pasta_destino):
+            caminho_trace = os.path.join(pasta_destino, "trace.json")
+            rastreamento.exportar_chrome_trace(caminho_trace)
+            atualizacao["arquivo_trace"] = caminho_trace
+
+        db.update_one("relatorios", {"_id": id_relatorio}, atualizacao)
+
+    except Exception as e:
+        print(f"Erro ao salvar as medições do relatório {id_relatorio}: {e}")
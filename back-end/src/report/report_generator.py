@@ -1,18 +1,22 @@
+import io
 import json
 from typing import List
 from plasTeX.TeX import TeX
 from plasTeX.Base import Text
 from babel.dates import format_date
 from datetime import datetime, date
-import re
 import subprocess
 import os
 import matplotlib.pyplot as plt
 import os
 import shutil
+import time
 
-from ..analysis.json_parser import montar_conteudo_latex
-from ..analysis.csv_parser import montar_conteudo_latex_csv
+from ..analysis.json_parser import escrever_conteudo_latex_para_vulnerabilidades
+from ..analysis.csv_parser import escrever_conteudo_latex_para_vulnerabilidades_csv
+from ..analysis.catalogo import obter_catalogo
+from ..utils.trace import rastreado
+from ..utils.metricas import COMPILACOES_LATEX
 
 
 def gerar_relatorio_txt(output_file: str, risk_factor_counts: dict, common_vulnerabilities: dict, targets: List[str]):
@@ -95,98 +99,150 @@ def gerar_relatorio_txt_csv(output_file: str, risk_factor_counts: dict, common_v
                 output.write(f"{host}\n")
                 
 
-def gerar_relatorio_latex(caminho_saida_latex, caminho_relatorios_preprocessados, caminho_relatorio_exemplo):
+@rastreado()
+def pre_carregar_catalogos(caminho_relatorio_exemplo: str) -> None:
     """
-    Gera o relatório LaTeX a partir das vulnerabilidades comuns e do arquivo de vulnerabilidades JSON.
+    Monta os índices dos catálogos de sites e de servidores usados por gerar_relatorio_latex e
+    gerar_relatorio_latex_csv. Chamada pelo consumidor da fila ao iniciar (ver
+    fila_relatorios.consumir_fila), para que o primeiro relatório não pague a montagem dos índices.
 
     Parâmetros:
-    - vulnerabilidades_comuns (dict): Dicionário com vulnerabilidades e sites associados.
+    - caminho_relatorio_exemplo (str): Pasta com o catálogo e os descritivos de vulnerabilidades.
+    """
+    catalogos = [
+        (f"{caminho_relatorio_exemplo}/vulnerabilidades.json", f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades.json"),
+        ("data/vulnerabilidades_servidores.json", f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades_servidores.json"),
+    ]
+
+    for caminho_vulnerabilidades, caminho_descritivo in catalogos:
+        try:
+            obter_catalogo(caminho_vulnerabilidades, caminho_descritivo)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao pré-carregar o catálogo {caminho_vulnerabilidades}: {e}")
+
+
+@rastreado()
+def gerar_relatorio_latex(caminho_saida_latex, vulnerabilidades, caminho_relatorio_exemplo):
     """
+    Gera o relatório LaTeX a partir das vulnerabilidades comuns e do arquivo de vulnerabilidades JSON.
 
-    with open(f"{caminho_relatorio_exemplo}/vulnerabilidades.json", 'r', encoding='utf-8') as file:
-        vulnerabilidades_dados= json.load(file)
+    Parâmetros:
+    - caminho_saida_latex (str): Caminho do arquivo LaTeX gerado.
+    - vulnerabilidades (list): Vulnerabilidades agrupadas (ver json_parser.montar_vulnerabilidades_relatorio).
+    - caminho_relatorio_exemplo (str): Pasta com o catálogo e os descritivos de vulnerabilidades.
+    """
 
-    conteudo_latex = montar_conteudo_latex(f"{caminho_relatorios_preprocessados}/Sites_agrupados_por_vulnerabilidades.txt", vulnerabilidades_dados, caminho_relatorio_exemplo)
+    catalogo = obter_catalogo(f"{caminho_relatorio_exemplo}/vulnerabilidades.json", f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades.json")
 
     with open(caminho_saida_latex, 'w', encoding='utf-8') as file:
-        file.write(conteudo_latex)
+        escrever_conteudo_latex_para_vulnerabilidades(file, vulnerabilidades, catalogo)
         
     print(f"Relatório LaTeX gerado em {caminho_saida_latex}.")
 
-def terminar_relatorio_preprocessado(nome_secretaria: str, sigla_secretaria: str, inicio_data: str, fim_data: str, ano_conclusao: str, mes_conclusao: str, caminho_relatorio_preprocessado: str, caminho_saida_relatorio_pronto: str, caminho_relatorio_exemplo: str, google_drive_link: str):
+# Início da parte das vulnerabilidades sem categoria no LaTeX de uma seção, que não entra no main.tex
+MARCADOR_SEM_CATEGORIA = "%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------"
+
+
+class LeitorAteMarcador:
+
+    """
+    Leitor de um arquivo de texto que termina antes da primeira ocorrência de `marcador`, para copiar só
+    o início do arquivo com shutil.copyfileobj, em blocos.
+    """
+
+    def __init__(self, arquivo, marcador: str):
+        self._arquivo = arquivo
+        self._marcador = marcador
+        self._pendente = ""  # Final do bloco anterior, que pode conter o começo do marcador
+        self._terminou = False
+
+    def read(self, tamanho: int = -1) -> str:
+        while not self._terminou:
+            bloco = self._arquivo.read(tamanho if tamanho > 0 else io.DEFAULT_BUFFER_SIZE)
+            dados = self._pendente + bloco
+
+            posicao = dados.find(self._marcador)
+            if posicao != -1 or not bloco:
+                self._terminou = True
+                return dados if posicao == -1 else dados[:posicao]
+
+            corte = max(len(dados) - len(self._marcador) + 1, 0)
+            self._pendente = dados[corte:]
+            if corte:
+                return dados[:corte]
+
+        return ""
+
+
+def copiar_secao_latex(caminho_secao: str, saida) -> None:
+    """
+    Copia para `saida` o LaTeX de uma seção gerado por gerar_relatorio_latex ou gerar_relatorio_latex_csv,
+    até o marcador das vulnerabilidades sem categoria (listadas à parte, em vulnerabilidades_*_ausentes.txt).
+
+    Parâmetros:
+    - caminho_secao (str): Arquivo (LATEX)*.txt da seção; se não existir, nada é copiado.
+    - saida: Arquivo de texto aberto para escrita.
+    """
+    if not os.path.exists(caminho_secao):
+        print(f"Aviso: Arquivo '{caminho_secao}' não encontrado.")
+        return
+
+    with open(caminho_secao, 'r', encoding='utf-8') as secao:
+        shutil.copyfileobj(LeitorAteMarcador(secao, MARCADOR_SEM_CATEGORIA), saida)
+
+
+def escrever_linha_com_placeholders(linha: str, saida, substituicoes_globais: dict, secoes: dict) -> None:
+    """
+    Escreve uma linha do main.tex em `saida` trocando os placeholders [ALVO] de `substituicoes_globais`
+    pelo seu valor e os de `secoes` pelo conteúdo do arquivo da seção (ver copiar_secao_latex).
+    """
+    for alvo, caminho_secao in secoes.items():
+        placeholder = f'[{alvo}]'
+        if placeholder in linha:
+            antes, depois = linha.split(placeholder, 1)
+            escrever_linha_com_placeholders(antes, saida, substituicoes_globais, {})
+            copiar_secao_latex(caminho_secao, saida)
+            escrever_linha_com_placeholders(depois, saida, substituicoes_globais, secoes)
+            return
+
+    if '[' in linha:
+        for alvo, novo in substituicoes_globais.items():
+            linha = linha.replace(f'[{alvo}]', novo)
+
+    saida.write(linha)
+
+
+@rastreado()
+def terminar_relatorio_preprocessado(nome_secretaria: str, sigla_secretaria: str, inicio_data: str, fim_data: str, ano_conclusao: str, mes_conclusao: str, caminho_relatorio_preprocessado: str, caminho_saida_relatorio_pronto: str, caminho_relatorio_exemplo: str, google_drive_link: str, modelo_sites: dict = None, modelo_servidores: dict = None):
+    """
+    Monta o main.tex final a partir do relatório de exemplo, preenchendo os placeholders.
+
+    Os totais vêm dos modelos retornados por processar_relatorio_json (sites) e processar_relatorio_csv
+    (servidores); se algum deles não for informado (pasta sem scans desse tipo), seus totais ficam zerados.
+    Os gráficos de totais são gerados à parte, por gerar_graficos_totais.
+    """
 
     caminho_relatorio_pronto = f"{caminho_relatorio_preprocessado}/RelatorioPronto/"
     copiar_relatorio_exemplo(f"{caminho_relatorio_exemplo}/RelatorioExemplo/", caminho_relatorio_pronto)
 
-    # Leitura do LaTeX de exemplo (main.tex base)
-    with open(f'{caminho_relatorio_pronto}/main.tex', 'r', encoding='utf-8') as f:
-        latex_code = f.read()
-
-    # --- Leitura do conteúdo de vulnerabilidades de sites ---
-    relatorio_sites_conteudo = []
-    caminho_sites_vulnerabilidades_latex = f"{caminho_relatorio_preprocessado}/(LATEX)Sites_agrupados_por_vulnerabilidades.txt"
-    if os.path.exists(caminho_sites_vulnerabilidades_latex):
-        with open(caminho_sites_vulnerabilidades_latex, "r", encoding='utf-8') as file:
-            for linha in file:
-                # O limite parece ser para cortar a parte "Vulnerabilidades sem Categoria" de sites
-                # Se você quiser que essa parte vá para o RELATORIO GERADO, mantenha a condição
-                limite_sites = "%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------"
-                if limite_sites in linha:
-                    break
-                relatorio_sites_conteudo.append(linha)
-    else:
-        print(f"Aviso: Arquivo '{caminho_sites_vulnerabilidades_latex}' não encontrado.")
-    relatorio_sites_final = ''.join(relatorio_sites_conteudo)
-
-    # --- Leitura do conteúdo de vulnerabilidades de servidores ---
-    relatorio_servidores_conteudo = []
-    caminho_servidores_vulnerabilidades_latex = f"{caminho_relatorio_preprocessado}/(LATEX)Servidores_agrupados_por_vulnerabilidades.txt"
-    if os.path.exists(caminho_servidores_vulnerabilidades_latex):
-        with open(caminho_servidores_vulnerabilidades_latex, "r", encoding='utf-8') as file:
-            # Agora, o limite para servidores é aplicado aqui também
-            limite_servidores = "%-------------- INÍCIO DAS VULNERABILIDADES SEM CATEGORIA --------------"
-            for linha in file:
-                if limite_servidores in linha:
-                    break # Interrompe a leitura ao encontrar a linha de "Vulnerabilidades sem Categoria"
-                relatorio_servidores_conteudo.append(linha)
-    else:
-        print(f"Aviso: Arquivo '{caminho_servidores_vulnerabilidades_latex}' não encontrado.")
-    relatorio_servidores_final = ''.join(relatorio_servidores_conteudo)
-
-    # Leitura do relatório em texto para extrair totais
-    # ATENÇÃO: Verifique a fonte desses totais. Se a soma dos hosts/vulnerabilidades
-    # for diferente entre sites e servidores, ou se você precisar de totais combinados,
-    # esta lógica precisará de ajuste. Por enquanto, mantém como está.
-    caminho_agrupados_sites_txt = f"{caminho_relatorio_preprocessado}/Sites_agrupados_por_vulnerabilidades.txt"
-    agrupados_vulnerabilidades = ""
-    if os.path.exists(caminho_agrupados_sites_txt):
-        with open(caminho_agrupados_sites_txt, "r", encoding='utf-8') as file:
-            agrupados_vulnerabilidades = file.read()
-    else:
-        print(f"Erro: Arquivo '{caminho_agrupados_sites_txt}' não encontrado para extração de totais.")
-    
-    caminho_agrupados_sites_txt = f"{caminho_relatorio_preprocessado}/Servidores_agrupados_por_vulnerabilidades.txt"
-    agrupados_vulnerabilidades_servidores = ""
-    if os.path.exists(caminho_agrupados_sites_txt):
-        with open(caminho_agrupados_sites_txt, "r", encoding='utf-8') as file:
-            agrupados_vulnerabilidades_servidores = file.read()
-    else:
-        print(f"Erro: Arquivo '{caminho_agrupados_sites_txt}' não encontrado para extração de totais.")
-        
-    #WEB
-    total_sites = re.search(r'Total de sites:*\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'Total de sites:*\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_web = re.search(r'Total de Vulnerabilidades:\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'Total de Vulnerabilidades:\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_criticas_web = re.search(r'Critical:\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'Critical:\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_alta_web = re.search(r'High:\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'High:\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_media_web = re.search(r'Medium:\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'Medium:\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_baixa_web = re.search(r'Low:\s*(\d+)', agrupados_vulnerabilidades).group(1) if re.search(r'Low:\s*(\d+)', agrupados_vulnerabilidades) else '0'
+    # O LaTeX das vulnerabilidades de sites e de servidores é copiado direto dos arquivos, sem passar pela memória
+    secoes = {
+        'RELATORIO GERADO': f"{caminho_relatorio_preprocessado}/(LATEX)Sites_agrupados_por_vulnerabilidades.txt",
+        'RELATORIO SERVIDORES': f"{caminho_relatorio_preprocessado}/(LATEX)Servidores_agrupados_por_vulnerabilidades.txt",
+    }
+
+    # Totais de sites (WAS)
+    riscos_web = modelo_sites["riscos"] if modelo_sites else {}
+    total_sites = str(len(modelo_sites["targets"])) if modelo_sites else '0'
+    total_vulnerabilidades_web = str(sum(riscos_web.values()))
+    total_vulnerabilidades_criticas_web = str(riscos_web.get('Critical', 0))
+    total_vulnerabilidades_alta_web = str(riscos_web.get('High', 0))
+    total_vulnerabilidades_media_web = str(riscos_web.get('Medium', 0))
+    total_vulnerabilidades_baixa_web = str(riscos_web.get('Low', 0))
     
     # SERVIDORES
-    total_vulnerabilidade_vm = re.search(r'Total de Vulnerabilidades:\s*(\d+)', agrupados_vulnerabilidades_servidores).group(1) if re.search(r'Total de Vulnerabilidades:\s*(\d+)', agrupados_vulnerabilidades) else '0'
-    total_vulnerabilidades_criticas_servidores = re.search(r'Critical:\s*(\d+)', agrupados_vulnerabilidades_servidores).group(1) if re.search(r'Critical:\s*(\d+)', agrupados_vulnerabilidades_servidores) else '0'
-    total_vulnerabilidades_alta_servidores = re.search(r'High:\s*(\d+)', agrupados_vulnerabilidades_servidores).group(1) if re.search(r'High:\s*(\d+)', agrupados_vulnerabilidades_servidores) else '0'
-    total_vulnerabilidades_baixa_servidores = re.search(r'Low:\s*(\d+)', agrupados_vulnerabilidades_servidores).group(1) if re.search(r'Low:\s*(\d+)', agrupados_vulnerabilidades_servidores) else '0'
-    total_vulnerabilidades_media_servidores = re.search(r'Medium:\s*(\d+)', agrupados_vulnerabilidades_servidores).group(1) if re.search(r'Medium:\s*(\d+)', agrupados_vulnerabilidades_servidores) else '0'
+    riscos_servidores = modelo_servidores["riscos"] if modelo_servidores else {}
+    total_vulnerabilidade_vm = str(sum(riscos_servidores.values()))
     
     #TOTAL
     total_vulnerabilidades = int(total_vulnerabilidade_vm) + int(total_vulnerabilidades_web)
@@ -198,8 +254,6 @@ def terminar_relatorio_preprocessado(nome_secretaria: str, sigla_secretaria: str
         'SIGLA': sigla_secretaria,
         'INICIO DATA': inicio_data,
         'FIM DATA': fim_data,
-        'RELATORIO GERADO': relatorio_sites_final, # Placeholder para sites
-        'RELATORIO SERVIDORES': relatorio_servidores_final, # NOVO Placeholder para servidores
         'TOTAL VULNERABILIDADES': total_vulnerabilidades,
         'TOTAL VULNERABILIDADES WEB': total_vulnerabilidades_web,
         'TOTAL VULNERABILIDADES VM': total_vulnerabilidade_vm, # Ajustar se for total de hosts VM
@@ -212,37 +266,53 @@ def terminar_relatorio_preprocessado(nome_secretaria: str, sigla_secretaria: str
         'GOOGLE DRIVE LINK': google_drive_link
     }
 
-    # Aplicar substituições no LaTeX
-    latex_editado = substituir_placeholders(
-        conteudo=latex_code,
-        substituicoes_globais=substituicoes_globais
-    )
+    # Aplicar as substituições linha a linha, gravando o main.tex final em um arquivo temporário que
+    # depois substitui o de exemplo
+    caminho_main = f"{caminho_relatorio_pronto}/main.tex"
+    with open(caminho_main, 'r', encoding='utf-8') as entrada, open(f"{caminho_main}.tmp", 'w', encoding='utf-8') as saida:
+        for linha in entrada:
+            escrever_linha_com_placeholders(linha, saida, substituicoes_globais, secoes)
+    os.replace(f"{caminho_main}.tmp", caminho_main)
 
-    # Salvar o arquivo final .tex
-    with open(f"{caminho_relatorio_pronto}/main.tex", "w", encoding="utf-8") as f:
-        f.write(latex_editado)
 
-    gerar_grafico(total_vulnerabilidades_criticas_web, total_vulnerabilidades_alta_web, total_vulnerabilidades_media_web, total_vulnerabilidades_baixa_web, f"{caminho_relatorio_pronto}/assets/images-was")
-    gerar_grafico(total_vulnerabilidades_criticas_servidores, total_vulnerabilidades_alta_servidores, total_vulnerabilidades_media_servidores, total_vulnerabilidades_baixa_servidores, f"{caminho_relatorio_pronto}/assets/images-vmscan")
+@rastreado()
+def gerar_graficos_totais(caminho_relatorio_preprocessado: str, modelo_sites: dict = None, modelo_servidores: dict = None):
+    """
+    Gera os gráficos de rosca com o total de vulnerabilidades por severidade, de sites e de servidores,
+    nas pastas de imagens do relatório montado por terminar_relatorio_preprocessado.
 
-def gerar_relatorio_latex_csv(caminho_saida_latex, caminho_relatorios_preprocessados, caminho_relatorio_exemplo):
+    Parâmetros:
+    - caminho_relatorio_preprocessado (str): Pasta do relatório (a mesma passada a terminar_relatorio_preprocessado).
+    - modelo_sites (dict): Modelo retornado por processar_relatorio_json, ou None se não houver scans JSON.
+    - modelo_servidores (dict): Modelo retornado por processar_relatorio_csv, ou None se não houver scans CSV.
+    """
+    caminho_relatorio_pronto = f"{caminho_relatorio_preprocessado}/RelatorioPronto/"
+
+    riscos_web = modelo_sites["riscos"] if modelo_sites else {}
+    riscos_servidores = modelo_servidores["riscos"] if modelo_servidores else {}
+
+    gerar_grafico(riscos_web.get('Critical', 0), riscos_web.get('High', 0), riscos_web.get('Medium', 0), riscos_web.get('Low', 0), f"{caminho_relatorio_pronto}/assets/images-was")
+    gerar_grafico(riscos_servidores.get('critical', 0), riscos_servidores.get('high', 0), riscos_servidores.get('medium', 0), riscos_servidores.get('low', 0), f"{caminho_relatorio_pronto}/assets/images-vmscan")
+
+@rastreado()
+def gerar_relatorio_latex_csv(caminho_saida_latex, vulnerabilidades, caminho_relatorio_exemplo):
     """
     Gera o relatório LaTeX a partir das vulnerabilidades comuns e do arquivo de vulnerabilidades JSON.
 
     Parâmetros:
-    - vulnerabilidades_comuns (dict): Dicionário com vulnerabilidades e sites associados.
+    - caminho_saida_latex (str): Caminho do arquivo LaTeX gerado.
+    - vulnerabilidades (list): Vulnerabilidades agrupadas (ver csv_parser.montar_vulnerabilidades_relatorio_csv).
+    - caminho_relatorio_exemplo (str): Pasta com os descritivos de vulnerabilidades.
     """
 
-    with open("data/vulnerabilidades_servidores.json", 'r', encoding='utf-8') as file:
-        vulnerabilidades_dados= json.load(file)
-
-    conteudo_latex = montar_conteudo_latex_csv(f"{caminho_relatorios_preprocessados}/Servidores_agrupados_por_vulnerabilidades.txt", vulnerabilidades_dados, caminho_relatorio_exemplo)
+    catalogo = obter_catalogo("data/vulnerabilidades_servidores.json", f"{caminho_relatorio_exemplo}/descritivo_vulnerabilidades_servidores.json")
 
     with open(caminho_saida_latex, 'w', encoding='utf-8') as file:
-        file.write(conteudo_latex)
+        escrever_conteudo_latex_para_vulnerabilidades_csv(file, vulnerabilidades, catalogo)
         
     print(f"Relatório LaTeX gerado em {caminho_saida_latex}.")
 
+@rastreado()
 def gerar_grafico(critical, high, medium, low, caminho_salvar):
     # Create a list of (label, size, color) tuples,
     # filtering out any categories with a size of 0.
@@ -304,51 +374,41 @@ def gerar_grafico(critical, high, medium, low, caminho_salvar):
 
     plt.savefig(f"{caminho_salvar}/Total_Vulnerabilidades.png", dpi=300, bbox_inches='tight')
 
+@rastreado()
 def copiar_relatorio_exemplo(caminho_relatorio_exemplo: str, caminho_saida: str):
 
-    src = r'\\?\\' + os.path.abspath(caminho_relatorio_exemplo)
-    dst = r'\\?\\' + os.path.abspath(caminho_saida)
+    src = os.path.abspath(caminho_relatorio_exemplo)
+    dst = os.path.abspath(caminho_saida)
+
+    # No Windows, o prefixo \\?\ permite caminhos com mais de 260 caracteres; nos demais sistemas ele
+    # viraria parte de um caminho relativo
+    if os.name == "nt":
+        src = '\\\\?\\' + src
+        dst = '\\\\?\\' + dst
 
     shutil.copytree(src, dst)
 
+@rastreado()
 def compilar_latex(caminho_arquivo_tex: str, pasta_saida: str):
+    inicio = time.perf_counter()
+    resultado = "erro"
     try:
-        # Use pdflatex diretamente (assumindo que o PATH foi configurado na instalação do MiKTeX)
+        # Use pdflatex diretamente (assumindo que o PATH foi configurado na instalação do MiKTeX ou do TeX Live)
         subprocess.run([
-            'pdflaTeX',
+            'pdflatex',
             '-interaction=nonstopmode',
             '-output-directory', pasta_saida,
             caminho_arquivo_tex
         ], check=True)
+        resultado = "sucesso"
         print("✅ PDF compilado com sucesso.")
     except FileNotFoundError:
         print("❌ Erro: 'pdflatex' não encontrado. Verifique se o MiKTeX está instalado e no PATH.")
     except subprocess.CalledProcessError as e:
         print("❌ Erro ao compilar o PDF:")
         print(e)
-
-
-def substituir_placeholders(conteudo, substituicoes_por_secao=None, substituicoes_globais=None):
-    if substituicoes_por_secao:
-        padrao_secao = r'(\\(sub)?section\{([^\}]*)\})(.*?)(?=(\\(sub)?section\{|\Z))'
-
-        def substituir_secao(match):
-            cabecalho = match.group(1)
-            titulo = match.group(3).strip()
-            corpo = match.group(4)
-
-            if titulo in substituicoes_por_secao:
-                for alvo, novo in substituicoes_por_secao[titulo].items():
-                    corpo = corpo.replace(f'[{alvo}]', novo)
-            return cabecalho + corpo
-
-        conteudo = re.sub(padrao_secao, substituir_secao, conteudo, flags=re.DOTALL)
-
-    if substituicoes_globais:
-        for alvo, novo in substituicoes_globais.items():
-            conteudo = conteudo.replace(f'[{alvo}]', novo)
-
-    return conteudo
+    finally:
+        COMPILACOES_LATEX.labels(resultado).observe(time.perf_counter() - inicio)
 
 
 def gerar_relatorio_csv(dados: list, output_path: str) -> None:
@@ -5,14 +5,17 @@ import time
 
 from ...utils.config import Config
 from ...api.tenable_api import TenableApi
-from ...database.database import Database
+from ...database.database import indice_criado, obter_database
+from ...utils.cache_utils import remover_resumos_em_cache
 import os
+import json
+from pathlib import Path
 
-from ...analysis.vulnerability_handler import *
-from ...report.report_generator import terminar_relatorio_preprocessado, compilar_latex
-from ...plot.plot import gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site
+from ...report.fila_relatorios import caminho_pdf_relatorio, enfileirar_relatorio, obter_status_relatorio
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 import shutil
+from ...utils.utils import ler_paginacao
 
 tenable_api = TenableApi()
 config = Config("config.json")
@@ -33,25 +36,27 @@ def criarLista():
         if not nomeLista:
             return 'Campo "nomeLista" é obrigatório.', 400
 
-        db = Database()
+        db = obter_database()
 
-        # Verifica se já existe uma lista com esse nome
-        lista_existente = db.find_one("listas", {"nomeLista": nomeLista})
-
-        if lista_existente:
-            db.close()
+        # Enquanto o índice único em nomeLista não existir (ex.: MongoDB indisponível na criação dos
+        # índices), a duplicidade é verificada antes de inserir
+        if not indice_criado("nomeLista_unico") and db.find_one("listas", {"nomeLista": nomeLista}, {"_id": 1}):
             return f'Já existe uma lista com o nome "{nomeLista}".', 409
 
-        # Criação da nova lista
-        id_lista = db.insert_one("listas", {
-            "nomeLista": nomeLista,
-            "pastas_scans_webapp": None,
-            "id_scan": None,
-            "historyid_scanservidor": None,
-            "nomeScanStoryId": None,
-            "scanStoryIdCriadoPor": None,
-            "relatorioGerado": False
-        }).inserted_id
+        # Criação da nova lista; o índice único em nomeLista recusa nomes repetidos, mesmo com
+        # requisições simultâneas
+        try:
+            id_lista = db.insert_one("listas", {
+                "nomeLista": nomeLista,
+                "pastas_scans_webapp": None,
+                "id_scan": None,
+                "historyid_scanservidor": None,
+                "nomeScanStoryId": None,
+                "scanStoryIdCriadoPor": None,
+                "relatorioGerado": False
+            }).inserted_id
+        except DuplicateKeyError:
+            return f'Já existe uma lista com o nome "{nomeLista}".', 409
 
         pasta_scan = f"{config.caminho_shared_jsons}/{id_lista}/"
 
@@ -59,7 +64,6 @@ def criarLista():
 
         os.makedirs(pasta_scan, exist_ok=True)
 
-        db.close()
 
         return "OK", 200
 
@@ -87,7 +91,7 @@ def criarLista():
 #         if not isinstance(scans, dict):
 #             return 'Erro instancia', 520
         
-#         db = Database()
+#         db = obter_database()
 
 #         documento = db.find_one("listas", {"nomeLista": nome_lista})
 
@@ -120,11 +124,10 @@ def getScansDeLista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
+        db = obter_database()
 
         documento = db.find_one("listas", {"nomeLista": nome_lista})
 
-        db.close()
 
         if not documento:
             return "Lista não encontrada", 404
@@ -137,7 +140,8 @@ def getScansDeLista():
             return "Pasta de scans não encontrada", 404
 
         for arquivo in os.listdir(pasta_scans):
-            if arquivo.endswith(".json"):
+            # Arquivos ocultos (ex.: o manifesto dos downloads) não são scans
+            if arquivo.endswith(".json") and not arquivo.startswith("."):
                 caminho_arquivo = os.path.join(pasta_scans, arquivo)
                 with open(caminho_arquivo, 'r', encoding='utf-8') as f:
                     conteudo = json.load(f)
@@ -165,11 +169,10 @@ def getVMScansDeLista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
+        db = obter_database()
 
         documento = db.find_one("listas", {"nomeLista": nome_lista})
 
-        db.close()
 
         if not documento:
             return "Lista não encontrada", 404
@@ -200,11 +203,10 @@ def limparScansDeLista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
+        db = obter_database()
 
         documento = db.find_one("listas", {"nomeLista": nome_lista})
 
-        db.close()
 
         if not documento:
             return "Lista não encontrada", 404
@@ -212,6 +214,8 @@ def limparScansDeLista():
         pasta_scans = documento["pastas_scans_webapp"]
 
         if os.path.exists(pasta_scans):
+            remover_resumos_em_cache(config.caminho_cache_scans, [os.path.join(pasta_scans, arquivo) for arquivo in os.listdir(pasta_scans)])
+
             for arquivo in os.listdir(pasta_scans):
                 caminho_arquivo = os.path.join(pasta_scans, arquivo)
                 if os.path.isfile(caminho_arquivo) or os.path.islink(caminho_arquivo):
@@ -238,38 +242,21 @@ def limparVMScansDeLista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
-
-        documento = db.find_one("listas", {"nomeLista": nome_lista})
+        db = obter_database()
 
-        if not documento:
-            return "Lista não encontrada", 404
-        
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"id_scan": None}
-        )
-        
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"historyid_scanservidor": None}
-        )
-
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"nomeScanStoryId": None}
-        )
-
-        db.update_one(
+        resultado = db.update_one(
             "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"scanStoryIdCriadoPor": None}
+            {"nomeLista": nome_lista},
+            {
+                "id_scan": None,
+                "historyid_scanservidor": None,
+                "nomeScanStoryId": None,
+                "scanStoryIdCriadoPor": None
+            }
         )
 
-        db.close()
+        if resultado.matched_count == 0:
+            return "Lista não encontrada", 404
 
         return 'OK', 200
 
@@ -291,15 +278,21 @@ def editar_nome_lista():
         if not lista_id or not novo_nome:
             return 'ID ou novo nome não fornecido', 520
 
-        db = Database()
+        db = obter_database()
 
-        resultado = db.update_one(
-            "listas",
-            {"_id": ObjectId(lista_id)},
-            {"nomeLista": novo_nome}
-        )
+        # Sem o índice único em nomeLista, a duplicidade é verificada antes (ver criarLista)
+        if not indice_criado("nomeLista_unico") and db.find_one("listas", {"nomeLista": novo_nome, "_id": {"$ne": ObjectId(lista_id)}}, {"_id": 1}):
+            return f'Já existe uma lista com o nome "{novo_nome}".', 409
+
+        try:
+            resultado = db.update_one(
+                "listas",
+                {"_id": ObjectId(lista_id)},
+                {"nomeLista": novo_nome}
+            )
+        except DuplicateKeyError:
+            return f'Já existe uma lista com o nome "{novo_nome}".', 409
 
-        db.close()
 
         if resultado.modified_count == 0:
             return "Nenhuma modificação realizada. Caso o erro persista, contate o administrador do sistema.", 404
@@ -324,21 +317,26 @@ def adicionarWAPPScanALista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
+        db = obter_database()
 
         documento = db.find_one("listas", {"nomeLista": nome_lista})
 
-        db.close()
 
         if not documento:
             return "Lista não encontrada", 404
         
-        tenable_api.download_scans_results_json(
+        resumo = tenable_api.download_scans_results_json(
             documento["pastas_scans_webapp"],
-            scans
+            scans,
+            config.downloads_simultaneos,
+            config.timeout_download_scans
         )
 
-        return 'OK', 200
+        # 200 se ao menos um scan foi baixado; o resumo informa quais falharam
+        if resumo["total"] and not resumo["sucessos"]:
+            return jsonify(resumo), 502
+
+        return jsonify(resumo), 200
 
     except Exception as e:
         return str(e), 520
@@ -361,43 +359,29 @@ def adicionarVMScanALista():
         if not nome_lista:
             return 'Nome da lista não fornecido', 520
 
-        db = Database()
-
-        documento = db.find_one("listas", {"nomeLista": nome_lista})
-
-        if not documento:
-            return "Lista não encontrada", 404
-        
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"id_scan": idNmr}
-        )
-        
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"historyid_scanservidor": id_scan}
-        )
-
-        db.update_one(
-            "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"nomeScanStoryId": nome_scan}
-        )
+        db = obter_database()
 
-        db.update_one(
+        # Grava o scan na lista e já recebe o documento atualizado, usado no download abaixo
+        documento = db.find_one_and_update(
             "listas",
-            {"_id": ObjectId(documento["_id"])},
-            {"scanStoryIdCriadoPor": criado_por}
+            {"nomeLista": nome_lista},
+            {
+                "id_scan": idNmr,
+                "historyid_scanservidor": id_scan,
+                "nomeScanStoryId": nome_scan,
+                "scanStoryIdCriadoPor": criado_por
+            },
+            projection={"pastas_scans_webapp": 1, "id_scan": 1, "historyid_scanservidor": 1}
         )
 
-        db.close()
+        if not documento:
+            return "Lista não encontrada", 404
 
         tenable_api.download_vmscans_csv(
             documento["pastas_scans_webapp"],
             documento["id_scan"],
-            documento["historyid_scanservidor"]
+            documento["historyid_scanservidor"],
+            config.prazo_exportacao_vm
         )
 
         return 'OK', 200
@@ -410,9 +394,9 @@ def adicionarVMScanALista():
 def getTodasAsListas():
 
     try:
-        db = Database()
+        db = obter_database()
 
-        listas = db.find("listas")
+        listas = db.find("listas", projection={"nomeLista": 1})
 
         listas_json = []
 
@@ -422,12 +406,38 @@ def getTodasAsListas():
                 "nomeLista": lista["nomeLista"]
             })
 
-        db.close()
 
         return listas_json, 200
 
     except Exception as e:
         return str(e), 520
+
+@listas_bp.route('/getListasPaginadas/', methods=['GET'])
+@cross_origin(origins=["http://localhost:5173", "127.0.0.1"])
+def getListasPaginadas():
+    """
+    Lista as listas em ordem alfabética, uma página por vez (?pagina=1&tamanhoPagina=50).
+    """
+    try:
+        try:
+            pagina, tamanho_pagina = ler_paginacao(request.args)
+        except ValueError as e:
+            return f"Parâmetros de paginação inválidos: {e}", 400
+
+        db = obter_database()
+
+        listas = db.find("listas", projection={"nomeLista": 1}, sort=[("nomeLista", 1)],
+                         skip=(pagina - 1) * tamanho_pagina, limit=tamanho_pagina)
+
+        return {
+            "itens": [{"idLista": str(lista["_id"]), "nomeLista": lista["nomeLista"]} for lista in listas],
+            "total": db.count_documents("listas", {}),
+            "pagina": pagina,
+            "tamanhoPagina": tamanho_pagina,
+        }, 200
+
+    except Exception as e:
+        return str(e), 520
     
 @listas_bp.route('/gerarRelatorioDeLista/', methods=['POST'])
 @cross_origin(origins=["http://localhost:5173", "127.0.0.1"])
@@ -438,18 +448,11 @@ def gerarRelatorioDeLista():
         data = request.get_json()
 
         if not data:
-            return 'dasdasdasd', 520
+            return 'Sem dados no request', 520
         
         id_lista = data.get("idLista")
-        nome_secretaria = data.get("nomeSecretaria")
-        sigla_secretaria = data.get("siglaSecretaria")
-        data_inicio = data.get("dataInicio")
-        data_fim = data.get("dataFim")
-        ano = data.get("ano")
-        mes = data.get("mes")
-        google_drive_link = data.get("linkGoogleDrive")
 
-        db = Database()
+        db = obter_database()
 
         # =================================
 
@@ -460,66 +463,43 @@ def gerarRelatorioDeLista():
         
         lista = db.find_one("listas", {"_id": objeto_id})
 
-        # =================================
-
-        json_webapp_vulnerabilidades = lista["pastas_scans_webapp"]
+        if not lista:
+            return 'Lista não encontrada.', 404
 
-        novo_relatorio = db.insert_one("relatorios", {"nome": nome_secretaria, "id_lista": id_lista, "destino_relatorio_preprocessado" : None}).inserted_id
-
-        # ===========================================
-
-        pasta_destino_relatorio_preprocessado = f"{config.caminho_shared_relatorios}/{novo_relatorio}/relatorio_preprocessado/"
-
-        db.update_one("relatorios", {"_id": novo_relatorio}, {"destino_relatorio_preprocessado": pasta_destino_relatorio_preprocessado})
-
-        # ===========================================
+        # =================================
 
-        destino = Path(pasta_destino_relatorio_preprocessado)
-        destino.mkdir(parents=True, exist_ok=True)
+        # A geração roda em segundo plano; o andamento é consultado em /listas/statusRelatorio/
+        id_relatorio = enfileirar_relatorio(id_lista, data)
 
-        processar_relatorio_json(json_webapp_vulnerabilidades, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo)
-        processar_relatorio_csv(json_webapp_vulnerabilidades, pasta_destino_relatorio_preprocessado, config.caminho_shared_relatorios_exemplo)
+        return jsonify({"idRelatorio": id_relatorio}), 202
 
-        extrair_quantidades_vulnerabilidades_por_site(f"{pasta_destino_relatorio_preprocessado}/vulnerabilidades_agrupadas_por_site.csv", json_webapp_vulnerabilidades)
+    except Exception as e:
+        return str(e), 520
 
-        terminar_relatorio_preprocessado(
-            nome_secretaria, 
-            sigla_secretaria, 
-            data_inicio, 
-            data_fim, 
-            ano, 
-            mes, 
-            pasta_destino_relatorio_preprocessado, 
-            f"{pasta_destino_relatorio_preprocessado}/relatorio_pronto.tex", 
-            config.caminho_shared_relatorios_exemplo,
-            google_drive_link)
+@listas_bp.route('/statusRelatorio/', methods=['GET'])
+@cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
+def statusRelatorio():
 
+    try:
+        id_relatorio = request.args.get('idRelatorio')
 
-        pasta_front = f"../front-end/downloads/{novo_relatorio}/"
+        if not id_relatorio:
+            return jsonify({"error": "Parâmetro 'idRelatorio' é obrigatório."}), 400
 
-        destino = Path(pasta_front)
-        destino.mkdir(parents=True, exist_ok=True)
+        try:
+            ObjectId(id_relatorio)
+        except Exception as e:
+            return jsonify({"error": f"ID inválido: {e}"}), 400
 
-        gerar_Grafico_Quantitativo_Vulnerabilidades_Por_Site(
-                    f"{pasta_destino_relatorio_preprocessado}/vulnerabilidades_agrupadas_por_site.csv", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/assets/images-was/Vulnerabilidades_x_site.png", "decrescente"
-                )
-        
-        compilar_latex(f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/main.tex", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/")
-        compilar_latex(f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/main.tex", f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/")
-    
-        shutil.copy(
-            f"{pasta_destino_relatorio_preprocessado}/RelatorioPronto/main.pdf",
-            f"{pasta_front}/main.pdf"
-        )
+        status = obter_status_relatorio(id_relatorio)
 
-        db.update_one("listas", {"_id": id_lista}, {"relatorioGerado": True})
-        db.close()
-        db.close()
+        if not status:
+            return jsonify({"error": "Relatório não encontrado."}), 404
 
-        return str(novo_relatorio), 200
+        return jsonify(status), 200
 
     except Exception as e:
-        return str(e), 520
+        return jsonify({"error": str(e)}), 520
 
 @listas_bp.route('/getRelatorioMissingVulnerabilities/', methods=['GET'])
 @cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
@@ -566,9 +546,7 @@ def excluirLista():
         
         id_lista = data.get("idLista")
 
-        db = Database()
-
-        print(db.find("listas"))
+        db = obter_database()
 
         try:
             objeto_id = ObjectId(id_lista)
@@ -579,34 +557,41 @@ def excluirLista():
 
         pasta_lista = f"{config.caminho_shared_jsons}/{id_lista}/"
         if os.path.exists(pasta_lista):
+            remover_resumos_em_cache(config.caminho_cache_scans, [os.path.join(pasta_lista, arquivo) for arquivo in os.listdir(pasta_lista)])
             shutil.rmtree(pasta_lista)
 
-        db.close()
 
         return 'OK', 200
         
     except Exception as e:
         return str(e), 520
 
-@listas_bp.route('/baixarRelatorioPdf/', methods=['POST'])
+@listas_bp.route('/baixarRelatorioPdf/', methods=['GET', 'POST'])
 @cross_origin(origins=["http://localhost:5173", "127.0.0.1"])
 def baixar_relatorio_pdf():
     try:
-        data = request.get_json()
-
-        id_relatorio = data.get("idRelatorio")
+        # GET com ?idRelatorio= (link de download, ver urlPdf em /listas/statusRelatorio/) ou POST com JSON
+        if request.method == 'GET':
+            id_relatorio = request.args.get("idRelatorio")
+        else:
+            id_relatorio = (request.get_json(silent=True) or {}).get("idRelatorio")
 
         if not id_relatorio:
             return "ID do relatório não fornecido.", 400
 
-        # Usando pathlib para garantir que o caminho esteja correto
-        
-        caminho_pdf = f"/app/shared/relatorios/{id_relatorio}/relatorio_preprocessado/RelatorioPronto/main.pdf"
-        print(caminho_pdf)
+        try:
+            ObjectId(id_relatorio)
+        except Exception as e:
+            return f"ID inválido: {e}", 400
+
+        # Gerado pelo consumidor da fila na pasta compartilhada (ver fila_relatorios.caminho_pdf_relatorio)
+        caminho_pdf = caminho_pdf_relatorio(id_relatorio)
+
+        if not os.path.isfile(caminho_pdf):
+            return "PDF do relatório não encontrado.", 404
 
-        # Tentar enviar o arquivo
         return send_file(
-            str(caminho_pdf),  # Passando o caminho como string
+            caminho_pdf,
             as_attachment=True,
             download_name="Relatorio.pdf",
             mimetype="application/pdf"
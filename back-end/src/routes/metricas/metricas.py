@@ -0,0 +1,19 @@
+import os
+
+from flask import Blueprint, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+
+metricas_bp = Blueprint('metricas', __name__)
+
+@metricas_bp.route('/metrics', methods=['GET'])
+def metricas():
+    """
+    Métricas do back-end no formato texto do Prometheus (ver utils/metricas.py).
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Com vários workers do gunicorn, soma as métricas gravadas por todos eles na pasta compartilhada
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+        return Response(generate_latest(registro), content_type=CONTENT_TYPE_LATEST)
+
+    return Response(generate_latest(), content_type=CONTENT_TYPE_LATEST)
@@ -1,32 +1,62 @@
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 from ...utils.config import Config
-from ...api.tenable_api import TenableApi # Se não for usado, pode remover
-from ...database.database import Database
+from ...database.database import obter_database
 import os
 from pathlib import Path
 import shutil
 from bson.objectid import ObjectId
+from ...utils.utils import ler_paginacao
 
-tenable_api = TenableApi() # Se não for usado, pode remover
 config = Config("config.json")
 
 relatorios_bp = Blueprint('relatorios', __name__, url_prefix='/relatorios')
 
+# Campos usados nas listagens; o restante (etapas, rastreamento...) não é lido do banco
+CAMPOS_LISTAGEM = {"nome": 1, "status": 1}
+
+def _resumir_relatorio(relatorio: dict) -> dict:
+    return {
+        "nome": relatorio["nome"],
+        "id": str(relatorio["_id"]),
+        # Relatórios anteriores à fila de geração não têm status e já estão prontos
+        "status": relatorio.get("status", "concluido")
+    }
+
 @relatorios_bp.route('/getRelatoriosGerados/', methods=['GET'])
 @cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
 def getRelatoriosGerados():
     try:
-        db = Database()
-        relatorios = db.find("relatorios")
-        relatorios_list = []
-        for relatorio in relatorios:
-            relatorios_list.append({
-                "nome": relatorio["nome"],
-                "id": str(relatorio["_id"])
-            })
-        db.close()
-        return jsonify(relatorios_list), 200
+        db = obter_database()
+        relatorios = db.find("relatorios", projection=CAMPOS_LISTAGEM)
+        return jsonify([_resumir_relatorio(relatorio) for relatorio in relatorios]), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 520
+
+@relatorios_bp.route('/getRelatoriosGeradosPaginados/', methods=['GET'])
+@cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
+def getRelatoriosGeradosPaginados():
+    """
+    Lista os relatórios do mais recente para o mais antigo, uma página por vez (?pagina=1&tamanhoPagina=50).
+    """
+    try:
+        try:
+            pagina, tamanho_pagina = ler_paginacao(request.args)
+        except ValueError as e:
+            return jsonify({"error": f"Parâmetros de paginação inválidos: {e}"}), 400
+
+        db = obter_database()
+
+        # O _id (ObjectId) começa pelo instante de criação, então ordená-lo ordena pela data
+        relatorios = db.find("relatorios", projection=CAMPOS_LISTAGEM, sort=[("_id", -1)],
+                             skip=(pagina - 1) * tamanho_pagina, limit=tamanho_pagina)
+
+        return jsonify({
+            "itens": [_resumir_relatorio(relatorio) for relatorio in relatorios],
+            "total": db.count_documents("relatorios", {}),
+            "pagina": pagina,
+            "tamanhoPagina": tamanho_pagina,
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 520
 
@@ -34,12 +64,11 @@ def getRelatoriosGerados():
 @cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
 def deleteRelatorio(relatorio_id):
     try:
-        db = Database()
+        db = obter_database()
         
         delete_result = db.delete_one("relatorios", {"_id": db.get_object_id(relatorio_id)})
         
         if delete_result.deleted_count == 0:
-            db.close()
             return jsonify({"message": "Relatório não encontrado no banco de dados."}), 404
 
         report_folder_path = Path(config.caminho_shared_relatorios) / relatorio_id
@@ -50,7 +79,6 @@ def deleteRelatorio(relatorio_id):
         else:
             print(f"DEBUG: Pasta do relatório não encontrada ou não é um diretório: {report_folder_path}")
 
-        db.close()
         return jsonify({"message": "Relatório excluído com sucesso."}), 200
 
     except Exception as e:
@@ -62,10 +90,10 @@ def deleteRelatorio(relatorio_id):
 @cross_origin(origins=["http://localhost:5173", "http://127.0.0.1:5173"])
 def deleteAllRelatorios():
     try:
-        db = Database()
+        db = obter_database()
         
         # 1. Recuperar todos os relatórios para obter seus IDs (necessário para excluir as pastas)
-        all_relatorios = db.find("relatorios") # Pega todos os documentos
+        all_relatorios = db.find("relatorios", projection={"_id": 1}) # Pega os IDs de todos os documentos
         
         # 2. Excluir todos os documentos do banco de dados
         delete_db_result = db.delete_many("relatorios", {}) # Query vazia para deletar tudo
@@ -86,7 +114,6 @@ def deleteAllRelatorios():
             else:
                 print(f"DEBUG: Pasta {report_folder_path} não encontrada ou não é um diretório.")
 
-        db.close()
         return jsonify({
             "message": f"Todos os {delete_db_result.deleted_count} relatórios foram excluídos do banco de dados e {deleted_folders_count} pastas foram removidas do sistema de arquivos."
         }), 200
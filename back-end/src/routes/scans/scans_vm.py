@@ -2,20 +2,24 @@ from flask import Blueprint, request
 from flask_cors import cross_origin
 
 from ...utils.config import Config
-from ...api.tenable_api import TenableApi
+from ...api.tenable_api_async import AsyncTenableApi
+from ...utils.flask_async import view_assincrona
+from .scans_webapp import ORIGENS_BUSCA_SCANS
 import os
 
-tenable_api = TenableApi()
+tenable_api = AsyncTenableApi()
 config = Config("config.json")
 
 scans_vm_bp = Blueprint('scansvm', __name__, url_prefix='/scansvm')
 
-@scans_vm_bp.route('/getScanByName/', methods=['POST'])
-@cross_origin(origins=["http://localhost:5173", "127.0.0.1"])
-def get_vm_scans() -> dict:
-
-    data = request.get_json()
+async def buscar_scan_vm_por_nome(data: dict) -> tuple:
+    """
+    Busca um scan VM pelo nome. Usada pela view abaixo (servidor de desenvolvimento) e pela rota
+    assíncrona de src/asgi.py (produção).
 
+    :param data: Corpo JSON da requisição, com name e, opcionalmente, atualizar.
+    :return: (corpo, status) da resposta.
+    """
     if not data:
         return "No data provided", 400
     
@@ -24,9 +28,19 @@ def get_vm_scans() -> dict:
     if not name:
         return "Name not provided", 400
 
-    scan = tenable_api.get_vmscans_from_name(name)
+    # A lista de scans fica em cache por alguns segundos; "atualizar" força uma nova consulta ao Tenable
+    if data.get("atualizar"):
+        tenable_api.invalidar_cache("scans")
+
+    scan = await tenable_api.get_vmscans_from_name(name)
 
     if not scan:
         return "Scan não encontrado.", 404
 
-    return scan, 200
\ No newline at end of file
+    return scan, 200
+
+@scans_vm_bp.route('/getScanByName/', methods=['POST'])
+@cross_origin(origins=ORIGENS_BUSCA_SCANS)
+@view_assincrona
+async def get_vm_scans() -> dict:
+    return await buscar_scan_vm_por_nome(request.get_json())
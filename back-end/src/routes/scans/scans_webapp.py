@@ -3,19 +3,28 @@ from flask_cors import cross_origin
 
 from ...utils.config import Config
 from ...api.tenable_api import TenableApi
+from ...api.tenable_api_async import AsyncTenableApi
+from ...utils.flask_async import view_assincrona
 import os
 
 tenable_api = TenableApi()
+tenable_api_async = AsyncTenableApi()
 config = Config("config.json")
 
 scans_bp = Blueprint('scans', __name__, url_prefix='/scans/webapp')
 
-@scans_bp.route('/scansfromfolderofuser/', methods=['POST'])
-@cross_origin(origins=["http://localhost:5173", "127.0.0.1"])
-def scansfromfolderofuser():
-    try:
-        data = request.get_json()
+# Origens aceitas pelo CORS nas buscas de scans (também usadas por src/asgi.py)
+ORIGENS_BUSCA_SCANS = ["http://localhost:5173", "127.0.0.1"]
+
+async def buscar_scans_da_pasta(data: dict) -> tuple:
+    """
+    Busca os scans do WAS de uma pasta do usuário. Usada pela view abaixo (servidor de desenvolvimento)
+    e pela rota assíncrona de src/asgi.py (produção).
 
+    :param data: Corpo JSON da requisição, com nomeUsuario, nomePasta e, opcionalmente, atualizar.
+    :return: (corpo, status) da resposta.
+    """
+    try:
         if not data:
             return '', 520
 
@@ -25,7 +34,11 @@ def scansfromfolderofuser():
         if not nome_usuario or not nome_pasta:
             return '', 520
 
-        scans = tenable_api.get_web_app_scans_from_folder_of_user(nome_pasta, nome_usuario)
+        # As buscas ficam em cache por alguns minutos; "atualizar" força uma nova consulta ao Tenable
+        if data.get("atualizar"):
+            tenable_api_async.invalidar_cache("was_configs", (nome_pasta, nome_usuario))
+
+        scans = await tenable_api_async.get_web_app_scans_from_folder_of_user(nome_pasta, nome_usuario)
 
         print(scans)
 
@@ -36,6 +49,12 @@ def scansfromfolderofuser():
 
     except Exception:
         return '', 520
+
+@scans_bp.route('/scansfromfolderofuser/', methods=['POST'])
+@cross_origin(origins=ORIGENS_BUSCA_SCANS)
+@view_assincrona
+async def scansfromfolderofuser():
+    return await buscar_scans_da_pasta(request.get_json(silent=True))
     
 @scans_bp.route('/downloadscans/', methods=['POST'])
 @cross_origin(origins=["http://localhost:3000/", "127.0.0.1"])
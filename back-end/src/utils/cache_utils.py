@@ -0,0 +1,248 @@
+"""
+Cache persistente, em disco, dos resumos por arquivo produzidos na leitura dos scans
+(ver analysis/json_parser.resumir_scan_json e analysis/csv_parser.resumir_arquivo_csv).
+
+Cada arquivo de scan tem uma entrada própria, identificada pelo caminho do arquivo, e que guarda
+o tamanho, o mtime e o SHA-256 do conteúdo no momento da leitura. Se tamanho e mtime não mudaram,
+o resumo é reaproveitado sem ler o arquivo; se mudaram, o conteúdo é comparado pelo hash antes de
+decidir por uma nova leitura. As entradas são gravadas em JSON e compactadas com zlib: a pasta do
+cache é compartilhada entre os contêineres, e ler uma entrada adulterada com pickle executaria código.
+Por isso os resumos precisam ser serializáveis em JSON (sem tuplas como chave, por exemplo).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Incrementar sempre que o formato dos resumos mudar, invalidando as entradas antigas
+VERSAO_CACHE = 2
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+# Manifesto de cada pasta de scans, gravado pelos downloads do Tenable (ver api/tenable_api.py) com o
+# tamanho, o mtime e o SHA-256 de cada arquivo baixado. Por começar com ".", não é encontrado pela
+# busca por "*.json" dos relatórios.
+NOME_MANIFESTO = ".manifesto.json"
+VERSAO_MANIFESTO = 1
+
+# Arquivo travado (flock) durante a atualização do manifesto, que pode ser feita por vários processos
+# (workers do gunicorn, consumidor da fila) sobre a mesma pasta compartilhada
+NOME_TRAVA_MANIFESTO = ".manifesto.lock"
+
+_trava_manifesto = threading.Lock()
+
+
+def calcular_sha256(caminho_arquivo: str) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo-o em blocos.
+
+    :param caminho_arquivo: Caminho do arquivo.
+    :return: Hash SHA-256 em hexadecimal.
+    """
+    sha256 = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_HASH), b''):
+            sha256.update(bloco)
+    return sha256.hexdigest()
+
+
+def _caminho_entrada(pasta_cache: str, caminho_arquivo: str, tipo: str) -> str:
+    chave = hashlib.sha1(os.path.abspath(caminho_arquivo).encode('utf-8')).hexdigest()
+    return os.path.join(pasta_cache, f"{chave}.{tipo}.cache")
+
+
+def _ler_entrada(caminho_entrada: str) -> dict:
+    try:
+        with open(caminho_entrada, 'rb') as arquivo:
+            entrada = json.loads(zlib.decompress(arquivo.read()))
+    except (OSError, zlib.error, ValueError):
+        return None
+
+    if not isinstance(entrada, dict) or entrada.get("versao") != VERSAO_CACHE:
+        return None
+    return entrada
+
+
+def _salvar_entrada(pasta_cache: str, caminho_entrada: str, entrada: dict) -> None:
+    try:
+        conteudo = zlib.compress(json.dumps(entrada, ensure_ascii=False).encode('utf-8'))
+    except (TypeError, ValueError) as e:
+        print(f"Aviso: o resumo de '{entrada.get('caminho')}' não pode ser gravado no cache: {e}")
+        return
+
+    os.makedirs(pasta_cache, exist_ok=True)
+
+    # Grava em um arquivo temporário e renomeia, para que leitores concorrentes nunca vejam uma entrada parcial
+    descritor, caminho_temporario = tempfile.mkstemp(dir=pasta_cache, suffix=".tmp")
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        os.replace(caminho_temporario, caminho_entrada)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o cache '{caminho_entrada}': {e}")
+        if os.path.exists(caminho_temporario):
+            os.unlink(caminho_temporario)
+
+
+def obter_resumo_em_cache(pasta_cache: str, caminho_arquivo: str, tipo: str, funcao_resumo: Callable[[str], dict]) -> dict:
+    """
+    Retorna o resumo de um arquivo de scan, reaproveitando o cache quando o arquivo não mudou.
+
+    :param pasta_cache: Pasta onde as entradas do cache são gravadas.
+    :param caminho_arquivo: Caminho do arquivo de scan.
+    :param tipo: Tipo do resumo ('json' ou 'csv'); faz parte da chave da entrada.
+    :param funcao_resumo: Função que lê o arquivo e produz o resumo (serializável em JSON), chamada apenas
+        quando necessário. Um resumo com a chave "erro" (leitura que falhou) é retornado sem ir para o cache.
+    :return: Resumo do arquivo.
+    """
+    caminho_entrada = _caminho_entrada(pasta_cache, caminho_arquivo, tipo)
+    estado = os.stat(caminho_arquivo)
+    entrada = _ler_entrada(caminho_entrada)
+
+    if entrada is not None and entrada["tamanho"] == estado.st_size and entrada["mtime_ns"] == estado.st_mtime_ns:
+        return entrada["resumo"]
+
+    # O hash registrado no manifesto da pasta no download evita reler o arquivo
+    sha256 = _sha256_no_manifesto(caminho_arquivo, estado) or calcular_sha256(caminho_arquivo)
+
+    if entrada is None or entrada["sha256"] != sha256:
+        resumo = funcao_resumo(caminho_arquivo)
+
+        # Uma falha na leitura (ex.: erro transitório de E/S) não fica gravada: o arquivo é lido de novo na próxima vez
+        if resumo.get("erro"):
+            return resumo
+
+        entrada = {"versao": VERSAO_CACHE, "sha256": sha256, "resumo": resumo}
+
+    # Mesmo quando só o mtime mudou (conteúdo idêntico), a entrada é atualizada para evitar recalcular o hash
+    entrada.update({
+        "caminho": os.path.abspath(caminho_arquivo),
+        "tamanho": estado.st_size,
+        "mtime_ns": estado.st_mtime_ns
+    })
+    _salvar_entrada(pasta_cache, caminho_entrada, entrada)
+
+    return entrada["resumo"]
+
+
+def remover_resumos_em_cache(pasta_cache: str, caminhos_arquivos: List[str]) -> None:
+    """
+    Remove do cache as entradas dos arquivos informados (por exemplo, ao limpar ou excluir uma lista).
+
+    :param pasta_cache: Pasta onde as entradas do cache são gravadas.
+    :param caminhos_arquivos: Caminhos dos arquivos de scan cujas entradas devem ser removidas.
+    """
+    for caminho_arquivo in caminhos_arquivos:
+        for tipo in ("json", "csv"):
+            caminho_entrada = _caminho_entrada(pasta_cache, caminho_arquivo, tipo)
+            if os.path.exists(caminho_entrada):
+                os.unlink(caminho_entrada)
+
+
+@lru_cache(maxsize=32)
+def _ler_manifesto_versao(caminho_manifesto: str, mtime_ns: int) -> dict:
+    return _carregar_manifesto(caminho_manifesto)
+
+
+def _carregar_manifesto(caminho_manifesto: str) -> dict:
+    try:
+        with open(caminho_manifesto, 'r', encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(manifesto, dict) or manifesto.get("versao") != VERSAO_MANIFESTO:
+        return {}
+    return manifesto.get("arquivos", {})
+
+
+def ler_manifesto(pasta: str) -> dict:
+    """
+    Lê o manifesto de uma pasta de scans.
+
+    :param pasta: Pasta dos scans.
+    :return: Dicionário {nome do arquivo: {"tamanho", "mtime_ns", "sha256", "registrado_em"}}; vazio se não houver manifesto.
+    """
+    caminho_manifesto = os.path.join(pasta, NOME_MANIFESTO)
+    try:
+        mtime_ns = os.stat(caminho_manifesto).st_mtime_ns
+    except OSError:
+        return {}
+    return dict(_ler_manifesto_versao(caminho_manifesto, mtime_ns))
+
+
+def registrar_no_manifesto(pasta: str, registros: dict) -> None:
+    """
+    Registra no manifesto da pasta o tamanho e o SHA-256 de arquivos recém-gravados. O mtime é lido do
+    próprio arquivo, então o registro só vale enquanto o arquivo não for alterado.
+
+    :param pasta: Pasta dos scans.
+    :param registros: Dicionário {nome do arquivo: {"tamanho": int, "sha256": str}}.
+    """
+    if not registros:
+        return
+
+    with _trava_manifesto, _travar_manifesto(pasta):
+        # Lido sem o cache por mtime, para incluir qualquer registro gravado por outro processo até aqui
+        arquivos = dict(_carregar_manifesto(os.path.join(pasta, NOME_MANIFESTO)))
+
+        for nome, registro in registros.items():
+            try:
+                estado = os.stat(os.path.join(pasta, nome))
+            except OSError:
+                continue
+            arquivos[nome] = {
+                "tamanho": registro["tamanho"],
+                "mtime_ns": estado.st_mtime_ns,
+                "sha256": registro["sha256"],
+                "registrado_em": datetime.now().isoformat(timespec="seconds")
+            }
+
+        descritor, caminho_temporario = tempfile.mkstemp(dir=pasta, prefix=".manifesto", suffix=".tmp")
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump({"versao": VERSAO_MANIFESTO, "arquivos": arquivos}, arquivo, ensure_ascii=False, indent=2)
+            os.replace(caminho_temporario, os.path.join(pasta, NOME_MANIFESTO))
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o manifesto de '{pasta}': {e}")
+            if os.path.exists(caminho_temporario):
+                os.unlink(caminho_temporario)
+
+
+@contextmanager
+def _travar_manifesto(pasta: str):
+    """
+    Trava exclusivamente o manifesto da pasta entre processos, com flock em NOME_TRAVA_MANIFESTO, enquanto
+    o bloco `with` executa. Sem fcntl (Windows), vale apenas a trava entre threads de registrar_no_manifesto.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(os.path.join(pasta, NOME_TRAVA_MANIFESTO), 'a') as arquivo_trava:
+        fcntl.flock(arquivo_trava, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(arquivo_trava, fcntl.LOCK_UN)
+
+
+def _sha256_no_manifesto(caminho_arquivo: str, estado: os.stat_result) -> str:
+    registro = ler_manifesto(os.path.dirname(caminho_arquivo)).get(os.path.basename(caminho_arquivo))
+
+    # Registros incompletos (ex.: editados à mão ou de outra versão) são ignorados, e o hash é calculado
+    if isinstance(registro, dict) and registro.get("tamanho") == estado.st_size and registro.get("mtime_ns") == estado.st_mtime_ns:
+        return registro.get("sha256")
+    return None
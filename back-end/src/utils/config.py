@@ -1,4 +1,5 @@
 import json
+import os
 
 class Config:
     """
@@ -37,6 +38,26 @@ class Config:
         self._caminho_shared_relatorios = self._arquivo_config["caminho_shared_relatorios"]
         self._caminho_shared_jsons = self._arquivo_config["caminho_shared_jsons"]
         self._caminho_shared_relatorios_exemplo = self._arquivo_config["caminho_shared_relatorios_exemplo"]
+
+        # Configurações opcionais de desempenho
+        self._processos_ingestao = int(self._arquivo_config.get("processos_ingestao", 1))
+        self._tamanho_chunk_csv = int(self._arquivo_config.get("tamanho_chunk_csv", 0)) or None
+        self._caminho_cache_scans = self._arquivo_config.get("caminho_cache_scans", f"{self._caminho_shared_jsons}/.cache_scans")
+        self._salvar_txt_intermediarios = bool(self._arquivo_config.get("salvar_txt_intermediarios", False))
+        self._workers_relatorio = int(self._arquivo_config.get("workers_relatorio", 1))
+        self._porta_metricas_consumidor = int(self._arquivo_config.get("porta_metricas_consumidor", 9101))
+        self._downloads_simultaneos = int(self._arquivo_config.get("downloads_simultaneos", 8))
+        self._timeout_download_scans = float(self._arquivo_config.get("timeout_download_scans", 120))
+        self._prazo_exportacao_vm = float(self._arquivo_config.get("prazo_exportacao_vm", 1800))
+        self._exportar_trace_chrome = bool(self._arquivo_config.get("exportar_trace_chrome", False))
+
+        # Conexão com o MongoDB (a variável de ambiente MONGO_URI tem prioridade sobre o arquivo)
+        self._mongo_uri = os.getenv("MONGO_URI") or self._arquivo_config.get("mongo_uri", "mongodb://localhost:27017/")
+        self._mongo_max_pool_size = int(self._arquivo_config.get("mongo_max_pool_size", 50))
+        self._mongo_min_pool_size = int(self._arquivo_config.get("mongo_min_pool_size", 0))
+        self._mongo_timeout_selecao_ms = int(self._arquivo_config.get("mongo_timeout_selecao_ms", 5000))
+        self._mongo_timeout_conexao_ms = int(self._arquivo_config.get("mongo_timeout_conexao_ms", 5000))
+        self._mongo_timeout_espera_pool_ms = int(self._arquivo_config.get("mongo_timeout_espera_pool_ms", 10000))
     
     @property
     def caminho_shared_relatorios(self) -> str:
@@ -64,3 +85,153 @@ class Config:
         :return: Caminho da pasta shared de exemplo de relatorios.
         """
         return self._caminho_shared_relatorios_exemplo
+
+    @property
+    def processos_ingestao(self) -> int:
+        """
+        Retorna a quantidade de processos usados na leitura dos arquivos de scans (JSON/CSV).
+        Valores menores ou iguais a 1 mantêm a leitura serial.
+
+        :return: Quantidade de processos de ingestão.
+        """
+        return self._processos_ingestao
+
+    @property
+    def tamanho_chunk_csv(self) -> int:
+        """
+        Retorna a quantidade de linhas por bloco na leitura dos CSVs de servidores.
+        None (ou 0 no arquivo de configuração) lê cada arquivo de uma só vez.
+
+        :return: Quantidade de linhas por bloco.
+        """
+        return self._tamanho_chunk_csv
+
+    @property
+    def caminho_cache_scans(self) -> str:
+        """
+        Retorna o caminho da pasta do cache persistente de scans já lidos (por padrão, dentro da pasta
+        shared de arquivos json).
+
+        :return: Caminho da pasta do cache de scans.
+        """
+        return self._caminho_cache_scans
+
+    @property
+    def salvar_txt_intermediarios(self) -> bool:
+        """
+        Retorna se os relatórios intermediários em texto (Sites/Servidores_agrupados_por_vulnerabilidades.txt)
+        devem ser gravados junto do relatório. O LaTeX não depende deles.
+
+        :return: True para gravar os arquivos de texto.
+        """
+        return self._salvar_txt_intermediarios
+
+    @property
+    def workers_relatorio(self) -> int:
+        """
+        Retorna a quantidade de relatórios gerados ao mesmo tempo pelo consumidor da fila de relatórios.
+
+        :return: Quantidade de threads do consumidor.
+        """
+        return self._workers_relatorio
+
+    @property
+    def downloads_simultaneos(self) -> int:
+        """
+        Retorna a quantidade máxima de relatórios de scans WAS baixados ao mesmo tempo do Tenable.
+
+        :return: Limite de downloads simultâneos.
+        """
+        return self._downloads_simultaneos
+
+    @property
+    def timeout_download_scans(self) -> float:
+        """
+        Retorna o timeout, em segundos, de cada requisição feita ao Tenable no download dos scans WAS.
+
+        :return: Timeout das requisições de download.
+        """
+        return self._timeout_download_scans
+
+    @property
+    def prazo_exportacao_vm(self) -> float:
+        """
+        Retorna o tempo máximo, em segundos, de espera pela exportação em CSV de um scan VM no Tenable.
+
+        :return: Prazo da exportação.
+        """
+        return self._prazo_exportacao_vm
+
+    @property
+    def exportar_trace_chrome(self) -> bool:
+        """
+        Retorna se as medições de cada relatório também devem ser gravadas como trace do Chrome
+        (trace.json, na pasta do relatório pré-processado).
+
+        :return: True para exportar o trace.
+        """
+        return self._exportar_trace_chrome
+
+    @property
+    def mongo_uri(self) -> str:
+        """
+        Retorna a URI de conexão com o MongoDB (variável de ambiente MONGO_URI ou "mongo_uri" do arquivo).
+
+        :return: URI do MongoDB.
+        """
+        return self._mongo_uri
+
+    @property
+    def mongo_max_pool_size(self) -> int:
+        """
+        Retorna a quantidade máxima de conexões abertas com o MongoDB por processo.
+
+        :return: Tamanho máximo do pool de conexões.
+        """
+        return self._mongo_max_pool_size
+
+    @property
+    def mongo_min_pool_size(self) -> int:
+        """
+        Retorna a quantidade de conexões com o MongoDB mantidas abertas mesmo sem uso.
+
+        :return: Tamanho mínimo do pool de conexões.
+        """
+        return self._mongo_min_pool_size
+
+    @property
+    def mongo_timeout_selecao_ms(self) -> int:
+        """
+        Retorna o tempo máximo, em milissegundos, de espera por um servidor do MongoDB disponível.
+
+        :return: Timeout de seleção de servidor.
+        """
+        return self._mongo_timeout_selecao_ms
+
+    @property
+    def mongo_timeout_conexao_ms(self) -> int:
+        """
+        Retorna o tempo máximo, em milissegundos, para abrir uma conexão com o MongoDB.
+
+        :return: Timeout de conexão.
+        """
+        return self._mongo_timeout_conexao_ms
+
+    @property
+    def mongo_timeout_espera_pool_ms(self) -> int:
+        """
+        Retorna o tempo máximo, em milissegundos, de espera por uma conexão livre no pool quando todas
+        estiverem em uso.
+
+        :return: Timeout de espera no pool.
+        """
+        return self._mongo_timeout_espera_pool_ms
+
+    @property
+    def porta_metricas_consumidor(self) -> int:
+        """
+        Retorna a porta em que o consumidor da fila de relatórios expõe as suas métricas do Prometheus.
+
+        :return: Porta HTTP das métricas do consumidor.
+        """
+        return self._porta_metricas_consumidor
@@ -0,0 +1,19 @@
+from functools import wraps
+
+from flask import current_app
+
+
+def view_assincrona(view):
+    """
+    Executa uma view `async def` com o suporte a async do Flask (asgiref), mesmo sob decoradores
+    síncronos como o @cross_origin do flask_cors, que chamariam a view sem aguardar a corrotina.
+    Deve ser o decorador mais próximo da função.
+
+    :param view: View assíncrona.
+    :return: View síncrona, que aguarda a corrotina em um event loop criado para a requisição.
+    """
+    @wraps(view)
+    def executar(*args, **kwargs):
+        return current_app.ensure_sync(view)(*args, **kwargs)
+
+    return executar
@@ -1,5 +1,11 @@
 import json        
 import os
+from typing import Any, Iterator, Tuple
+
+import ijson
+
+# Campos dos findings do Tenable WAS efetivamente usados na geração dos relatórios
+CAMPOS_FINDING_SCAN = ("risk_factor", "uri", "name", "plugin_id")
 
 def carregar_json(caminho_arquivo_json: str) -> str:
     """
@@ -23,6 +29,52 @@ def carregar_json_utf(caminho_arquivo_json: str) -> str:
     with open(caminho_arquivo_json, 'r', encoding='utf-8') as arquivo:
         return json.load(arquivo)
     
+def iterar_scan_json(caminho_arquivo_json: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Lê um relatório JSON do Tenable WAS em streaming, sem montar a árvore completa do documento.
+
+    São produzidos apenas o campo `scan.target` e, para cada item de `findings`, os campos de
+    CAMPOS_FINDING_SCAN. Evidências em HTML e demais campos são descartados durante a leitura,
+    então o uso de memória não depende do tamanho do arquivo.
+
+    :param caminho_arquivo_json: O caminho do arquivo JSON a ser lido.
+    :return: Iterador de tuplas ('target', valor) ou ('finding', dict com os campos usados).
+    """
+    prefixos_campos = {f"findings.item.{campo}": campo for campo in CAMPOS_FINDING_SCAN}
+    eventos_valor = ("string", "number", "boolean", "null")
+    finding = None
+
+    with open(caminho_arquivo_json, 'rb') as arquivo:
+        for prefixo, evento, valor in ijson.parse(arquivo, use_float=True):
+            if prefixo == "findings.item":
+                if evento == "start_map":
+                    finding = {}
+                elif evento == "end_map":
+                    yield "finding", finding
+                    finding = None
+            elif finding is not None and prefixo in prefixos_campos and evento in eventos_valor:
+                finding[prefixos_campos[prefixo]] = valor
+            elif prefixo == "scan.target" and evento in eventos_valor:
+                yield "target", valor
+
+def carregar_scan_json(caminho_arquivo_json: str) -> dict:
+    """
+    Carrega em streaming (ver iterar_scan_json) apenas os dados de um relatório JSON do Tenable WAS
+    usados na análise, no mesmo formato do arquivo original: {'scan': {'target': ...}, 'findings': [...]}.
+
+    :param caminho_arquivo_json: O caminho do arquivo JSON a ser lido.
+    :return: Dicionário reduzido com o target e os campos usados de cada finding.
+    """
+    dados = {"findings": []}
+
+    for tipo, valor in iterar_scan_json(caminho_arquivo_json):
+        if tipo == "finding":
+            dados["findings"].append(valor)
+        else:
+            dados["scan"] = {"target": valor}
+
+    return dados
+
 def salvar_json(caminho_arquivo_json:str, dados:str) -> None:
     """
     Função para encontrar todos os arquivos JSON em um diretório especificado.
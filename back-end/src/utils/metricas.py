@@ -0,0 +1,177 @@
+"""
+Métricas do back-end no formato do Prometheus, expostas em /metrics (ver routes/metricas/metricas.py).
+
+- http_requisicoes_segundos: duração das requisições atendidas, por blueprint, rota (o padrão da URL,
+  ex.: /listas/getLista/), método e status.
+- tenable_requisicoes_segundos: duração das requisições feitas ao Tenable, por endpoint (com os IDs
+  trocados por {id}), método e status ("erro" quando não houve resposta). Em downloads em streaming,
+  mede até a chegada dos headers.
+- mongo_comandos_segundos: duração dos comandos enviados ao MongoDB, por comando e resultado; o
+  _count do histograma é a quantidade de chamadas.
+- compilar_latex_segundos: duração de cada execução do pdflatex, por resultado.
+- cache_consultas_total: acertos e faltas dos caches em memória (listagens do Tenable e catálogo de
+  vulnerabilidades).
+- relatorios_na_fila e relatorios_em_execucao: tamanho da fila de relatórios. São criadas apenas no
+  consumidor da fila (ver criar_metricas_fila e src/consumidor_relatorios.py), que as expõe na sua
+  própria porta (config.porta_metricas_consumidor), junto com as métricas do MongoDB e do pdflatex da
+  geração. O /metrics do servidor web não as inclui.
+
+As métricas ficam em memória, no processo que as registrou; registrar uma observação custa uma busca
+em dicionário e uma soma sob trava, sem E/S. Sob o gunicorn com vários workers, a variável
+PROMETHEUS_MULTIPROC_DIR (definida em gunicorn.conf.py) faz cada processo gravá-las em arquivos
+mapeados em memória nessa pasta, e /metrics soma os valores de todos os workers.
+"""
+
+import re
+import time
+
+import httpx
+from flask import Flask, g, request
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BUCKETS_LATEX = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+REQUISICOES_HTTP = Histogram(
+    "http_requisicoes_segundos", "Duração das requisições HTTP atendidas pelo back-end.",
+    ["blueprint", "rota", "metodo", "status"], buckets=BUCKETS_SEGUNDOS)
+
+REQUISICOES_TENABLE = Histogram(
+    "tenable_requisicoes_segundos", "Duração das requisições feitas à API do Tenable.",
+    ["endpoint", "metodo", "status"], buckets=BUCKETS_SEGUNDOS)
+
+COMANDOS_MONGO = Histogram(
+    "mongo_comandos_segundos", "Duração dos comandos enviados ao MongoDB.",
+    ["comando", "resultado"], buckets=BUCKETS_SEGUNDOS)
+
+COMPILACOES_LATEX = Histogram(
+    "compilar_latex_segundos", "Duração de cada compilação do LaTeX com o pdflatex.",
+    ["resultado"], buckets=BUCKETS_LATEX)
+
+CONSULTAS_CACHE = Counter(
+    "cache_consultas_total", "Consultas aos caches em memória, por cache e resultado (hit ou miss).",
+    ["cache", "resultado"])
+
+# Segmentos de URL que são IDs (números, UUIDs e ObjectIds), trocados por {id} no rótulo do endpoint
+_PADRAO_ID = re.compile(r"/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{24,32})(?=/|$)")
+
+
+def normalizar_endpoint(caminho: str) -> str:
+    """
+    Troca os IDs do caminho por {id}, para que cada endpoint tenha um único rótulo.
+    Ex.: /scans/12/export/345/status -> /scans/{id}/export/{id}/status
+    """
+    return _PADRAO_ID.sub("/{id}", caminho)
+
+
+def registrar_consulta_cache(cache: str, acerto: bool) -> None:
+    CONSULTAS_CACHE.labels(cache, "hit" if acerto else "miss").inc()
+
+
+def criar_metricas_fila() -> tuple:
+    """
+    Cria as métricas da fila de relatórios. Deve ser chamada uma única vez, e só no consumidor da fila
+    (ver report/fila_relatorios.consumir_fila): no servidor web ficariam sempre em 0, já que os
+    relatórios não são gerados lá.
+
+    :return: (relatorios_na_fila, lida da coleção `relatorios`; relatorios_em_execucao, as threads
+        ocupadas do consumidor).
+    """
+    na_fila = Gauge("relatorios_na_fila", "Relatórios com status na_fila, aguardando o consumidor.", multiprocess_mode="livesum")
+    em_execucao = Gauge("relatorios_em_execucao", "Relatórios sendo gerados.", multiprocess_mode="livesum")
+    return na_fila, em_execucao
+
+
+class TransporteMedido(httpx.BaseTransport):
+
+    """
+    Transporte do httpx que mede cada requisição em tenable_requisicoes_segundos.
+
+    :param transporte: Transporte que efetivamente envia as requisições (ex.: httpx.HTTPTransport()).
+    """
+
+    def __init__(self, transporte: httpx.BaseTransport):
+        self._transporte = transporte
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        inicio = time.perf_counter()
+        status = "erro"
+        try:
+            response = self._transporte.handle_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            REQUISICOES_TENABLE.labels(normalizar_endpoint(request.url.path), request.method, status).observe(time.perf_counter() - inicio)
+
+    def close(self) -> None:
+        self._transporte.close()
+
+
+class TransporteMedidoAsync(httpx.AsyncBaseTransport):
+
+    """
+    Versão assíncrona de TransporteMedido, para o httpx.AsyncClient (ver api/tenable_api_async.py).
+
+    :param transporte: Transporte que efetivamente envia as requisições (ex.: httpx.AsyncHTTPTransport()).
+    """
+
+    def __init__(self, transporte: httpx.AsyncBaseTransport):
+        self._transporte = transporte
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        inicio = time.perf_counter()
+        status = "erro"
+        try:
+            response = await self._transporte.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            REQUISICOES_TENABLE.labels(normalizar_endpoint(request.url.path), request.method, status).observe(time.perf_counter() - inicio)
+
+    async def aclose(self) -> None:
+        await self._transporte.aclose()
+
+
+class OuvinteComandosMongo(monitoring.CommandListener):
+
+    """
+    Registra a duração de cada comando do MongoDB em mongo_comandos_segundos.
+    Deve ser passado em event_listeners ao criar o MongoClient.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        COMANDOS_MONGO.labels(event.command_name, "sucesso").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        COMANDOS_MONGO.labels(event.command_name, "falha").observe(event.duration_micros / 1e6)
+
+
+def instrumentar_app(app: Flask) -> None:
+    """
+    Mede todas as requisições atendidas pelo app em http_requisicoes_segundos (exceto o próprio /metrics).
+
+    A medição é registrada no teardown_request, que roda mesmo quando a view levanta uma exceção; nesse
+    caso o after_request pode não rodar e o status registrado é 500.
+    """
+
+    @app.before_request
+    def _iniciar_medicao():
+        g.inicio_requisicao = time.perf_counter()
+
+    @app.after_request
+    def _guardar_status(response):
+        g.status_resposta = response.status_code
+        return response
+
+    @app.teardown_request
+    def _registrar_medicao(erro=None):
+        inicio = g.pop("inicio_requisicao", None)
+        status = g.pop("status_resposta", 500)
+
+        if inicio is not None and request.blueprint != "metricas":
+            rota = request.url_rule.rule if request.url_rule else "desconhecida"
+            REQUISICOES_HTTP.labels(request.blueprint or "", rota, request.method, str(status)).observe(time.perf_counter() - inicio)
@@ -0,0 +1,258 @@
+"""
+Medição do tempo de cada etapa da geração de relatórios.
+
+Um rastreamento (Rastreamento) é iniciado com iniciar_rastreamento e fica ativo no contexto atual
+(thread ou tarefa). Dentro dele, cada trecho marcado com `with rastrear("nome")` ou com o decorador
+@rastreado registra um span com:
+- inicio_s e duracao_s: início (relativo ao início do rastreamento) e tempo de parede, em segundos;
+- cpu_s: tempo de CPU da thread que executou o trecho;
+- cpu_filhos_s: tempo de CPU dos processos filhos encerrados durante o trecho (ex.: pdflatex, processos
+  de leitura dos scans). É contabilizado por processo, então inclui filhos de outras threads;
+- memoria_pico_mb e memoria_pico_filhos_mb: pico de memória residente (RSS) do processo e da soma dos
+  seus processos filhos durante o trecho. O RSS é amostrado por uma thread do rastreamento a cada
+  INTERVALO_AMOSTRAGEM_MEMORIA segundos, além do início e do fim de cada trecho (ver AmostradorMemoria);
+  por ser do processo todo, inclui a memória de outras threads que rodem ao mesmo tempo.
+
+Sem rastreamento ativo, rastrear e @rastreado apenas executam o código, sem custo de medição.
+Os spans podem ser gravados no MongoDB (Rastreamento.spans) ou exportados no formato de trace do
+Chrome (Rastreamento.exportar_chrome_trace), que abre em chrome://tracing ou no Perfetto.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Iterator
+
+import psutil
+
+# Intervalo, em segundos, entre as amostras de memória durante um rastreamento
+INTERVALO_AMOSTRAGEM_MEMORIA = 0.05
+
+_rastreamento_atual = ContextVar("rastreamento_atual", default=None)
+_span_atual = ContextVar("span_atual", default=None)
+
+
+class AmostradorMemoria:
+
+    """
+    Amostra, em uma thread, o RSS do processo atual e de seus filhos enquanto estiver ativo
+    (usado com `with`), guardando os picos do período todo (pico, pico_total) e os de cada medição
+    aberta com abrir() e encerrada com fechar() (ex.: um span).
+
+    :param intervalo: Segundos entre as amostras.
+    """
+
+    def __init__(self, intervalo: float = INTERVALO_AMOSTRAGEM_MEMORIA):
+        self.intervalo = intervalo
+        self.processo = psutil.Process()
+        self.pico = 0
+        self.pico_total = 0
+        self._medicoes = {}  # {chave: [pico do processo, pico dos filhos]}
+        self._proxima_chave = 0
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, name="amostrador-memoria", daemon=True)
+
+    def _medir(self):
+        rss = self.processo.memory_info().rss
+        filhos = 0
+        for filho in self.processo.children(recursive=True):
+            with contextlib.suppress(psutil.Error):
+                filhos += filho.memory_info().rss
+
+        with self._trava:
+            self.pico = max(self.pico, rss)
+            self.pico_total = max(self.pico_total, rss + filhos)
+            for medicao in self._medicoes.values():
+                medicao[0] = max(medicao[0], rss)
+                medicao[1] = max(medicao[1], filhos)
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self._medir()
+
+    def abrir(self) -> int:
+        """
+        Inicia uma medição, que acompanha os picos até fechar().
+
+        :return: Chave da medição.
+        """
+        with self._trava:
+            chave = self._proxima_chave
+            self._proxima_chave += 1
+            self._medicoes[chave] = [0, 0]
+        self._medir()
+        return chave
+
+    def fechar(self, chave: int) -> tuple:
+        """
+        Encerra a medição `chave`.
+
+        :return: Picos de RSS do processo e da soma dos filhos durante a medição, em bytes.
+        """
+        self._medir()
+        with self._trava:
+            return tuple(self._medicoes.pop(chave))
+
+    def __enter__(self):
+        self._medir()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._parar.set()
+        self._thread.join()
+        self._medir()
+
+
+def _cpu_filhos() -> float:
+    tempos = os.times()
+    return tempos.children_user + tempos.children_system
+
+
+class Rastreamento:
+
+    """
+    Spans medidos durante uma execução (ex.: a geração de um relatório).
+
+    :param nome: Nome do rastreamento, usado como nome do processo no trace do Chrome.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.spans = []
+        self.amostrador = AmostradorMemoria()
+        self._trava = threading.Lock()
+
+    def _registrar(self, span: dict) -> int:
+        with self._trava:
+            self.spans.append(span)
+            return len(self.spans) - 1
+
+    def exportar_chrome_trace(self, caminho: str) -> None:
+        """
+        Grava os spans no formato JSON de trace do Chrome (eventos completos, "ph": "X").
+
+        :param caminho: Arquivo de destino.
+        """
+        eventos = [{
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": self.nome},
+        }]
+
+        for span in self.spans:
+            if span["duracao_s"] is None:
+                continue
+            eventos.append({
+                "name": span["nome"],
+                "cat": "relatorio",
+                "ph": "X",
+                "ts": round(span["inicio_s"] * 1e6),
+                "dur": round(span["duracao_s"] * 1e6),
+                "pid": os.getpid(),
+                "tid": span["thread"],
+                "args": {chave: valor for chave, valor in span.items() if chave not in ("nome", "inicio_s", "duracao_s", "thread")},
+            })
+
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
+
+
+@contextmanager
+def iniciar_rastreamento(nome: str) -> Iterator[Rastreamento]:
+    """
+    Ativa um novo rastreamento no contexto atual enquanto o bloco `with` estiver em execução.
+
+    :param nome: Nome do rastreamento.
+    :return: O rastreamento, para consulta dos spans ao final.
+    """
+    rastreamento = Rastreamento(nome)
+    token_rastreamento = _rastreamento_atual.set(rastreamento)
+    token_span = _span_atual.set(None)
+    try:
+        with rastreamento.amostrador:
+            yield rastreamento
+    finally:
+        _span_atual.reset(token_span)
+        _rastreamento_atual.reset(token_rastreamento)
+
+
+@contextmanager
+def rastrear(nome: str, **atributos) -> Iterator[dict]:
+    """
+    Mede o bloco `with` como um span do rastreamento ativo (se houver).
+
+    :param nome: Nome do span (ex.: "compilar_latex").
+    :param atributos: Dados adicionais gravados no span (ex.: quantidade de arquivos).
+    :return: O span (dicionário) ou None sem rastreamento ativo. Atributos podem ser acrescentados
+        durante o bloco em span["atributos"].
+    """
+    rastreamento = _rastreamento_atual.get()
+
+    if rastreamento is None:
+        yield None
+        return
+
+    span = {
+        "nome": nome,
+        "pai": _span_atual.get(),
+        "thread": threading.get_native_id(),
+        "inicio_s": round(time.perf_counter() - rastreamento.inicio, 6),
+        "duracao_s": None,
+        "cpu_s": None,
+        "cpu_filhos_s": None,
+        "memoria_pico_mb": None,
+        "memoria_pico_filhos_mb": None,
+        "erro": None,
+        "atributos": atributos,
+    }
+    indice = rastreamento._registrar(span)
+    token = _span_atual.set(indice)
+
+    inicio = time.perf_counter()
+    cpu_inicio = time.thread_time()
+    cpu_filhos_inicio = _cpu_filhos()
+    medicao_memoria = rastreamento.amostrador.abrir()
+
+    try:
+        yield span
+    except BaseException as e:
+        span["erro"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span["duracao_s"] = round(time.perf_counter() - inicio, 6)
+        span["cpu_s"] = round(time.thread_time() - cpu_inicio, 6)
+        span["cpu_filhos_s"] = round(_cpu_filhos() - cpu_filhos_inicio, 6)
+        pico, pico_filhos = rastreamento.amostrador.fechar(medicao_memoria)
+        span["memoria_pico_mb"] = round(pico / 2**20, 1)
+        span["memoria_pico_filhos_mb"] = round(pico_filhos / 2**20, 1)
+        _span_atual.reset(token)
+
+
+def rastreado(nome: str = None):
+    """
+    Decorador que mede cada chamada da função como um span (ver rastrear).
+
+    :param nome: Nome do span (padrão: nome da função).
+    """
+    def decorador(funcao):
+        nome_span = nome or funcao.__name__
+
+        @wraps(funcao)
+        def funcao_rastreada(*args, **kwargs):
+            if _rastreamento_atual.get() is None:
+                return funcao(*args, **kwargs)
+            with rastrear(nome_span):
+                return funcao(*args, **kwargs)
+
+        return funcao_rastreada
+
+    return decorador
@@ -1,6 +1,7 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
-import pandas as pd
 from .json_utils import _load_data
 CSV_PATH = "data/relatórios_prontos/vulnerabilidades_agrupadas_por_site.csv"
 
@@ -34,6 +35,8 @@ def criar_csv() -> None:
     Cria o arquivo CSV com as colunas desejadas, caso ele não exista.
     Se o arquivo já existir, apaga o conteúdo anterior e começa de novo.
     """
+    import pandas as pd  # importado sob demanda: o pandas leva centenas de ms para carregar
+
     if not os.path.exists(CSV_PATH):
         df = pd.DataFrame(columns=['Site', 'Critical', 'High', 'Medium', 'Low', 'Total'])
         df.to_csv(CSV_PATH, index=False)
@@ -49,12 +52,39 @@ def adicionar_linhas_csv(new_rows: list) -> None:
     Parâmetros:
     - new_rows (list): Lista de dicionários contendo as novas linhas a serem adicionadas.
     """
+    import pandas as pd
+
     df = pd.read_csv(CSV_PATH)
     new_df = pd.DataFrame(new_rows)
     df = pd.concat([df, new_df], ignore_index=True)
     df.to_csv(CSV_PATH, index=False)
     
 
+def mapear_arquivos(funcao, arquivos: list, processos: int = 1) -> list:
+    """
+    Aplica uma função a cada arquivo, opcionalmente distribuindo o trabalho em um pool de processos.
+
+    Parâmetros:
+    - funcao (Callable): Função de nível de módulo (precisa ser serializável com pickle) que recebe o caminho de um arquivo.
+    - arquivos (list): Lista com os caminhos dos arquivos.
+    - processos (int): Quantidade máxima de processos. Com 1 (ou menos), a execução é serial.
+
+    Retorno:
+    - list: Resultados na mesma ordem dos arquivos, independentemente do modo de execução.
+    """
+    processos = min(processos or 1, len(arquivos))
+    if processos <= 1:
+        return [funcao(arquivo) for arquivo in arquivos]
+
+    # Lotes pequenos diminuem a troca de mensagens sem desbalancear arquivos de tamanhos diferentes
+    chunksize = max(1, len(arquivos) // (processos * 4))
+    # O consumidor da fila chama esta função de uma de suas threads, com o MongoClient e outras threads
+    # ativos: um fork copiaria travas em estado indefinido. O forkserver (ou o spawn, onde ele não existe)
+    # cria os processos a partir de um interpretador novo
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context(metodo)) as executor:
+        return list(executor.map(funcao, arquivos, chunksize=chunksize))
+
 def contar_riscos(findings: list) -> dict:
     """
     Conta a quantidade de vulnerabilidades para cada nível de risco.
@@ -162,3 +192,22 @@ def extrair_nomes_vulnerabilidades_identificadas(vulnerabilidades_agrupadas: def
     for (vuln_nome, vuln_id) in vulnerabilidades_agrupadas.keys():
         nomes_unicos.add(vuln_nome)
     return list(nomes_unicos)
+
+
+def ler_paginacao(argumentos, tamanho_padrao: int = 50, tamanho_maximo: int = 500) -> tuple:
+    """
+    Lê os parâmetros de paginação de uma requisição (?pagina=1&tamanhoPagina=50).
+
+    :param argumentos: Parâmetros da query string (request.args).
+    :param tamanho_padrao: Tamanho da página quando não informado.
+    :param tamanho_maximo: Maior tamanho de página aceito.
+    :return: (pagina, tamanho_pagina), com a página começando em 1.
+    :raises ValueError: Se os parâmetros não forem inteiros positivos.
+    """
+    pagina = int(argumentos.get("pagina", 1))
+    tamanho_pagina = int(argumentos.get("tamanhoPagina", tamanho_padrao))
+
+    if pagina < 1 or tamanho_pagina < 1:
+        raise ValueError("pagina e tamanhoPagina devem ser maiores que zero.")
+
+    return pagina, min(tamanho_pagina, tamanho_maximo)
@@ -1,5 +1,5 @@
 import { useParams, useNavigate, Link } from "react-router-dom";
-import { useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import MissingVulnerabilitiesModal from './MissingVulnerabilitiesModal'; // Certifique-se de que o caminho está correto
 
 const AlertModal = ({ message, onClose }: { message: string; onClose: () => void }) => {
@@ -19,6 +19,32 @@ const AlertModal = ({ message, onClose }: { message: string; onClose: () => void
   );
 };
 
+type EtapaRelatorio = {
+  etapa: string;
+  descricao: string;
+  status: "pendente" | "executando" | "concluida" | "erro";
+  duracaoS: number | null;
+};
+
+type StatusRelatorio = {
+  idRelatorio: string;
+  status: "na_fila" | "executando" | "concluido" | "erro";
+  etapaAtual: string | null;
+  progresso: number;
+  etapas: EtapaRelatorio[];
+  erro: string | null;
+  atualizadoEm: string | null;
+  urlPdf: string | null;
+};
+
+// Intervalo entre as consultas ao andamento da geração do relatório
+const INTERVALO_CONSULTA_STATUS_MS = 2000;
+// Durante a geração, o back-end renova atualizadoEm a cada 30 s; sem renovação por este tempo, o
+// processo que gerava o relatório provavelmente parou e o acompanhamento é interrompido
+const PRAZO_SEM_SINAL_MS = 10 * 60 * 1000;
+// Tempo máximo de acompanhamento, incluindo a espera na fila
+const PRAZO_ACOMPANHAMENTO_MS = 2 * 60 * 60 * 1000;
+
 const RelatorioFinal = () => {
   const { idLista } = useParams();
   const navigate = useNavigate();
@@ -35,6 +61,24 @@ const RelatorioFinal = () => {
     linkGoogleDrive: ""
   });
 
+  // --- ESTADOS PARA O ANDAMENTO DA GERAÇÃO (roda em segundo plano no back-end) ---
+  const [statusRelatorio, setStatusRelatorio] = useState<StatusRelatorio | null>(null);
+  const [gerando, setGerando] = useState(false);
+  const consultaStatusRef = useRef<number | null>(null);
+  // Início do acompanhamento e último sinal de vida recebido (horário do navegador)
+  const acompanhamentoRef = useRef({ inicio: 0, atualizadoEm: null as string | null, ultimoSinal: 0 });
+
+  const pararConsultaStatus = () => {
+    if (consultaStatusRef.current !== null) {
+      window.clearTimeout(consultaStatusRef.current);
+      consultaStatusRef.current = null;
+    }
+  };
+
+  // Interrompe a consulta se o usuário sair da página
+  useEffect(() => pararConsultaStatus, []);
+  // ------------------------------------
+
   // --- ESTADOS PARA GERENCIAR O MODAL ---
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [modalTitle, setModalTitle] = useState('');
@@ -47,7 +91,7 @@ const RelatorioFinal = () => {
   };
 
   const downloadPDF = (idRelatorio: string) => {
-    const fileUrl = `/downloads/${idRelatorio}/main.pdf`;
+    const fileUrl = `http://127.0.0.1:5000/listas/baixarRelatorioPdf/?idRelatorio=${idRelatorio}`;
     const link = document.createElement("a");
     link.href = fileUrl;
     link.setAttribute("download", `Relatorio_${formData.secretaria}.pdf`);
@@ -85,8 +129,103 @@ const RelatorioFinal = () => {
     }
   };
 
+  const exibirVulnerabilidadesAusentes = async (idRelatorioGerado: string) => {
+    const sitesContent = await getMissingVulnerabilitiesContent(idRelatorioGerado, 'sites');
+    const serversContent = await getMissingVulnerabilitiesContent(idRelatorioGerado, 'servers');
+
+    let combinedContent: string[] = [];
+    let modalDisplayTitle = "Vulnerabilidades Ausentes no Relatório"; // Título padrão
+
+    if (sitesContent && sitesContent.length > 0) {
+      combinedContent.push("--- VULNERABILIDADES DE SITES ---");
+      combinedContent = combinedContent.concat(sitesContent);
+    }
+
+    if (serversContent && serversContent.length > 0) {
+      if (sitesContent && sitesContent.length > 0) {
+        combinedContent.push(""); // Adiciona uma linha em branco para separar se ambos existirem
+      }
+      combinedContent.push("--- VULNERABILIDADES DE SERVIDORES ---");
+      combinedContent = combinedContent.concat(serversContent);
+    }
+
+    // Somente abra o modal se houver algum conteúdo combinado
+    if (combinedContent.length > 0) {
+      setModalTitle(modalDisplayTitle); // Define o título unificado
+      setModalContent(combinedContent);
+      setIsModalOpen(true);
+    } else {
+      setAlertMessage("Nenhuma vulnerabilidade ausente (sites ou servidores) foi encontrada com dados.");
+      setIsModalOpen(true);
+      console.log("Nenhuma vulnerabilidade ausente (sites ou servidores) foi encontrada com dados.");
+      // Opcional: Se quiser dar um feedback para o usuário mesmo que nada seja encontrado
+      // alert("Nenhuma vulnerabilidade ausente foi encontrada para este relatório.");
+    }
+  };
+
+  // Consulta periodicamente o andamento da geração até ela terminar (com sucesso ou erro) ou ficar sem
+  // sinal de vida por PRAZO_SEM_SINAL_MS
+  const acompanharRelatorio = async (idRelatorio: string) => {
+    try {
+      const response = await fetch(
+        `http://127.0.0.1:5000/listas/statusRelatorio/?idRelatorio=${idRelatorio}`
+      );
+
+      if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        setGerando(false);
+        setAlertMessage(`Erro ao consultar o andamento do relatório (${response.status}): ${data.error || 'Erro desconhecido.'}`);
+        setIsModalOpen(true);
+        return;
+      }
+
+      const status: StatusRelatorio = await response.json();
+      setStatusRelatorio(status);
+
+      if (status.status === "concluido") {
+        setGerando(false);
+        // downloadPDF(idRelatorio);
+        await exibirVulnerabilidadesAusentes(idRelatorio);
+      } else if (status.status === "erro") {
+        setGerando(false);
+        setAlertMessage(`Erro ao gerar relatório: ${status.erro}`);
+        setIsModalOpen(true);
+      } else {
+        const agora = Date.now();
+        const acompanhamento = acompanhamentoRef.current;
+
+        if (status.atualizadoEm !== acompanhamento.atualizadoEm) {
+          acompanhamento.atualizadoEm = status.atualizadoEm;
+          acompanhamento.ultimoSinal = agora;
+        }
+
+        const semSinal = status.status === "executando" && agora - acompanhamento.ultimoSinal > PRAZO_SEM_SINAL_MS;
+
+        if (semSinal || agora - acompanhamento.inicio > PRAZO_ACOMPANHAMENTO_MS) {
+          setGerando(false);
+          setAlertMessage(
+            semSinal
+              ? "A geração do relatório parou de responder. Tente gerar o relatório novamente."
+              : "A geração do relatório está demorando mais que o esperado. Consulte o resultado mais tarde em Relatórios Gerados."
+          );
+          setIsModalOpen(true);
+          return;
+        }
+
+        consultaStatusRef.current = window.setTimeout(() => acompanharRelatorio(idRelatorio), INTERVALO_CONSULTA_STATUS_MS);
+      }
+    } catch (error) {
+      setGerando(false);
+      setAlertMessage("Erro ao conectar com o servidor.");
+      setIsModalOpen(true);
+      console.error(error);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
+    pararConsultaStatus();
+    setStatusRelatorio(null);
 
     const payload = {
       idLista,
@@ -109,46 +248,15 @@ const RelatorioFinal = () => {
         body: JSON.stringify(payload),
       });
 
-      const text = await response.text();
-
       if (response.ok) {
-        const idRelatorioGerado = text;
-        // downloadPDF(idRelatorioGerado);
-
-        const sitesContent = await getMissingVulnerabilitiesContent(idRelatorioGerado, 'sites');
-        const serversContent = await getMissingVulnerabilitiesContent(idRelatorioGerado, 'servers');
-
-        let combinedContent: string[] = [];
-        let modalDisplayTitle = "Vulnerabilidades Ausentes no Relatório"; // Título padrão
-
-        if (sitesContent && sitesContent.length > 0) {
-          combinedContent.push("--- VULNERABILIDADES DE SITES ---");
-          combinedContent = combinedContent.concat(sitesContent);
-        }
-
-        if (serversContent && serversContent.length > 0) {
-          if (sitesContent && sitesContent.length > 0) {
-            combinedContent.push(""); // Adiciona uma linha em branco para separar se ambos existirem
-          }
-          combinedContent.push("--- VULNERABILIDADES DE SERVIDORES ---");
-          combinedContent = combinedContent.concat(serversContent);
-        }
-
-        // Somente abra o modal se houver algum conteúdo combinado
-        if (combinedContent.length > 0) {
-          setModalTitle(modalDisplayTitle); // Define o título unificado
-          setModalContent(combinedContent);
-          setIsModalOpen(true);
-        } else {
-          setAlertMessage("Nenhuma vulnerabilidade ausente (sites ou servidores) foi encontrada com dados.");
-          setIsModalOpen(true);
-          console.log("Nenhuma vulnerabilidade ausente (sites ou servidores) foi encontrada com dados.");
-          // Opcional: Se quiser dar um feedback para o usuário mesmo que nada seja encontrado
-          // alert("Nenhuma vulnerabilidade ausente foi encontrada para este relatório.");
-        }
+        const { idRelatorio } = await response.json();
+        setGerando(true);
+        acompanhamentoRef.current = { inicio: Date.now(), atualizadoEm: null, ultimoSinal: Date.now() };
+        acompanharRelatorio(idRelatorio);
         // --------------------------------------------------------------------
 
       } else {
+        const text = await response.text();
         setAlertMessage(`Erro ao gerar relatório (${response.status}): ${text}`);
         setIsModalOpen(true);
       }
@@ -260,12 +368,51 @@ const RelatorioFinal = () => {
           <div className="col-span-2 flex justify-end mt-4">
             <button
               type="submit"
-              className="bg-[#007BB4] text-white px-6 py-2 rounded hover:bg-[#009BE2] cursor-pointer"
+              disabled={gerando}
+              className="bg-[#007BB4] text-white px-6 py-2 rounded hover:bg-[#009BE2] cursor-pointer disabled:opacity-50 disabled:cursor-not-allowed"
             >
-              Concluir
+              {gerando ? "Gerando..." : "Concluir"}
             </button>
           </div>
         </form>
+
+        {/* --- ANDAMENTO DA GERAÇÃO DO RELATÓRIO --- */}
+        {statusRelatorio && (
+          <div className="mt-8">
+            <div className="flex justify-between text-black mb-1">
+              <span>{statusRelatorio.status === "na_fila" ? "Aguardando na fila..." : "Andamento da geração"}</span>
+              <span>{statusRelatorio.progresso}%</span>
+            </div>
+            <div className="w-full bg-gray-200 rounded h-3 mb-4">
+              <div
+                className={`h-3 rounded ${statusRelatorio.status === "erro" ? "bg-red-600" : "bg-[#007BB4]"}`}
+                style={{ width: `${statusRelatorio.progresso}%` }}
+              />
+            </div>
+            <ul className="text-black space-y-1">
+              {statusRelatorio.etapas.map((etapa) => (
+                <li key={etapa.etapa} className="flex justify-between">
+                  <span>{etapa.descricao}</span>
+                  <span
+                    className={
+                      etapa.status === "concluida" ? "text-green-700"
+                        : etapa.status === "erro" ? "text-red-600"
+                        : etapa.status === "executando" ? "text-[#007BB4]"
+                        : "text-gray-500"
+                    }
+                  >
+                    {etapa.status === "concluida"
+                      ? `Concluída${etapa.duracaoS != null ? ` (${etapa.duracaoS.toFixed(1)} s)` : ""}`
+                      : etapa.status === "erro" ? "Erro"
+                      : etapa.status === "executando" ? "Em execução"
+                      : "Pendente"}
+                  </span>
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
+        {/* ---------------------------- */}
       </div>
 
       {/* --- RENDERIZAÇÃO DO MODAL --- */}
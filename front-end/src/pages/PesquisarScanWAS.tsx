@@ -12,11 +12,18 @@ type Scan = {
   };
 };
 
+type ResumoDownloadScans = {
+  total: number;
+  sucessos: number;
+  falhas: number;
+  scans: { scan_id: string | null; nome: string | null; sucesso: boolean; erro: string | null }[];
+};
+
 const AlertModal = ({ message, onClose }: { message: string; onClose: () => void }) => {
   return (
     <div className="absolute top-1/3 left-1/2 transform -translate-x-1/2 w-1/3 bg-white p-6 rounded-lg shadow-md z-50">
       <h2 className="text-lg font-semibold mb-4">Alerta</h2>
-      <p className="mb-4">{message}</p>
+      <p className="mb-4 whitespace-pre-line">{message}</p>
       <div className="flex justify-end">
         <button
           onClick={onClose}
@@ -101,12 +108,26 @@ const PesquisarScanWAS = () => {
         }),
       });
 
-      if (!response.ok) {
+      const contentType = response.headers.get("content-type") || "";
+      if (!contentType.includes("application/json")) {
         const errorText = await response.text();
         throw new Error(`Erro ao adicionar à lista: ${errorText}`);
       }
 
-      setAlertMessage("Scans adicionados com sucesso!");
+      // Resumo do download: { total, sucessos, falhas, scans: [{ scan_id, nome, sucesso, erro }] }
+      const resumo: ResumoDownloadScans = await response.json();
+      const falhas = resumo.scans.filter((scan) => !scan.sucesso);
+
+      if (falhas.length === 0) {
+        setAlertMessage(`Scans adicionados com sucesso! (${resumo.sucessos} de ${resumo.total})`);
+      } else {
+        const detalhes = falhas
+          .map((scan) => `${scan.nome || scan.scan_id || "Scan sem identificação"}: ${scan.erro}`)
+          .join("\n");
+        setAlertMessage(
+          `${resumo.sucessos} de ${resumo.total} scans adicionados. Falharam ${resumo.falhas}:\n${detalhes}`
+        );
+      }
       closeModal();
     } catch (error: any) {
       setAlertMessage(error.message || "Erro desconhecido");
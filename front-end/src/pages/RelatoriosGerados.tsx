@@ -2,10 +2,15 @@ import { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
 import ConfirmDeleteModal from './ConfirmDeleteModal'; // Importe o modal de confirmação
 
+const TAMANHO_PAGINA = 50;
+
 const RelatoriosGerados = () => {
   const [dias, setDias] = useState("");
   const [relatorios, setRelatorios] = useState<Array<{ nome: string; id: string }>>([]);
   const [isLoading, setIsLoading] = useState(false);
+  const [pagina, setPagina] = useState(1);
+  const [total, setTotal] = useState(0);
+  const totalPaginas = Math.max(1, Math.ceil(total / TAMANHO_PAGINA));
 
   // --- ESTADOS PARA O MODAL DE CONFIRMAÇÃO ---
   const [showConfirmModal, setShowConfirmModal] = useState(false);
@@ -13,16 +18,22 @@ const RelatoriosGerados = () => {
   const [confirmAllDelete, setConfirmAllDelete] = useState(false); // Novo estado para diferenciar "excluir tudo"
   // ------------------------------------------
 
-  const fetchRelatorios = async () => {
+  const fetchRelatorios = async (paginaDesejada: number = pagina) => {
     setIsLoading(true);
     try {
       const response = await fetch(
-        "http://localhost:5000/relatorios/getRelatoriosGerados/"
+        `http://localhost:5000/relatorios/getRelatoriosGeradosPaginados/?pagina=${paginaDesejada}&tamanhoPagina=${TAMANHO_PAGINA}`
       );
 
       if (response.ok) {
         const data = await response.json();
-        setRelatorios(data);
+        // Se a página ficou vazia (ex.: após excluir o último relatório dela), volta para a anterior
+        if (data.itens.length === 0 && paginaDesejada > 1) {
+          setPagina(paginaDesejada - 1);
+          return;
+        }
+        setRelatorios(data.itens);
+        setTotal(data.total);
       } else {
         console.error("Erro ao carregar relatórios:", await response.text());
         alert("Erro ao carregar relatórios.");
@@ -36,15 +47,15 @@ const RelatoriosGerados = () => {
   };
 
   useEffect(() => {
-    fetchRelatorios();
-  }, []);
+    fetchRelatorios(pagina);
+  }, [pagina]);
 
   const handleAtualizar = () => {
     fetchRelatorios();
   };
 
   const downloadPDF = (idRelatorio: string, nomeRelatorio: string) => {
-    const fileUrl = `/downloads/${idRelatorio}/main.pdf`;
+    const fileUrl = `http://127.0.0.1:5000/listas/baixarRelatorioPdf/?idRelatorio=${idRelatorio}`;
     const link = document.createElement("a");
     link.href = fileUrl;
     link.setAttribute("download", `${nomeRelatorio}.pdf`);
@@ -100,7 +111,11 @@ const RelatoriosGerados = () => {
 
       if (response.ok) {
         alert(successMessage);
-        fetchRelatorios(); // Recarrega a lista
+        if (confirmAllDelete && pagina !== 1) {
+          setPagina(1); // Recarrega a lista a partir da primeira página
+        } else {
+          fetchRelatorios(); // Recarrega a lista
+        }
       } else {
         const errorText = await response.text();
         console.error(errorMessage, errorText);
@@ -205,6 +220,26 @@ const RelatoriosGerados = () => {
             </div>
           )}
         </div>
+
+        <div className="flex items-center justify-end space-x-4 mt-4 text-black">
+          <span>
+            {total} relatório(s) · Página {pagina} de {totalPaginas}
+          </span>
+          <button
+            onClick={() => setPagina(pagina - 1)}
+            className="bg-[#007bb4] text-white px-4 py-2 rounded hover:bg-[#005f87] transition cursor-pointer disabled:opacity-50"
+            disabled={isLoading || pagina <= 1}
+          >
+            Anterior
+          </button>
+          <button
+            onClick={() => setPagina(pagina + 1)}
+            className="bg-[#007bb4] text-white px-4 py-2 rounded hover:bg-[#005f87] transition cursor-pointer disabled:opacity-50"
+            disabled={isLoading || pagina >= totalPaginas}
+          >
+            Próxima
+          </button>
+        </div>
       </div>
 
       {/* --- RENDERIZAÇÃO DO MODAL DE CONFIRMAÇÃO --- */}